@@ -0,0 +1,287 @@
+"""
+Microbenchmarks for the Split OpenFeature provider.
+
+Measures per-evaluation latency and memory for every resolve type on the sync and async providers, against
+an in-memory fake Split client (provider overhead only) and a localhost YAML factory (real SDK evaluation),
+plus the package import time (which must not load the Split SDK).
+Results are compared with benchmarks/thresholds.json and the run exits non-zero on any regression.
+
+    python benchmarks/run_benchmarks.py                 # run and check thresholds
+    python benchmarks/run_benchmarks.py --update        # rewrite thresholds from a baseline measured here
+
+--update runs the suite --baseline-runs times, takes the worst value of every metric as that benchmark's
+baseline and writes baseline * MARGIN as its threshold. Thresholds are only meaningful on the machine that
+produced them, so regenerate them there rather than widening the margin.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from openfeature.evaluation_context import EvaluationContext
+from splitio import get_factory
+from split_openfeature_provider import SplitProvider, SplitProviderAsync
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_FILE = os.path.join(BENCHMARKS_DIR, "thresholds.json")
+SPLIT_FILE = os.path.join(BENCHMARKS_DIR, "..", "tests", "split.yaml")
+
+# Allowed regression over the per-benchmark baseline written by --update
+MARGIN = 1.5
+# Evaluations retain no memory, so the baseline is ~0; below a byte per evaluation is allocator noise, not a leak
+RETAINED_BYTES_PER_OP_FLOOR = 1.0
+
+LARGE_OBJECT = json.dumps({"items": [{"id": i, "name": "item-%d" % i, "tags": ["a", "b", "c"]} for i in range(400)]})
+CONTEXT = EvaluationContext("user-1", {"country": "ar", "plan": "pro", "platform": "ios"})
+
+
+class FakeFactory():
+    ready = True
+    destroyed = False
+
+    def destroy(self, destroyed_event=None):
+        if destroyed_event is not None:
+            destroyed_event.set()
+
+
+class FakeClient():
+    """Split client stand-in returning fixed treatments, so only provider overhead is measured."""
+
+    def __init__(self, treatments):
+        self._factory = FakeFactory()
+        self._treatments = treatments
+
+    def get_treatment_with_config(self, key, flag_key, attributes=None):
+        return self._treatments.get(flag_key, ("control", None))
+
+    def get_treatments_with_config(self, key, flag_keys, attributes=None):
+        return {flag_key: self._treatments.get(flag_key, ("control", None)) for flag_key in flag_keys}
+
+
+class FakeClientAsync(FakeClient):
+    async def get_treatment_with_config(self, key, flag_key, attributes=None):
+        return FakeClient.get_treatment_with_config(self, key, flag_key, attributes)
+
+    async def get_treatments_with_config(self, key, flag_keys, attributes=None):
+        return FakeClient.get_treatments_with_config(self, key, flag_keys, attributes)
+
+
+TREATMENTS = {
+    "bool_flag": ("on", None),
+    "string_flag": ("blue", '{"color": "blue"}'),
+    "int_flag": ("32", None),
+    "float_flag": ("50.5", None),
+    "object_flag": ('{"key": "value"}', None),
+    "large_object_flag": (LARGE_OBJECT, LARGE_OBJECT),
+}
+
+RESOLVES = [
+    ("bool", "resolve_boolean_details", "bool_flag", False),
+    ("string", "resolve_string_details", "string_flag", "red"),
+    ("int", "resolve_integer_details", "int_flag", 0),
+    ("float", "resolve_float_details", "float_flag", 0.0),
+    ("object", "resolve_object_details", "object_flag", {}),
+    ("object_large", "resolve_object_details", "large_object_flag", {}),
+]
+
+
+def _measure(call, iterations, repeats):
+    """Best-of-`repeats` mean latency (us) plus peak transient and retained memory (bytes) per evaluation."""
+    for _ in range(min(iterations, 100)):
+        call()
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        elapsed = (time.perf_counter() - start) / iterations
+        best = elapsed if best is None else min(best, elapsed)
+
+    # a traced warm-up pass first, so refilling interpreter free lists is not counted as retained memory
+    tracemalloc.start()
+    for _ in range(iterations):
+        call()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(iterations):
+        call()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "latency_us": best * 1e6,
+        "peak_bytes": max(peak - baseline, 0),
+        "retained_bytes_per_op": max(current - baseline, 0) / iterations,
+    }
+
+
+def _sync_provider(ready=True):
+    provider = SplitProvider({"SplitClient": FakeClient(TREATMENTS)})
+    provider._split_client_wrapper.sdk_ready = ready
+    return provider
+
+
+def bench_sync(results, iterations, repeats):
+    provider = _sync_provider()
+    for name, method, flag_key, default in RESOLVES:
+        resolve = getattr(provider, method)
+        results["sync_%s" % name] = _measure(lambda: resolve(flag_key, default, CONTEXT), iterations, repeats)
+
+    not_ready = _sync_provider(ready=False)
+    results["sync_not_ready"] = _measure(
+        lambda: not_ready.resolve_boolean_details("bool_flag", False, CONTEXT), iterations, repeats)
+
+    flag_defaults = {flag_key: default for _, _, flag_key, default in RESOLVES}
+    results["sync_bulk_%d_flags" % len(flag_defaults)] = _measure(
+        lambda: provider.resolve_bulk_details(flag_defaults, CONTEXT), iterations, repeats)
+
+
+def bench_async(results, iterations, repeats):
+    async def run():
+        provider = SplitProviderAsync({"SplitClient": FakeClientAsync(TREATMENTS)})
+        await provider.create()
+
+        def measure_async(coroutine_factory):
+            # drive the coroutine synchronously: the fake client never suspends
+            def call():
+                coroutine = coroutine_factory()
+                try:
+                    coroutine.send(None)
+                except StopIteration:
+                    pass
+            return _measure(call, iterations, repeats)
+
+        for name, method, flag_key, default in RESOLVES:
+            resolve = getattr(provider, method + "_async")
+            results["async_%s" % name] = measure_async(lambda: resolve(flag_key, default, CONTEXT))
+
+        provider._split_client_wrapper.sdk_ready = False
+        results["async_not_ready"] = measure_async(
+            lambda: provider.resolve_boolean_details_async("bool_flag", False, CONTEXT))
+
+    asyncio.run(run())
+
+
+def bench_localhost(results, iterations, repeats):
+    factory = get_factory("localhost", config={"splitFile": SPLIT_FILE})
+    factory.block_until_ready(5)
+    provider = SplitProvider({"SplitClient": factory.client()})
+    context = EvaluationContext("key")
+    results["localhost_bool"] = _measure(
+        lambda: provider.resolve_boolean_details("my_feature", False, context), iterations, repeats)
+    results["localhost_int"] = _measure(
+        lambda: provider.resolve_integer_details("int_feature", 0, context), iterations, repeats)
+    factory.destroy()
+
+
+def bench_memory_growth(results, flag_counts):
+    """Memory retained by the provider's caches after evaluating each of N distinct flags once."""
+    for flag_count in flag_counts:
+        treatments = {"flag_%d" % i: ('{"id": %d}' % i, '{"config": %d}' % i) for i in range(flag_count)}
+        provider = SplitProvider({"SplitClient": FakeClient(treatments)})
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for flag_key in treatments:
+            provider.resolve_object_details(flag_key, {}, CONTEXT)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["memory_%d_flags" % flag_count] = {"retained_bytes_per_flag": max(current - baseline, 0) / flag_count}
+
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import split_openfeature_provider
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, int(any(m.split('.')[0] == 'splitio' for m in sys.modules)), int('asyncio' in sys.modules))
+"""
+
+
+def bench_import(results, repeats):
+    """Package import time in a fresh interpreter; neither the Split SDK nor asyncio must be loaded by the import."""
+    best = None
+    sdk_loaded = 0
+    asyncio_loaded = 0
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True,
+                                check=True).stdout.split()
+        best = float(output[0]) if best is None else min(best, float(output[0]))
+        sdk_loaded = max(sdk_loaded, int(output[1]))
+        asyncio_loaded = max(asyncio_loaded, int(output[2]))
+    results["import_package"] = {"import_ms": best, "splitio_loaded": sdk_loaded, "asyncio_loaded": asyncio_loaded}
+
+
+def run(iterations, repeats):
+    results = {}
+    bench_import(results, repeats)
+    bench_sync(results, iterations, repeats)
+    bench_async(results, iterations, repeats)
+    bench_localhost(results, max(iterations // 10, 100), repeats)
+    bench_memory_growth(results, (10, 100, 1000))
+    return results
+
+
+def check(results, thresholds):
+    failures = []
+    for benchmark, limits in sorted(thresholds.items()):
+        measured = results.get(benchmark)
+        if measured is None:
+            failures.append("%s: missing from results" % benchmark)
+            continue
+        for metric, limit in limits.items():
+            if measured[metric] > limit:
+                failures.append("%s: %s %.2f exceeds threshold %.2f" % (benchmark, metric, measured[metric], limit))
+    return failures
+
+
+def thresholds_from(runs):
+    """Thresholds of MARGIN over the baseline: the worst value of each metric across `runs`."""
+    thresholds = {}
+    for benchmark in runs[0]:
+        limits = {}
+        for metric in runs[0][benchmark]:
+            baseline = max(results[benchmark][metric] for results in runs)
+            if metric in ("splitio_loaded", "asyncio_loaded"):
+                limits[metric] = 0
+            elif metric == "retained_bytes_per_op":
+                limits[metric] = round(max(baseline * MARGIN, RETAINED_BYTES_PER_OP_FLOOR), 2)
+            else:
+                limits[metric] = round(baseline * MARGIN, 2)
+        thresholds[benchmark] = limits
+    return thresholds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split OpenFeature provider microbenchmarks")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="rewrite thresholds.json from a measured baseline")
+    parser.add_argument("--baseline-runs", type=int, default=3, help="runs the --update baseline is taken from")
+    args = parser.parse_args(argv)
+
+    runs = [run(args.iterations, args.repeats) for _ in range(args.baseline_runs if args.update else 1)]
+    results = runs[-1]
+    for benchmark, measured in sorted(results.items()):
+        print("%-28s %s" % (benchmark, "  ".join("%s=%.2f" % item for item in sorted(measured.items()))))
+
+    if args.update:
+        with open(THRESHOLDS_FILE, "w") as f:
+            json.dump(thresholds_from(runs), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("thresholds written to %s" % THRESHOLDS_FILE)
+        return 0
+
+    with open(THRESHOLDS_FILE) as f:
+        failures = check(results, json.load(f))
+    for failure in failures:
+        print("REGRESSION %s" % failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
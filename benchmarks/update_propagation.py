@@ -0,0 +1,266 @@
+"""
+End-to-end update propagation latency of the Split OpenFeature provider.
+
+A local HTTP server stands in for the Split API (splitChanges, segmentChanges, auth and the event, impression and
+telemetry endpoints) and serves a generated set of flags to a real Split SDK factory in polling mode. The harness
+then applies scripted changes, each flipping a number of flags at once (killing the live ones and reviving the
+killed ones), and records for each change the time until:
+- the provider emits PROVIDER_CONFIGURATION_CHANGED naming the changed flags (SDK polling, SDK_UPDATE,
+  _handle_split_event and the OpenFeature handlers), and
+- resolve_boolean_details returns the new value for every changed flag.
+
+Latencies are reported as distributions per (flag count, update size):
+
+    python benchmarks/update_propagation.py
+    python benchmarks/update_propagation.py --flags 100 1000 5000 --update-sizes 1 10 100 --changes 20
+    python benchmarks/update_propagation.py --refresh-rate 5 --json results.json
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent
+from splitio import get_factory
+from split_openfeature_provider import SplitProvider
+
+CONTEXT = EvaluationContext("user-1")
+PERCENTILES = (50, 90, 99)
+
+
+def flag_definition(name, change_number, killed=False):
+    return {
+        "name": name, "trafficTypeName": "user", "changeNumber": change_number, "seed": 1, "trafficAllocation": 100,
+        "trafficAllocationSeed": 1, "status": "ACTIVE", "killed": killed, "defaultTreatment": "off", "algo": 2,
+        "sets": [], "conditions": [{
+            "conditionType": "ROLLOUT", "label": "default rule",
+            "matcherGroup": {"combiner": "AND", "matchers": [
+                {"matcherType": "ALL_KEYS", "negate": False, "keySelector": {"trafficType": "user"}}]},
+            "partitions": [{"treatment": "on", "size": 100}, {"treatment": "off", "size": 0}],
+        }],
+    }
+
+
+class SplitApiStandIn():
+    """
+    Local HTTP stand-in for the Split SDK and events APIs, serving flag definitions from memory. `apply` changes
+    flags under a new change number, which the SDK picks up on its next splitChanges poll.
+    """
+
+    def __init__(self, flag_count):
+        self._lock = threading.Lock()
+        self.change_number = 1
+        self.flags = {"flag_%d" % i: flag_definition("flag_%d" % i, 1) for i in range(flag_count)}
+        self.requests = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="SplitApiStandIn", daemon=True)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/api" % self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def apply(self, names):
+        """Flip each flag (kill a live one, revive a killed one) in one change; return {name: killed}."""
+        with self._lock:
+            self.change_number += 1
+            flipped = {}
+            for name in names:
+                flipped[name] = not self.flags[name]["killed"]
+                self.flags[name] = flag_definition(name, self.change_number, flipped[name])
+            return flipped
+
+    def killed(self, name):
+        with self._lock:
+            return self.flags[name]["killed"]
+
+    def split_changes(self, since):
+        with self._lock:
+            till = self.change_number
+            flags = [flag for flag in self.flags.values() if flag["changeNumber"] > since]
+        return {"ff": {"d": flags, "s": since, "t": max(till, since)}, "rbs": {"d": [], "s": -1, "t": -1}}
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body=None):
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                stand_in.requests += 1
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                since = int(query.get("since", ["-1"])[0])
+                if url.path.endswith("/splitChanges"):
+                    self._reply(200, stand_in.split_changes(since))
+                elif "/segmentChanges/" in url.path:
+                    name = url.path.rsplit("/", 1)[1]
+                    self._reply(200, {"name": name, "added": [], "removed": [], "since": since, "till": since})
+                elif url.path.endswith("/auth"):
+                    self._reply(200, {"pushEnabled": False, "token": ""})
+                else:
+                    self._reply(404)
+
+            def do_POST(self):
+                # impressions, events and telemetry are accepted and discarded
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._reply(200)
+
+        return Handler
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    summary = {"p%d_ms" % p: ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000 for p in PERCENTILES}
+    summary["max_ms"] = ordered[-1] * 1000
+    summary["samples"] = len(ordered)
+    return summary
+
+
+class PropagationProbe():
+    """Records when PROVIDER_CONFIGURATION_CHANGED has named every flag of the pending change."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = set()
+        self.event_time = None
+
+    def expect(self, names):
+        with self._condition:
+            self._pending = set(names)
+            self.event_time = None
+
+    def on_event(self, provider, event, details):
+        if event != ProviderEvent.PROVIDER_CONFIGURATION_CHANGED:
+            return
+        with self._condition:
+            if not self._pending:
+                return
+            self._pending.difference_update(details.flags_changed or ())
+            if not self._pending:
+                self.event_time = time.monotonic()
+                self._condition.notify_all()
+
+    def wait(self, timeout):
+        with self._condition:
+            return self._condition.wait_for(lambda: self.event_time is not None, timeout)
+
+
+def measure(flag_count, update_size, changes, refresh_rate, timeout):
+    """Event and evaluation latencies (seconds) of `changes` scripted changes of `update_size` flags each."""
+    stand_in = SplitApiStandIn(flag_count).start()
+    url = stand_in.url
+    factory = get_factory("update-propagation-harness", config={
+        "streamingEnabled": False, "featuresRefreshRate": refresh_rate, "segmentsRefreshRate": 3600,
+        "impressionsMode": "none", "connectionTimeout": 5000,
+    }, sdk_api_base_url=url, events_api_base_url=url, auth_api_base_url=url, telemetry_api_base_url=url)
+    factory.block_until_ready(timeout)
+    provider = SplitProvider({"SplitClient": factory.client()})
+    probe = PropagationProbe()
+    provider.attach(probe.on_event)
+
+    event_latencies = []
+    evaluation_latencies = []
+    # changes land at random points of the polling cycle, as they do in production
+    jitter = random.Random(flag_count * 1000 + update_size)
+    try:
+        for change in range(changes):
+            time.sleep(jitter.uniform(0, refresh_rate))
+            names = ["flag_%d" % ((change * update_size + i) % flag_count) for i in range(update_size)]
+            for name in names:
+                # a killed flag serves "off", so every change must flip the value the provider returns
+                if provider.resolve_boolean_details(name, False, CONTEXT).value == stand_in.killed(name):
+                    raise AssertionError("%s does not serve its current state before the change" % name)
+            probe.expect(names)
+            start = time.monotonic()
+            expected = {name: not killed for name, killed in stand_in.apply(names).items()}
+
+            pending = list(names)
+            deadline = start + timeout
+            while pending and time.monotonic() < deadline:
+                pending = [name for name in pending
+                           if provider.resolve_boolean_details(name, not expected[name], CONTEXT).value
+                           != expected[name]]
+                if pending:
+                    time.sleep(0.001)
+            if pending:
+                print("change %d: %d flags not propagated after %ss" % (change, len(pending), timeout),
+                      file=sys.stderr)
+                continue
+            evaluation_latencies.append(time.monotonic() - start)
+            if probe.wait(max(deadline - time.monotonic(), 0)):
+                event_latencies.append(probe.event_time - start)
+    finally:
+        provider.shutdown()
+        destroyed = threading.Event()
+        factory.destroy(destroyed)
+        destroyed.wait(timeout)
+        stand_in.stop()
+    return event_latencies, evaluation_latencies
+
+
+def run(flag_counts, update_sizes, changes, refresh_rate, timeout):
+    results = {}
+    for flag_count in flag_counts:
+        for update_size in update_sizes:
+            if update_size > flag_count:
+                continue
+            event_latencies, evaluation_latencies = measure(flag_count, update_size, changes, refresh_rate, timeout)
+            results["%d_flags_%d_changed" % (flag_count, update_size)] = {
+                "event": percentiles(event_latencies),
+                "evaluation": percentiles(evaluation_latencies),
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split OpenFeature provider update propagation latency")
+    parser.add_argument("--flags", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--update-sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--changes", type=int, default=10, help="scripted changes per configuration")
+    parser.add_argument("--refresh-rate", type=float, default=1, help="SDK featuresRefreshRate (seconds)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for each change")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.flags, args.update_sizes, args.changes, args.refresh_rate, args.timeout)
+    for configuration, measured in results.items():
+        for metric in ("event", "evaluation"):
+            print("%-24s %-10s %s" % (configuration, metric,
+                                      "  ".join("%s=%.1f" % (key, value) if key != "samples" else "samples=%d" % value
+                                                for key, value in measured[metric].items())))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,5 +15,8 @@ setuptools.setup(
         "Programming Language :: Python :: 3",
         'Topic :: Software Development :: Libraries'
     ],
+    extras_require={
+        'otel': ['opentelemetry-api>=1.20'],
+    },
     python_requires='>=3.9'
 )
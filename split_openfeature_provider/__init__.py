@@ -1,2 +1,5 @@
 from split_openfeature_provider.split_provider import SplitProvider, SplitProviderAsync
 from split_openfeature_provider.split_client_wrapper import SplitClientWrapper
+from split_openfeature_provider.split_batch_evaluator import SplitBatchEvaluator
+from split_openfeature_provider.split_provider_pool import SplitProviderPool, SplitTenantProvider
+from split_openfeature_provider.telemetry import OpenTelemetryHook
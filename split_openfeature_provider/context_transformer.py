@@ -0,0 +1,128 @@
+import threading
+import typing
+from collections.abc import Mapping
+from datetime import date, datetime, timezone
+from enum import Enum
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.immutable_dict.mapping_proxy_type import MappingProxyType
+
+# Number of distinct attribute sets kept converted; oldest entries are evicted first
+DEFAULT_MAX_ENTRIES = 1024
+
+_PRIMITIVES = (bool, int, float, str)
+_SEQUENCES = (list, tuple, set, frozenset)
+_EMPTY_ATTRIBUTES = MappingProxyType({})
+
+
+def _epoch_seconds(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+
+
+def _normalize_scalar(value):
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, date):
+        return _epoch_seconds(value)
+    return str(value)
+
+
+def _normalize_into(converted, prefix, attributes):
+    for name, value in attributes.items():
+        key = name if prefix is None else "%s.%s" % (prefix, name)
+        if value is None:
+            continue
+        if isinstance(value, _PRIMITIVES):
+            converted[key] = value
+        elif isinstance(value, Mapping):
+            _normalize_into(converted, key, value)
+        elif isinstance(value, _SEQUENCES):
+            converted[key] = [str(_normalize_scalar(item)) for item in value if item is not None]
+        else:
+            converted[key] = _normalize_scalar(value)
+
+
+def normalize_attributes(attributes: typing.Optional[Mapping]):
+    """
+    Convert OpenFeature context attributes into types accepted by Split matchers.
+
+    Nested mappings are flattened into dotted keys, datetimes and dates become epoch seconds (UTC for naive
+    values), sequences and sets become lists of strings, enums are replaced by their value and None is dropped.
+    """
+    converted = {}
+    if attributes:
+        _normalize_into(converted, None, attributes)
+    return converted
+
+
+_CONTAINERS = (Mapping, set, frozenset, list, tuple)
+
+
+def _hashable(value):
+    if isinstance(value, Mapping):
+        return tuple((k, v.__class__, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset((v.__class__, _hashable(v)) for v in value)
+    if isinstance(value, (list, tuple)):
+        return tuple((v.__class__, _hashable(v)) for v in value)
+    return value
+
+
+def fingerprint(attributes: Mapping):
+    """
+    Hashable key identifying an attribute set; value types, including those of nested items, are part of the key
+    so `True`, `1` and `1.0` differ. None when a value cannot be hashed (e.g. a bytearray): such attribute sets
+    are converted and evaluated without caching.
+    """
+    key = tuple((k, v.__class__, _hashable(v) if isinstance(v, _CONTAINERS) else v) for k, v in attributes.items())
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ContextTransformer():
+    """
+    Converts EvaluationContext attributes to Split attributes once per distinct attribute set.
+
+    Converted dicts are interned by fingerprint and shared read-only across evaluations, so the thousands of
+    requests that carry the same attributes (country, plan, platform, ...) reuse a single conversion.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def transform(self, evaluation_context: EvaluationContext):
+        attributes = evaluation_context.attributes
+        if not attributes:
+            return _EMPTY_ATTRIBUTES
+
+        key = fingerprint(attributes)
+        converted = self._entries.get(key)
+        if converted is not None:
+            return converted
+
+        converted = MappingProxyType(normalize_attributes(attributes))
+        if key is None or self._max_entries <= 0:
+            return converted
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = converted
+        return converted
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+def _consume_exception(future):
+    # a batch failure is delivered to the callers; retrieved here for flags whose callers all went away
+    if not future.cancelled():
+        future.exception()
+
+
+class _Batch():
+    __slots__ = ("fetch", "futures", "timer")
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.futures = {}
+        self.timer = None
+
+
+class EvaluationBatcher():
+    """
+    Dataloader-style batching of asyncio evaluations: flags requested for the same group (client, targeting key
+    and attributes) within `window` seconds of the group's first request are fetched with a single call, as soon
+    as the window ends or `max_batch_size` distinct flags are waiting.
+
+    `fetch(flag_keys)` returns an awaitable of {flag key: evaluation}; each caller receives the entry of its flag
+    (None when missing). A flag requested several times in one batch is fetched once. Callers wait through
+    `asyncio.shield`, so a cancelled caller never cancels the batch of the others. Groups are scoped to the
+    running event loop; a window of 0 batches the requests made in the same loop iteration.
+    """
+
+    def __init__(self, window: float = 0, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._batches = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._batched = 0
+        self._fetches = 0
+        self._full_fetches = 0
+        self._failed_fetches = 0
+        self._max_fetched = 0
+
+    async def load(self, group, flag_key: str, fetch: typing.Callable[[typing.List[str]], typing.Awaitable[dict]]):
+        """Return the evaluation of `flag_key`, fetched together with the other flags requested for `group`."""
+        loop = asyncio.get_running_loop()
+        group = (loop, group)
+        full = None
+        with self._lock:
+            self._requests += 1
+            batch = self._batches.get(group)
+            if batch is None:
+                batch = self._batches[group] = _Batch(fetch)
+                if self._window > 0:
+                    batch.timer = loop.call_later(self._window, self._flush, group, batch)
+                else:
+                    batch.timer = loop.call_soon(self._flush, group, batch)
+            future = batch.futures.get(flag_key)
+            if future is None:
+                future = batch.futures[flag_key] = loop.create_future()
+                future.add_done_callback(_consume_exception)
+            else:
+                self._batched += 1
+            if len(batch.futures) >= self._max_batch_size:
+                full = batch
+        if full is not None:
+            full.timer.cancel()
+            self._flush(group, full, True)
+        return await asyncio.shield(future)
+
+    def _flush(self, group, batch, full: bool = False):
+        with self._lock:
+            if self._batches.get(group) is not batch:
+                return
+            del self._batches[group]
+            self._fetches += 1
+            if full:
+                self._full_fetches += 1
+            self._batched += len(batch.futures) - 1
+            if len(batch.futures) > self._max_fetched:
+                self._max_fetched = len(batch.futures)
+        group[0].create_task(self._fetch(batch))
+
+    async def _fetch(self, batch):
+        try:
+            evaluated = await batch.fetch(list(batch.futures))
+        except BaseException as ex:
+            with self._lock:
+                self._failed_fetches += 1
+            _LOGGER.debug("EvaluationBatcher: fetching %d flags failed: %r", len(batch.futures), ex)
+            for future in batch.futures.values():
+                if future.done():
+                    continue
+                if isinstance(ex, Exception):
+                    future.set_exception(ex)
+                else:
+                    # cancelled (e.g. the loop is shutting down) or interrupted: no caller is left waiting
+                    future.cancel()
+            if not isinstance(ex, Exception):
+                raise
+            return
+        evaluated = evaluated or {}
+        for flag_key, future in batch.futures.items():
+            if not future.done():
+                future.set_result(evaluated.get(flag_key))
+
+    def stats(self):
+        """
+        Return {"pending", "requests", "batched", "fetches", "full_fetches", "failed_fetches", "max_fetched"}:
+        `batched` requests shared a fetch with an earlier one, `full_fetches` were triggered by `max_batch_size`
+        instead of the window, and `max_fetched` is the largest number of flags fetched at once.
+        """
+        with self._lock:
+            return {
+                "pending": sum(len(batch.futures) for batch in self._batches.values()),
+                "requests": self._requests,
+                "batched": self._batched,
+                "fetches": self._fetches,
+                "full_fetches": self._full_fetches,
+                "failed_fetches": self._failed_fetches,
+                "max_fetched": self._max_fetched,
+            }
@@ -0,0 +1,97 @@
+import logging
+import os
+import threading
+
+from openfeature.exception import GeneralError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUED = 1000
+
+
+def default_workers():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class EvaluationPool():
+    """
+    Bounded thread pool running sync evaluations for asyncio callers.
+
+    At most `max_workers` evaluations run at once and at most `max_queued` wait for a worker; submissions beyond
+    that are rejected with GeneralError instead of queueing without limit. `stats` reports the saturation.
+    """
+
+    def __init__(self, max_workers: int = None, max_queued: int = DEFAULT_MAX_QUEUED):
+        from concurrent.futures import ThreadPoolExecutor
+        self._max_workers = max_workers or default_workers()
+        self._max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="SplitProviderEval")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._max_queued_seen = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._cancelled = 0
+
+    def submit(self, function, *args):
+        """Schedule `function(*args)` and return its concurrent Future; raise GeneralError if the queue is full."""
+        with self._lock:
+            if self._queued >= self._max_queued:
+                self._rejected += 1
+                rejected = self._rejected
+            else:
+                rejected = None
+                self._queued += 1
+                self._submitted += 1
+                if self._queued > self._max_queued_seen:
+                    self._max_queued_seen = self._queued
+        if rejected is not None:
+            if rejected == 1 or rejected % 1000 == 0:
+                _LOGGER.warning("EvaluationPool: queue full (%d waiting), %d evaluations rejected so far",
+                                self._max_queued, rejected)
+            raise GeneralError("Evaluation pool is saturated")
+        future = self._executor.submit(self._run, function, args)
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    def _release_cancelled(self, future):
+        # a future cancelled while queued (e.g. its awaiting coroutine was cancelled) never reaches _run
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    def _run(self, function, args):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def stats(self):
+        """
+        Return {"workers", "active", "queued", "max_queued", "queue_limit", "submitted", "completed", "rejected",
+        "cancelled"}; `max_queued` is the highest queue depth seen and `cancelled` counts evaluations cancelled
+        while waiting for a worker.
+        """
+        with self._lock:
+            return {
+                "workers": self._max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "max_queued": self._max_queued_seen,
+                "queue_limit": self._max_queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,172 @@
+import logging
+import queue
+import threading
+import time
+import typing
+
+from openfeature.event import ProviderEventDetails
+
+_LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Item():
+    __slots__ = ("emit", "details", "update", "enqueued_at")
+
+    def __init__(self, emit, details, update):
+        self.emit = emit
+        self.details = details
+        self.update = update
+        self.enqueued_at = time.monotonic()
+
+
+def _merge_flags_changed(batch):
+    """Union of the flags of every update, or no names (None, else []) when any update did not name its flags."""
+    names = set()
+    for item in batch:
+        flags_changed = item.details.flags_changed
+        if flags_changed is None:
+            return None
+        if not flags_changed:
+            names = None
+        elif names is not None:
+            names.update(flags_changed)
+    return [] if names is None else sorted(names)
+
+
+class EventDispatcher():
+    """
+    Delivers provider events from a dedicated thread, so slow OpenFeature handlers never stall the Split SDK's
+    synchronization thread or the event loop.
+
+    Configuration updates queued within `window` seconds of each other are merged into a single event whose
+    `flags_changed` is the union of their flags; other events are delivered one by one, in order.
+    """
+
+    def __init__(self, window: float = 0):
+        self._window = window
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._max_depth = 0
+        self._received = 0
+        self._delivered = 0
+        self._coalesced = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    def dispatch(self, emit: typing.Callable[[ProviderEventDetails], None], details: ProviderEventDetails):
+        """Queue `emit(details)`."""
+        self._put(_Item(emit, details, False))
+
+    def dispatch_update(self, emit: typing.Callable[[ProviderEventDetails], None], details: ProviderEventDetails):
+        """Queue a configuration update, to be merged with the updates that follow within the window."""
+        self._put(_Item(emit, details, True))
+
+    def _put(self, item):
+        with self._lock:
+            if self._stopped:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="SplitProviderEvents",
+                                                daemon=True)
+                self._thread.start()
+            self._received += 1
+            self._queue.put(item)
+            depth = self._queue.qsize()
+            if depth > self._max_depth:
+                self._max_depth = depth
+
+    def _run(self, events):
+        while True:
+            item = events.get()
+            if item is _STOP:
+                return
+            if not item.update:
+                self._deliver(item.emit, item.details, item.enqueued_at, 1)
+                continue
+
+            batch = [item]
+            following = None
+            deadline = item.enqueued_at + self._window
+            while True:
+                timeout = deadline - time.monotonic()
+                try:
+                    following = events.get(timeout=timeout) if timeout > 0 else events.get_nowait()
+                except queue.Empty:
+                    following = None
+                    break
+                if following is _STOP or not following.update:
+                    break
+                batch.append(following)
+                following = None
+
+            last = batch[-1]
+            details = last.details
+            if len(batch) > 1:
+                metadata = dict(details.metadata)
+                metadata["coalesced_events"] = len(batch)
+                details = ProviderEventDetails(flags_changed=_merge_flags_changed(batch), message=details.message,
+                                               error_code=details.error_code, metadata=metadata)
+            self._deliver(last.emit, details, item.enqueued_at, len(batch))
+
+            if following is _STOP:
+                return
+            if following is not None:
+                self._deliver(following.emit, following.details, following.enqueued_at, 1)
+
+    def _deliver(self, emit, details, enqueued_at, events):
+        lag = time.monotonic() - enqueued_at
+        with self._lock:
+            self._last_lag = lag
+            if lag > self._max_lag:
+                self._max_lag = lag
+            self._delivered += 1
+            self._coalesced += events - 1
+        if events > 1:
+            _LOGGER.debug("EventDispatcher: %d updates merged, flags_changed=%s", events, details.flags_changed)
+        try:
+            emit(details)
+        except Exception as ex:
+            _LOGGER.debug("EventDispatcher: event handler error: %s", ex)
+
+    def stats(self):
+        """
+        Return {"depth", "max_depth", "received", "delivered", "coalesced", "last_lag_ms", "max_lag_ms"}; the lag
+        is the time from queueing an event (the first of a merged batch) to its delivery.
+        """
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_depth": self._max_depth,
+                "received": self._received,
+                "delivered": self._delivered,
+                "coalesced": self._coalesced,
+                "last_lag_ms": self._last_lag * 1000,
+                "max_lag_ms": self._max_lag * 1000,
+            }
+
+    def stop(self, timeout: float = 5):
+        """Deliver the queued events, then stop the dispatch thread."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+            events = self._queue
+        if thread is None:
+            return
+        events.put(_STOP)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def restart(self):
+        """Accept events again after `stop`; they are delivered by a new dispatch thread with its own queue."""
+        with self._lock:
+            if not self._stopped:
+                return
+            self._stopped = False
+            self._thread = None
+            self._queue = queue.Queue()
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+
+
+class EventLoopThread():
+    """
+    Daemon thread running its own asyncio event loop, used when an asyncio factory is driven from sync code only.
+    Coroutines are submitted from any other thread with `run`.
+    """
+
+    def __init__(self, name: str = "SplitProviderEventLoop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coroutine):
+        """Run `coroutine` on the loop and block the calling thread, which must not be the loop's, until it completes."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import threading
+import time
+import typing
+import zlib
+
+from split_openfeature_provider.split_client_wrapper import split_sdk_symbol
+
+CONTROL = "control"
+
+FLAG_UPDATE = "FLAG_UPDATE"
+SEGMENTS_UPDATE = "SEGMENTS_UPDATE"
+
+
+def _bucket(key: str, seed: int):
+    """Bucket 1-100 of a key, deterministic across processes (not the Split SDK's murmur3 buckets)."""
+    return zlib.crc32(("%s:%d" % (key, seed)).encode("utf-8")) % 100 + 1
+
+
+def _rollout_treatment(rollout, bucket, fallback):
+    covered = 0
+    for treatment, percent in rollout:
+        covered += percent
+        if bucket <= covered:
+            return treatment
+    return fallback
+
+
+class FakeRule():
+    """
+    Targeting rule of a `FakeFlag`: matches when the key is in `segment` (if given) and every entry of
+    `attributes` matches; a list, tuple or set accepts any of its values, a callable is a predicate on the
+    attribute value. A matching rule serves `treatment`, or a `rollout` ({treatment: percent}).
+    """
+
+    def __init__(self, treatment: str = None, attributes: typing.Dict[str, typing.Any] = None, segment: str = None,
+                 rollout: typing.Dict[str, int] = None):
+        if treatment is None and rollout is None:
+            raise ValueError("FakeRule needs a treatment or a rollout")
+        self.treatment = treatment
+        self.attributes = dict(attributes or {})
+        self.segment = segment
+        self.rollout = list((rollout or {}).items())
+
+    def matches(self, key, attributes, segments):
+        if self.segment is not None and key not in segments.get(self.segment, ()):
+            return False
+        for name, expected in self.attributes.items():
+            if attributes is None or name not in attributes:
+                return False
+            value = attributes[name]
+            if callable(expected):
+                if not expected(value):
+                    return False
+            elif isinstance(expected, (list, tuple, set, frozenset)):
+                if value not in expected:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+
+class FakeFlag():
+    """
+    Flag definition of the fake Split backend, evaluated the way Split does: killed flags serve the default
+    treatment, then `keys` ({key: treatment}) whitelists, then the first matching rule, then the `rollout`
+    ({treatment: percent}, the rest of the keys getting the default treatment). `configs` maps treatments to their
+    dynamic config (a JSON string or a dict); `sets` are the flag sets the flag belongs to.
+    """
+
+    def __init__(self, name: str, default_treatment: str = "off", rollout: typing.Dict[str, int] = None,
+                 keys: typing.Dict[str, str] = None, rules: typing.Sequence[FakeRule] = (),
+                 configs: typing.Dict[str, typing.Any] = None, killed: bool = False, seed: int = None,
+                 sets: typing.Iterable[str] = ()):
+        self.name = name
+        self.sets = frozenset(sets)
+        self.default_treatment = default_treatment
+        self.rollout = list((rollout or {}).items())
+        self.keys = dict(keys or {})
+        self.rules = list(rules)
+        self.configs = {treatment: config if config is None or isinstance(config, str) else json.dumps(config)
+                        for treatment, config in (configs or {}).items()}
+        self.killed = killed
+        self.seed = seed if seed is not None else zlib.crc32(name.encode("utf-8"))
+
+    def treatment(self, key, attributes, segments):
+        if self.killed:
+            return self.default_treatment
+        treatment = self.keys.get(key)
+        if treatment is not None:
+            return treatment
+        for rule in self.rules:
+            if rule.matches(key, attributes, segments):
+                if rule.treatment is not None:
+                    return rule.treatment
+                return _rollout_treatment(rule.rollout, _bucket(key, self.seed), self.default_treatment)
+        if self.rollout:
+            return _rollout_treatment(self.rollout, _bucket(key, self.seed), self.default_treatment)
+        return self.default_treatment
+
+    def evaluate(self, key, attributes, segments):
+        treatment = self.treatment(key, attributes, segments)
+        return treatment, self.configs.get(treatment)
+
+
+class FakeEventsMetadata():
+    """SDK_UPDATE metadata, read like the Split SDK's EventsMetadata."""
+
+    def __init__(self, type: str, names: typing.List[str]):
+        self._type = type
+        self._names = list(names)
+
+    def get_type(self):
+        return self._type
+
+    def get_names(self):
+        return self._names
+
+
+class FakeEventsManager():
+    """Handlers registered by `SplitClientWrapper` through `factory._events_manager.register`."""
+
+    def __init__(self):
+        self._handlers = {}
+
+    def register(self, sdk_event, event_handler):
+        self._handlers[getattr(sdk_event, "value", sdk_event)] = event_handler
+
+    def fire(self, event_name, event_metadata):
+        handler = self._handlers.get(event_name)
+        if handler is not None:
+            handler(event_metadata)
+
+
+class FakeEventsManagerAsync(FakeEventsManager):
+
+    def __init__(self):
+        super().__init__()
+        self._loop = None
+
+    async def register(self, sdk_event, event_handler):
+        self._loop = asyncio.get_running_loop()
+        super().register(sdk_event, event_handler)
+
+    def fire(self, event_name, event_metadata):
+        handler = self._handlers.get(event_name)
+        if handler is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(handler(event_metadata))
+        else:
+            asyncio.run_coroutine_threadsafe(handler(event_metadata), self._loop)
+
+
+class FakeSplitClient():
+    """In-memory Split client evaluating the flags of its `FakeSplitFactory`."""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def get_treatment(self, key, feature_flag_name, attributes=None):
+        return self._factory._evaluate(key, feature_flag_name, attributes)[0]
+
+    def get_treatment_with_config(self, key, feature_flag_name, attributes=None):
+        return self._factory._evaluate(key, feature_flag_name, attributes)
+
+    def get_treatments(self, key, feature_flag_names, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes)[0] for name in feature_flag_names}
+
+    def get_treatments_with_config(self, key, feature_flag_names, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes) for name in feature_flag_names}
+
+    def get_treatments_with_config_by_flag_set(self, key, flag_set, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes) for name in self._factory._flags_in_set(flag_set)}
+
+    def track(self, key, traffic_type, event_type, value=None, properties=None):
+        return self._factory._track(key, traffic_type, event_type, value, properties)
+
+    def destroy(self):
+        self._factory.destroy()
+
+
+class FakeSplitClientAsync(FakeSplitClient):
+    """Asyncio flavour of `FakeSplitClient`, for `SplitProviderAsync`."""
+
+    async def get_treatment(self, key, feature_flag_name, attributes=None):
+        return self._factory._evaluate(key, feature_flag_name, attributes)[0]
+
+    async def get_treatment_with_config(self, key, feature_flag_name, attributes=None):
+        return self._factory._evaluate(key, feature_flag_name, attributes)
+
+    async def get_treatments(self, key, feature_flag_names, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes)[0] for name in feature_flag_names}
+
+    async def get_treatments_with_config(self, key, feature_flag_names, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes) for name in feature_flag_names}
+
+    async def get_treatments_with_config_by_flag_set(self, key, flag_set, attributes=None):
+        return {name: self._factory._evaluate(key, name, attributes) for name in self._factory._flags_in_set(flag_set)}
+
+    async def track(self, key, traffic_type, event_type, value=None, properties=None):
+        return self._factory._track(key, traffic_type, event_type, value, properties)
+
+    async def destroy(self):
+        self._factory.destroy()
+
+
+class FakeSplitFactory():
+    """
+    In-process stand-in for a Split factory, for load tests and benchmarks of the provider without a Split backend:
+    pass `factory.client()` as the `SplitClient` of `SplitProvider` (or, with `asyncio_mode`, `SplitProviderAsync`).
+
+    Flags, segments and readiness are programmed at runtime; `set_ready`, `update_flags`, `remove_flags` and
+    `update_segment` fire SDK_READY and SDK_UPDATE through the same `_events_manager.register` handlers the Split SDK
+    calls, from the calling thread. Each flag evaluation spins for `evaluation_cost` seconds on top of matching its
+    rules, so benchmarks see a fixed, known SDK cost instead of a mock's. Tracked events are kept in `events`.
+    """
+
+    def __init__(self, flags: typing.Sequence[FakeFlag] = (), segments: typing.Dict[str, typing.Iterable[str]] = None,
+                 ready: bool = True, evaluation_cost: float = 0, asyncio_mode: bool = False):
+        self._flags = {flag.name: flag for flag in flags}
+        self._segments = {name: frozenset(keys) for name, keys in (segments or {}).items()}
+        self._evaluation_cost = evaluation_cost
+        self._ready = threading.Event()
+        if ready:
+            self._ready.set()
+        self._asyncio_mode = asyncio_mode
+        self._events_manager = FakeEventsManagerAsync() if asyncio_mode else FakeEventsManager()
+        self._lock = threading.Lock()
+        self.destroyed = False
+        self.evaluations = 0
+        self.events = []
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def client(self):
+        return FakeSplitClientAsync(self) if self._asyncio_mode else FakeSplitClient(self)
+
+    def block_until_ready(self, timeout=None):
+        if not self._ready.wait(timeout):
+            raise (split_sdk_symbol("TimeoutException") or TimeoutError)("Waited %s seconds, and sdk was not ready"
+                                                                          % timeout)
+
+    def destroy(self, destroy_event=None):
+        self.destroyed = True
+        if destroy_event is not None:
+            destroy_event.set()
+
+    def set_ready(self):
+        """Mark the factory ready and fire SDK_READY."""
+        if self._ready.is_set():
+            return
+        self._ready.set()
+        self._events_manager.fire("SDK_READY", None)
+
+    def update_flags(self, *flags: FakeFlag):
+        """Add or replace flags and fire SDK_UPDATE naming them."""
+        with self._lock:
+            flags_by_name = dict(self._flags)
+            flags_by_name.update((flag.name, flag) for flag in flags)
+            self._flags = flags_by_name
+        self._fire_update(FLAG_UPDATE, [flag.name for flag in flags])
+
+    def remove_flags(self, *names: str):
+        """Remove flags and fire SDK_UPDATE naming them."""
+        with self._lock:
+            self._flags = {name: flag for name, flag in self._flags.items() if name not in names}
+        self._fire_update(FLAG_UPDATE, list(names))
+
+    def update_segment(self, name: str, keys: typing.Iterable[str]):
+        """Replace the keys of a segment and fire SDK_UPDATE without flag names, as Split does for segments."""
+        with self._lock:
+            self._segments = dict(self._segments, **{name: frozenset(keys)})
+        self._fire_update(SEGMENTS_UPDATE, [])
+
+    def _fire_update(self, update_type, names):
+        if self._ready.is_set():
+            self._events_manager.fire("SDK_UPDATE", FakeEventsMetadata(update_type, names))
+
+    def _evaluate(self, key, flag_name, attributes):
+        if self._evaluation_cost:
+            deadline = time.perf_counter() + self._evaluation_cost
+            while time.perf_counter() < deadline:
+                pass
+        self.evaluations += 1
+        if self.destroyed or not self._ready.is_set():
+            return CONTROL, None
+        flag = self._flags.get(flag_name)
+        if flag is None:
+            return CONTROL, None
+        return flag.evaluate(key, attributes, self._segments)
+
+    def _flags_in_set(self, flag_set):
+        return [name for name, flag in self._flags.items() if flag_set in flag.sets]
+
+    def _track(self, key, traffic_type, event_type, value, properties):
+        if self.destroyed:
+            return False
+        with self._lock:
+            self.events.append((key, traffic_type, event_type, value, properties))
+        return True
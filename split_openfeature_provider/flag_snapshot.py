@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+# Layout of a snapshot directory, readable by the Split SDK in localhost JSON mode
+SNAPSHOT_FLAGS_FILE = "flags.json"
+SNAPSHOT_SEGMENTS_DIR = "segments"
+
+SOURCE_SNAPSHOT = "snapshot"
+
+
+def has_snapshot(directory: str):
+    return os.path.isfile(os.path.join(directory, SNAPSHOT_FLAGS_FILE))
+
+
+def snapshot_config(directory: str):
+    """Split SDK configuration of a localhost factory serving the snapshot stored in `directory`."""
+    return {
+        "splitFile": os.path.join(directory, SNAPSHOT_FLAGS_FILE),
+        "segmentDirectory": os.path.join(directory, SNAPSHOT_SEGMENTS_DIR),
+        "localhostRefreshEnabled": False,
+    }
+
+
+def _changes(items, change_number):
+    return {"d": items, "s": change_number, "t": change_number}
+
+
+def collect_snapshot(storages):
+    """
+    Read flag, rule-based segment and segment definitions out of the in-memory storages of a Split factory.
+
+    :return: tuple of (flag changes in localhost JSON format, {segment name: segment JSON}).
+    """
+    split_storage = storages["splits"]
+    rbs_storage = storages.get("rule_based_segments")
+    segment_storage = storages["segments"]
+
+    flags = [split.to_json() for split in split_storage.get_all_splits()]
+    segment_names = set(split_storage.get_segment_names())
+    rule_based = []
+    rbs_change_number = -1
+    if rbs_storage is not None:
+        for name in rbs_storage.get_segment_names():
+            rule_based_segment = rbs_storage.get(name)
+            if rule_based_segment is not None:
+                rule_based.append(rule_based_segment.to_json())
+                segment_names.update(rule_based_segment.get_condition_segment_names())
+        rbs_change_number = rbs_storage.get_change_number()
+
+    segments = {}
+    for name in segment_names:
+        segment = segment_storage.get(name)
+        if segment is not None:
+            segments[name] = {"name": name, "added": list(segment.keys), "removed": [],
+                              "since": segment.change_number, "till": segment.change_number}
+
+    changes = {"ff": _changes(flags, split_storage.get_change_number()), "rbs": _changes(rule_based, rbs_change_number)}
+    return changes, segments
+
+
+async def collect_snapshot_async(storages):
+    """Asyncio counterpart of `collect_snapshot` for the storages of an asyncio Split factory."""
+    split_storage = storages["splits"]
+    rbs_storage = storages.get("rule_based_segments")
+    segment_storage = storages["segments"]
+
+    flags = [split.to_json() for split in await split_storage.get_all_splits()]
+    segment_names = set(await split_storage.get_segment_names())
+    rule_based = []
+    rbs_change_number = -1
+    if rbs_storage is not None:
+        for name in await rbs_storage.get_segment_names():
+            rule_based_segment = await rbs_storage.get(name)
+            if rule_based_segment is not None:
+                rule_based.append(rule_based_segment.to_json())
+                segment_names.update(rule_based_segment.get_condition_segment_names())
+        rbs_change_number = await rbs_storage.get_change_number()
+
+    segments = {}
+    for name in segment_names:
+        segment = await segment_storage.get(name)
+        if segment is not None:
+            segments[name] = {"name": name, "added": list(segment.keys), "removed": [],
+                              "since": segment.change_number, "till": segment.change_number}
+
+    changes = {"ff": _changes(flags, await split_storage.get_change_number()),
+               "rbs": _changes(rule_based, rbs_change_number)}
+    return changes, segments
+
+
+def _dumps(payload):
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _write_atomically(path, text):
+    # a unique temp file per writer, so threads and processes sharing the directory never write into each other's
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".tmp-")
+    try:
+        with os.fdopen(descriptor, "w") as output:
+            output.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _segment_version(segment):
+    return segment["till"], len(segment["added"])
+
+
+class SnapshotWriter():
+    """
+    Writes the snapshots of one provider to `directory`. Only the segment files whose segment changed since the
+    previous write are replaced, files of segments no longer referenced are removed, and nothing is written when
+    nothing changed. `schedule` runs the collection and the write on a background thread, coalescing the
+    requests made while a write is in progress.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._lock = threading.Lock()
+        # {segment name: version} and flags digest of the last write, None until the first one
+        self._segments = None
+        self._flags_digest = None
+        self._condition = threading.Condition()
+        self._pending = None
+        self._thread = None
+        self._stopped = False
+
+    def write(self, changes: typing.Dict, segments: typing.Dict[str, typing.Dict]):
+        """
+        Persist a snapshot collected by `collect_snapshot`. Every file is replaced atomically, segments before
+        flags, so a process starting concurrently never reads a half-written file.
+
+        :return: whether anything was written.
+        """
+        flags = _dumps(changes)
+        flags_digest = hashlib.sha1(flags.encode()).digest()
+        versions = {name: _segment_version(segment) for name, segment in segments.items()}
+        with self._lock:
+            previous = self._segments or {}
+            if versions == self._segments and flags_digest == self._flags_digest:
+                return False
+            segments_dir = os.path.join(self._directory, SNAPSHOT_SEGMENTS_DIR)
+            os.makedirs(segments_dir, exist_ok=True)
+            changed = [name for name in segments if previous.get(name) != versions[name]]
+            for name in changed:
+                _write_atomically(os.path.join(segments_dir, "%s.json" % name), _dumps(segments[name]))
+            _write_atomically(os.path.join(self._directory, SNAPSHOT_FLAGS_FILE), flags)
+            for file_name in os.listdir(segments_dir):
+                if file_name.endswith(".json") and file_name[:-len(".json")] not in segments:
+                    try:
+                        os.remove(os.path.join(segments_dir, file_name))
+                    except FileNotFoundError:
+                        pass
+            self._segments = versions
+            self._flags_digest = flags_digest
+        _LOGGER.debug("Split flag snapshot written to %s (%d flags, %d of %d segments)", self._directory,
+                      len(changes["ff"]["d"]), len(changed), len(segments))
+        return True
+
+    def schedule(self, collect: typing.Callable[[], typing.Tuple[typing.Dict, typing.Dict]]):
+        """Write the snapshot returned by `collect()` on the writer's background thread."""
+        with self._condition:
+            if self._stopped:
+                return
+            self._pending = collect
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SplitProviderSnapshotWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                collect, self._pending = self._pending, None
+            if collect is None:
+                return
+            try:
+                self.write(*collect())
+            except Exception as ex:
+                _LOGGER.warning("Split flag snapshot could not be written to %s: %s", self._directory, ex)
+
+    def stop(self, timeout: float = 5):
+        """Finish the scheduled write, if any, and stop the background thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+
+def write_snapshot(directory: str, changes: typing.Dict, segments: typing.Dict[str, typing.Dict]):
+    """Persist a snapshot collected by `collect_snapshot` (see `SnapshotWriter.write`)."""
+    SnapshotWriter(directory).write(changes, segments)
+
+
+def snapshot_version(directory: str):
+    """Identity of the published snapshot; every `write_snapshot` replaces the flags file, changing it."""
+    try:
+        stat = os.stat(os.path.join(directory, SNAPSHOT_FLAGS_FILE))
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _segment_change_numbers(storages):
+    change_numbers = {}
+    for name in storages["splits"].get_segment_names():
+        segment = storages["segments"].get(name)
+        change_numbers[name] = None if segment is None else segment.change_number
+    return change_numbers
+
+
+def changed_flags(old_storages, new_storages):
+    """
+    Names of the flags that differ between the storages of two snapshot factories, or None when segments
+    changed as well, since any flag may then evaluate differently.
+    """
+    if _segment_change_numbers(old_storages) != _segment_change_numbers(new_storages):
+        return None
+    old_flags = {split.name: split.change_number for split in old_storages["splits"].get_all_splits()}
+    new_flags = {split.name: split.change_number for split in new_storages["splits"].get_all_splits()}
+    return sorted(name for name in old_flags.keys() | new_flags.keys() if old_flags.get(name) != new_flags.get(name))
@@ -0,0 +1,118 @@
+import json
+import typing
+
+from openfeature.immutable_dict.mapping_proxy_type import MappingProxyType
+
+# Distinct treatment/config strings kept per flag before that flag's entries are recycled
+DEFAULT_MAX_ENTRIES_PER_FLAG = 32
+
+_MISSING = object()
+
+
+def thaw(value):
+    """Return a plain, mutable deep copy of a value returned by `freeze`."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class ImmutableDict(MappingProxyType):
+    """
+    OpenFeature's read-only MappingProxyType, copied and pickled as a plain dict so callers can take a mutable
+    copy of a shared cached value.
+    """
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ImmutableList(list):
+    """Read-only list, the sequence counterpart of ImmutableDict, copied and pickled as a plain list."""
+
+    def __hash__(self) -> int:  # type:ignore[override]
+        return id(self)
+
+    def _immutable(self, *args, **kws):
+        raise TypeError("immutable instance of list")
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    clear = _immutable
+    sort = _immutable
+    reverse = _immutable
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value):
+    """Return a deep immutable view of a decoded JSON value, safe to share between callers."""
+    if isinstance(value, dict):
+        return ImmutableDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return ImmutableList(freeze(v) for v in value)
+    return value
+
+
+class ParsedJsonCache():
+    """
+    Cache of decoded JSON strings (object treatments and dynamic configs), indexed by flag name.
+
+    Entries are immutable views, so the same object is handed to every caller. `invalidate` drops the entries of
+    the flags named in an SDK_UPDATE, or everything when the update carries no names.
+    """
+
+    def __init__(self, decoder: typing.Callable[[str], typing.Any] = None,
+                 max_entries_per_flag: int = DEFAULT_MAX_ENTRIES_PER_FLAG):
+        self._decoder = decoder if decoder is not None else json.loads
+        self._max_entries_per_flag = max_entries_per_flag
+        self._entries = {}
+
+    def get(self, flag_key: str, text: str):
+        """
+        Return the decoded, frozen value of `text`; decoder errors propagate to the caller and are not cached.
+        """
+        flag_entries = self._entries.get(flag_key)
+        if flag_entries is not None:
+            value = flag_entries.get(text, _MISSING)
+            if value is not _MISSING:
+                return value
+        else:
+            flag_entries = self._entries.setdefault(flag_key, {})
+
+        value = freeze(self._decoder(text))
+        if len(flag_entries) >= self._max_entries_per_flag:
+            flag_entries.clear()
+        flag_entries[text] = value
+        return value
+
+    def invalidate(self, flag_names: typing.Optional[typing.List[str]] = None):
+        if flag_names is None:
+            self._entries = {}
+            return
+        for flag_name in flag_names:
+            self._entries.pop(flag_name, None)
+
+    def __len__(self):
+        return sum(len(flag_entries) for flag_entries in list(self._entries.values()))
@@ -0,0 +1,128 @@
+import bisect
+import logging
+import threading
+import time
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+STAGE_READY = "ready"
+STAGE_CONTEXT = "context"
+STAGE_SDK = "sdk"
+STAGE_PROCESS = "process"
+STAGE_TOTAL = "total"
+
+# Upper bounds (microseconds) of the histogram buckets; an extra bucket counts everything above the last one
+BUCKET_BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 500000)
+_BUCKET_BOUNDS_NS = tuple(bound * 1000 for bound in BUCKET_BOUNDS_US)
+
+
+class _Histogram():
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_NS) + 1)
+
+    def add(self, duration_ns):
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS_NS, duration_ns)] += 1
+
+    def snapshot(self):
+        buckets = {str(bound): count for bound, count in zip(BUCKET_BOUNDS_US, self.buckets)}
+        buckets["+Inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "sum_ms": self.total_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "buckets_us": buckets,
+        }
+
+
+class EvaluationTimer():
+    """
+    Stopwatch for one evaluation; `mark` closes the current stage, `stop` hands the stages and the time since
+    the start to the recorder.
+    """
+    __slots__ = ("_recorder", "_flag_key", "_start", "_last", "_stages")
+
+    def __init__(self, recorder, flag_key):
+        self._recorder = recorder
+        self._flag_key = flag_key
+        self._stages = []
+        self._start = self._last = time.perf_counter_ns()
+
+    def mark(self, stage: str):
+        now = time.perf_counter_ns()
+        self._stages.append((stage, now - self._last))
+        self._last = now
+
+    def stop(self):
+        self._recorder.record(self._flag_key, self._stages, time.perf_counter_ns() - self._start)
+
+
+class LatencyRecorder():
+    """
+    Per-flag, per-stage latency histograms for the evaluation path.
+
+    Stages are `ready` (readiness check), `context` (context transformation), `sdk` (Split SDK call) and
+    `process` (treatment coercion), plus the `total` evaluation time. Evaluations returning early (not ready,
+    cached, errors) only have the stages they reached, but their total still covers the whole call. Evaluations
+    whose total exceeds `slow_threshold_ms` are logged with the flag key and the slowest stage.
+    """
+
+    def __init__(self, slow_threshold_ms: typing.Optional[float] = None):
+        self._slow_threshold_ns = None if slow_threshold_ms is None else int(slow_threshold_ms * 1e6)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def start(self, flag_key: str):
+        return EvaluationTimer(self, flag_key)
+
+    def record(self, flag_key: str, stages: typing.List[typing.Tuple[str, int]],
+               total_ns: typing.Optional[int] = None):
+        """Add one evaluation; `total_ns` defaults to the sum of `stages`."""
+        if total_ns is None:
+            if not stages:
+                return
+            total_ns = sum(duration for _, duration in stages)
+        with self._lock:
+            flag_histograms = self._histograms.get(flag_key)
+            if flag_histograms is None:
+                flag_histograms = self._histograms[flag_key] = {}
+            for stage, duration in stages:
+                histogram = flag_histograms.get(stage)
+                if histogram is None:
+                    histogram = flag_histograms[stage] = _Histogram()
+                histogram.add(duration)
+            histogram = flag_histograms.get(STAGE_TOTAL)
+            if histogram is None:
+                histogram = flag_histograms[STAGE_TOTAL] = _Histogram()
+            histogram.add(total_ns)
+
+        if self._slow_threshold_ns is not None and total_ns > self._slow_threshold_ns:
+            if not stages:
+                _LOGGER.warning("Slow evaluation of flag %s: %.3f ms total before any stage completed",
+                                flag_key, total_ns / 1e6)
+                return
+            slowest_stage, slowest_ns = max(stages, key=lambda stage: stage[1])
+            _LOGGER.warning("Slow evaluation of flag %s: %.3f ms total, slowest stage %s took %.3f ms",
+                            flag_key, total_ns / 1e6, slowest_stage, slowest_ns / 1e6)
+
+    def snapshot(self):
+        """
+        Return {flag_key: {stage: {"count", "sum_ms", "max_ms", "buckets_us"}}}; bucket keys are upper bounds in
+        microseconds and the counts are per bucket (not cumulative).
+        """
+        with self._lock:
+            return {flag_key: {stage: histogram.snapshot() for stage, histogram in flag_histograms.items()}
+                    for flag_key, flag_histograms in self._histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
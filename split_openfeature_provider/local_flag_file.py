@@ -0,0 +1,202 @@
+import copy
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+# First line of an item of the top-level YAML list: "- flag_name:"
+_YAML_ITEM_RE = re.compile(r"^-\s+(?P<quote>['\"]?)(?P<name>[^'\":#]+?)(?P=quote)\s*:")
+_YAML_SKIP_RE = re.compile(r"^\s*(#.*)?$")
+
+# Split SDK (major, minor) versions whose localhost internals the per-flag reloads were tested with
+TESTED_SDK_VERSIONS = ((10, 5), (10, 6), (10, 7))
+
+# Private members of the SDK's LocalSplitSynchronizer that convert and sanitize single flags
+_SYNCHRONIZER_INTERNALS = ("_convert_yaml_to_feature_flag", "_sanitize_feature_flag_elements",
+                           "_sanitize_rb_segment_elements")
+
+
+def _digest(text: str):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def is_local_flag_file(path: str):
+    return path.lower().endswith((".yaml", ".yml", ".json"))
+
+
+def check_sdk_internals():
+    """Raise RuntimeError unless the installed Split SDK has the localhost internals `LocalFlagFile` relies on."""
+    from split_openfeature_provider.split_client_wrapper import sdk_version
+    version = sdk_version()
+    if version not in TESTED_SDK_VERSIONS:
+        raise RuntimeError("per-flag reloads are not tested with Split SDK %d.%d" % version)
+    local_sync = importlib.import_module("splitio.sync.split").LocalSplitSynchronizer
+    missing = [name for name in _SYNCHRONIZER_INTERNALS if not hasattr(local_sync, name)]
+    if missing:
+        raise RuntimeError("Split SDK LocalSplitSynchronizer has no %s" % ", ".join(missing))
+
+
+class LocalFlagChanges():
+    """Flags to put into and remove from the Split storage after a local flag file changed."""
+
+    __slots__ = ("to_add", "to_delete", "change_number", "rule_based_segments")
+
+    def __init__(self, to_add, to_delete, change_number, rule_based_segments=None):
+        self.to_add = to_add
+        self.to_delete = to_delete
+        self.change_number = change_number
+        # (rule-based segments, change number) replacing the stored ones, None when they did not change
+        self.rule_based_segments = rule_based_segments
+
+    @property
+    def names(self):
+        return sorted([split.name for split in self.to_add] + list(self.to_delete))
+
+
+class LocalFlagFile():
+    """
+    Per-flag content hashes of a localhost mode flag file (YAML or JSON), so a change to the file reloads only
+    the flags whose definition changed.
+
+    YAML files are cut into the items of their top-level list without parsing them, and only the items of changed
+    flags are parsed. JSON files are decoded at once, but only changed flags are sanitized and converted to Split
+    objects. The file is read as-is; `prime` records the state the Split SDK loaded and `reload` returns what
+    changed since.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._json = path.lower().endswith(".json")
+        self._hashes = {}
+        self._rule_based_hash = None
+        self._version = None
+
+    def version(self):
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def prime(self):
+        """Record the hashes of the flags currently in the file."""
+        self._version = self.version()
+        if self._json:
+            flags, _, rule_based = self._read_json()
+            self._hashes = {name: digest for name, (digest, _) in flags.items()}
+            self._rule_based_hash = rule_based[0]
+        else:
+            self._hashes = {name: digest for name, (digest, _) in self._read_yaml().items()}
+
+    def reload(self) -> typing.Optional[LocalFlagChanges]:
+        """Changes since the previous `prime`/`reload`, or None when the file did not change."""
+        version = self.version()
+        if version is None or version == self._version:
+            return None
+        self._version = version
+        changes = self._reload_json() if self._json else self._reload_yaml()
+        if not changes.to_add and not changes.to_delete and changes.rule_based_segments is None:
+            return None
+        return changes
+
+    def _read_text(self):
+        with open(self._path, "r") as flag_file:
+            return flag_file.read()
+
+    # YAML: "- flag_name:" items of a top-level list, several items per flag for key whitelists
+
+    def _read_yaml(self):
+        """{flag name: (digest, [item texts])}, cutting the top-level list without parsing the items."""
+        text = self._read_text()
+        items = {}
+        name = None
+        lines = []
+        for line in text.splitlines():
+            if line.startswith("-"):
+                match = _YAML_ITEM_RE.match(line)
+                if match is None:
+                    return self._read_yaml_parsed(text)
+                if name is not None:
+                    items.setdefault(name, []).append("\n".join(lines))
+                name = match.group("name").strip()
+                lines = [line]
+            elif name is not None:
+                lines.append(line)
+            elif not _YAML_SKIP_RE.match(line):
+                # not a plain top-level list
+                return self._read_yaml_parsed(text)
+        if name is not None:
+            items.setdefault(name, []).append("\n".join(lines))
+        return {name: (_digest("\n".join(texts)), texts) for name, texts in items.items()}
+
+    def _read_yaml_parsed(self, text):
+        yaml = importlib.import_module("yaml")
+        items = {}
+        for statement in yaml.safe_load(text) or []:
+            name = next(iter(statement.keys()))
+            items.setdefault(name, []).append(yaml.safe_dump([statement], default_flow_style=False))
+        return {name: (_digest("\n".join(texts)), texts) for name, texts in items.items()}
+
+    def _reload_yaml(self):
+        items = self._read_yaml()
+        changed = [name for name, (digest, _) in items.items() if self._hashes.get(name) != digest]
+        removed = [name for name in self._hashes if name not in items]
+        to_add = []
+        if changed:
+            yaml = importlib.import_module("yaml")
+            statements = yaml.safe_load("\n".join(text for name in changed for text in items[name][1]))
+            local_sync = importlib.import_module("splitio.sync.split").LocalSplitSynchronizer
+            to_add = list(local_sync._convert_yaml_to_feature_flag(statements).values())
+        self._hashes = {name: digest for name, (digest, _) in items.items()}
+        return LocalFlagChanges(to_add, removed, 0)
+
+    # JSON: the localhost JSON format, {"ff": {"d": [...], "t": ...}, "rbs": {...}}
+
+    def _read_json(self):
+        """({flag name: (digest, definition)}, flags change number, (rule-based digest, section))."""
+        parsed = json.loads(self._read_text())
+        if parsed.get("splits"):
+            parsed = importlib.import_module("splitio.sync.util").convert_to_new_spec(parsed)
+        section = parsed.get("ff") or {}
+        flags = {}
+        for definition in section.get("d") or []:
+            name = definition.get("name")
+            if name:
+                flags[name] = (_digest(json.dumps(definition, sort_keys=True)), definition)
+        rule_based = parsed.get("rbs") or {}
+        return flags, section.get("t", -1), (_digest(json.dumps(rule_based, sort_keys=True)), rule_based)
+
+    def _sanitizer(self):
+        sync_module = importlib.import_module("splitio.sync.split")
+        return sync_module.LocalSplitSynchronizer(self._path, None, None, sync_module.LocalhostMode.JSON)
+
+    def _reload_json(self):
+        flags, change_number, (rule_based_hash, rule_based) = self._read_json()
+        changed = [definition for name, (digest, definition) in flags.items() if self._hashes.get(name) != digest]
+        removed = [name for name in self._hashes if name not in flags]
+        sanitizer = None
+        to_add = []
+        if changed:
+            sanitizer = self._sanitizer()
+            splits = importlib.import_module("splitio.models.splits")
+            # sanitizing fills defaults in place, the hashes stay those of the file content
+            to_add = [splits.from_raw(definition)
+                      for definition in sanitizer._sanitize_feature_flag_elements(copy.deepcopy(changed))]
+
+        rule_based_changes = None
+        if rule_based_hash != self._rule_based_hash:
+            sanitizer = sanitizer or self._sanitizer()
+            rule_based_segments = importlib.import_module("splitio.models.rule_based_segments")
+            definitions = sanitizer._sanitize_rb_segment_elements(copy.deepcopy(rule_based.get("d") or []))
+            rule_based_changes = ([rule_based_segments.from_raw(definition) for definition in definitions],
+                                  rule_based.get("t", -1))
+
+        self._hashes = {name: digest for name, (digest, _) in flags.items()}
+        self._rule_based_hash = rule_based_hash
+        return LocalFlagChanges(to_add, removed, change_number if change_number is not None else -1,
+                                rule_based_changes)
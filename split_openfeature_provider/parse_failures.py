@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+# Distinct (flag, treatment, type) combinations remembered; the oldest is forgotten first
+DEFAULT_MAX_ENTRIES = 4096
+# Seconds between two reports of the same short-circuited combination
+DEFAULT_LOG_INTERVAL = 60
+
+
+class _Failure():
+    __slots__ = ("short_circuited", "reported", "last_report")
+
+    def __init__(self, now):
+        self.short_circuited = 0
+        self.reported = 0
+        self.last_report = now
+
+
+class ParseFailureBreaker():
+    """
+    Remembers the (flag, treatment, value type) combinations whose treatment could not be converted, so later
+    evaluations return an error resolution without converting or raising again.
+
+    Short-circuited evaluations are reported at most once per `log_interval` seconds per combination. `reset`
+    forgets the flags named in an SDK_UPDATE, or everything when the update carries no names.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, log_interval: float = DEFAULT_LOG_INTERVAL):
+        self._max_entries = max_entries
+        self._log_interval = log_interval
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, flag_key: str, treatment: str, value_type: type):
+        """Whether the combination is known to fail; counts and periodically reports the short-circuit."""
+        failure = self._failures.get((flag_key, treatment, value_type))
+        if failure is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            failure.short_circuited += 1
+            if now - failure.last_report < self._log_interval:
+                return True
+            suppressed = failure.short_circuited - failure.reported
+            failure.reported = failure.short_circuited
+            failure.last_report = now
+        _LOGGER.warning("Flag %s: treatment %r can not be converted to %s, %d evaluations returned the default "
+                        "in the last %d seconds", flag_key, treatment, value_type.__name__, suppressed,
+                        self._log_interval)
+        return True
+
+    def record(self, flag_key: str, treatment: str, value_type: type):
+        key = (flag_key, treatment, value_type)
+        with self._lock:
+            if key in self._failures:
+                return
+            if len(self._failures) >= self._max_entries:
+                self._failures.pop(next(iter(self._failures)))
+            self._failures[key] = _Failure(time.monotonic())
+        _LOGGER.error("Evaluation Parse error: flag %s treatment %r can not be converted to %s, further evaluations "
+                      "return the default until the flag changes", flag_key, treatment, value_type.__name__)
+
+    def reset(self, flag_names: typing.Optional[typing.List[str]] = None):
+        with self._lock:
+            if flag_names is None:
+                self._failures = {}
+                return
+            names = set(flag_names)
+            for key in [key for key in self._failures if key[0] in names]:
+                del self._failures[key]
+
+    def stats(self):
+        """Return {"open", "short_circuited"}: the remembered combinations and the evaluations they answered."""
+        with self._lock:
+            return {
+                "open": len(self._failures),
+                "short_circuited": sum(failure.short_circuited for failure in self._failures.values()),
+            }
@@ -0,0 +1,132 @@
+import dataclasses
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import FlagResolutionDetails
+from split_openfeature_provider.context_transformer import fingerprint
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 30
+
+
+class EvaluationResultCache():
+    """
+    Bounded LRU cache of flag resolutions keyed by (flag, targeting key, attributes, value type).
+
+    Entries expire after `ttl_seconds` (None keeps them until evicted or invalidated). `invalidate` drops the
+    entries of the flags named in an SDK_UPDATE, or everything when the update carries no names. Flags listed in
+    `excluded_flags` are never cached, so every evaluation reaches the SDK and records an impression.
+
+    Invalidations also bump a generation counter per flag (and a global one): callers read `generation(flag)`
+    before evaluating and pass it to `put`, which discards the result if the flag was invalidated meanwhile.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: typing.Optional[float] = DEFAULT_TTL_SECONDS,
+                 excluded_flags: typing.Iterable[str] = ()):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._excluded_flags = frozenset(excluded_flags)
+        self._entries = OrderedDict()
+        self._keys_by_flag = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._generation = 0
+        self._flag_generations = {}
+        self._stale = 0
+
+    def key(self, flag_key: str, evaluation_context: EvaluationContext, default_value):
+        """Cache key of an evaluation, or None when the flag is excluded or the attributes are unhashable."""
+        if flag_key in self._excluded_flags:
+            return None
+        attributes = evaluation_context.attributes
+        attributes_key = fingerprint(attributes) if attributes else ()
+        if attributes_key is None:
+            return None
+        return flag_key, evaluation_context.targeting_key, attributes_key, type(default_value)
+
+    def get(self, key):
+        """Return a copy of the cached resolution for `key`, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, resolution = entry
+            if expires_at is not None and expires_at <= now:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        # resolutions are mutable, callers get their own copy
+        return dataclasses.replace(resolution, flag_metadata=dict(resolution.flag_metadata))
+
+    def generation(self, flag_key: str):
+        """Invalidation generation of `flag_key`, read before evaluating a result to `put`."""
+        return self._generation, self._flag_generations.get(flag_key, 0)
+
+    def put(self, key, resolution: FlagResolutionDetails, generation=None):
+        """Cache `resolution`, unless its flag was invalidated since `generation` was read."""
+        expires_at = None if self._ttl_seconds is None else time.monotonic() + self._ttl_seconds
+        resolution = dataclasses.replace(resolution, flag_metadata=dict(resolution.flag_metadata))
+        with self._lock:
+            if generation is not None and generation != self.generation(key[0]):
+                self._stale += 1
+                return
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+            self._entries[key] = (expires_at, resolution)
+            self._entries.move_to_end(key)
+            self._keys_by_flag.setdefault(key[0], set()).add(key)
+
+    def _remove(self, key):
+        del self._entries[key]
+        flag_keys = self._keys_by_flag.get(key[0])
+        if flag_keys is not None:
+            flag_keys.discard(key)
+            if not flag_keys:
+                del self._keys_by_flag[key[0]]
+
+    def invalidate(self, flag_names: typing.Optional[typing.List[str]] = None):
+        with self._lock:
+            if not flag_names:
+                self._generation += 1
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                self._keys_by_flag = {}
+                return
+            for flag_name in flag_names:
+                self._flag_generations[flag_name] = self._flag_generations.get(flag_name, 0) + 1
+                for key in self._keys_by_flag.pop(flag_name, ()):
+                    del self._entries[key]
+                    self._invalidations += 1
+
+    def stats(self):
+        """
+        Return {"entries", "hits", "misses", "evictions", "expirations", "invalidations", "stale"}; `stale` counts
+        results not cached because their flag was invalidated while they were evaluated.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "stale": self._stale,
+            }
+
+    def __len__(self):
+        return len(self._entries)
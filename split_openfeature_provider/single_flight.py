@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+import typing
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Flight():
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight():
+    """
+    Collapses identical asyncio calls that are in flight at the same time: the first caller of a key starts the
+    call in its own task, and every caller of that key, the first included, awaits the same result (or exception).
+
+    Each caller waits through `asyncio.shield`, so cancelling one caller never cancels the call the others wait
+    for; the call itself is cancelled only when every caller waiting for it was cancelled. Keys are scoped to the
+    running event loop.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._collapsed = 0
+        self._cancelled = 0
+        self._abandoned = 0
+        self._max_waiters = 0
+
+    async def call(self, key, function: typing.Callable[[], typing.Awaitable]):
+        """Return the result of `await function()`, shared with the identical calls already in flight."""
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight(loop.create_task(function()))
+                flight.task.add_done_callback(lambda task: self._land(key, task))
+                self._calls += 1
+            else:
+                self._collapsed += 1
+            flight.waiters += 1
+            if flight.waiters > self._max_waiters:
+                self._max_waiters = flight.waiters
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._cancelled += 1
+                flight.waiters -= 1
+                abandon = flight.waiters == 0 and not flight.task.done()
+                if abandon:
+                    self._abandoned += 1
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+            if abandon:
+                flight.task.cancel()
+            raise
+
+    def _land(self, key, task):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.task is task:
+                del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            # delivered to the waiters; retrieved here so an abandoned call is not reported as unhandled
+            _LOGGER.debug("SingleFlight: shared call failed: %s", task.exception())
+
+    def stats(self):
+        """
+        Return {"in_flight", "calls", "collapsed", "cancelled", "abandoned", "max_waiters"}: `calls` started,
+        callers `collapsed` into a call already in flight, callers `cancelled` while waiting, calls `abandoned`
+        because all their callers were cancelled, and the most callers seen waiting for one call.
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "calls": self._calls,
+                "collapsed": self._collapsed,
+                "cancelled": self._cancelled,
+                "abandoned": self._abandoned,
+                "max_waiters": self._max_waiters,
+            }
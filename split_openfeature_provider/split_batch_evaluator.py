@@ -0,0 +1,166 @@
+import csv
+import itertools
+import json
+import logging
+import multiprocessing.util
+import os
+import typing
+from collections import deque
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import OpenFeatureError, ProviderNotReadyError
+from openfeature.flag_evaluation import Reason
+from split_openfeature_provider.split_provider import SplitProvider
+
+_LOGGER = logging.getLogger(__name__)
+
+_CSV_HEADER = ["targeting_key", "flag_key", "variant", "value", "reason", "error_code"]
+
+# Provider owned by each pool worker process, built once by _init_worker
+_worker_provider = None
+
+
+def _create_provider(initial_context):
+    provider = SplitProvider(dict(initial_context))
+    try:
+        provider.initialize(EvaluationContext())
+    except ProviderNotReadyError:
+        _LOGGER.warning("SplitBatchEvaluator: Split SDK not ready, evaluations return defaults until it is")
+    return provider
+
+
+def _init_worker(initial_context):
+    global _worker_provider
+    _worker_provider = _create_provider(initial_context)
+    # pool workers leave through multiprocessing's exit handler, which runs finalizers but not atexit
+    multiprocessing.util.Finalize(None, _shutdown_worker, exitpriority=10)
+
+
+def _shutdown_worker():
+    global _worker_provider
+    provider, _worker_provider = _worker_provider, None
+    if provider is not None:
+        provider.shutdown()
+
+
+def _evaluate_rows(provider, rows, flag_defaults):
+    results = []
+    for targeting_key, attributes in rows:
+        context = EvaluationContext(targeting_key, attributes or {})
+        try:
+            resolutions = provider.resolve_bulk_details(flag_defaults, context)
+        except OpenFeatureError as ex:
+            resolutions = {flag_key: SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+                                                                             ex.error_code, ex.error_message)
+                           for flag_key, default_value in flag_defaults.items()}
+        results.append((targeting_key, resolutions))
+    return results
+
+
+def _evaluate_chunk(rows, flag_defaults):
+    return _evaluate_rows(_worker_provider, rows, flag_defaults)
+
+
+class SplitBatchEvaluator():
+    """
+    Offline evaluation of many targeting keys against a fixed list of flags.
+
+    Input rows are consumed lazily in chunks and fanned out to a process pool. Each worker builds its own
+    `SplitProvider` from `initial_context`, so the context must be picklable and use `SdkKey` (e.g. "localhost"
+    with a `splitFile` in `ConfigOptions`). At most `max_pending_chunks` chunks are in flight at any time, which
+    keeps memory bounded regardless of input size. Results are yielded in input order.
+    """
+
+    def __init__(self, initial_context, flag_defaults: typing.Dict[str, typing.Any], processes: int = None,
+                 chunk_size: int = 1000, max_pending_chunks: int = None, mp_context=None):
+        if not isinstance(initial_context, dict) or not isinstance(initial_context.get("SdkKey"), str):
+            _LOGGER.error("SplitBatchEvaluator: initial_context must be a `dict` containing key `SdkKey`")
+            raise AttributeError()
+
+        if chunk_size < 1:
+            _LOGGER.error("SplitBatchEvaluator: chunk_size must be greater than zero")
+            raise AttributeError()
+
+        self._initial_context = initial_context
+        self._flag_defaults = dict(flag_defaults)
+        self._processes = processes
+        self._chunk_size = chunk_size
+        self._max_pending_chunks = max_pending_chunks
+        self._mp_context = mp_context
+
+    def evaluate(self, rows: typing.Iterable[typing.Tuple[str, typing.Optional[dict]]]):
+        """
+        Evaluate every (targeting key, attributes) pair.
+
+        :param rows: iterable of (targeting_key, attributes) tuples; attributes may be None.
+        :return: generator of (targeting_key, {flag_key: FlagResolutionDetails}).
+        """
+        chunks = self._chunks(rows)
+        if self._processes == 0:
+            provider = _create_provider(self._initial_context)
+            try:
+                for chunk in chunks:
+                    yield from _evaluate_rows(provider, chunk, self._flag_defaults)
+            finally:
+                provider.shutdown()
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self._processes, mp_context=self._mp_context,
+                                 initializer=_init_worker, initargs=(self._initial_context,)) as executor:
+            max_pending = self._max_pending_chunks or (self._processes or os.cpu_count() or 1) * 2
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_evaluate_chunk, chunk, self._flag_defaults))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def export_csv(self, rows: typing.Iterable[typing.Tuple[str, typing.Optional[dict]]], path_prefix: str,
+                   rows_per_file: int = 1000000):
+        """
+        Evaluate `rows` and stream the assignments into CSV files of at most `rows_per_file` lines each.
+
+        Files are named `<path_prefix>-00000.csv`, `<path_prefix>-00001.csv`, ... with one line per
+        (targeting key, flag). Object values are written as JSON.
+
+        :return: list of the written file paths.
+        """
+        paths = []
+        output = None
+        writer = None
+        written = rows_per_file
+        try:
+            for targeting_key, resolutions in self.evaluate(rows):
+                for flag_key, details in resolutions.items():
+                    if written >= rows_per_file:
+                        if output is not None:
+                            output.close()
+                        paths.append("%s-%05d.csv" % (path_prefix, len(paths)))
+                        output = open(paths[-1], "w", newline="")
+                        writer = csv.writer(output)
+                        writer.writerow(_CSV_HEADER)
+                        written = 0
+                    writer.writerow(self._csv_row(targeting_key, flag_key, details))
+                    written += 1
+        finally:
+            if output is not None:
+                output.close()
+        return paths
+
+    def _chunks(self, rows):
+        iterator = iter(rows)
+        while True:
+            chunk = list(itertools.islice(iterator, self._chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _csv_row(targeting_key, flag_key, details):
+        value = details.value
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        error_code = details.error_code.value if details.error_code is not None else ""
+        return [targeting_key, flag_key, details.variant or "", value, details.reason or "", error_code]
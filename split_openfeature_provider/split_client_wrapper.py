@@ -1,24 +1,101 @@
-from splitio import get_factory, get_factory_async
-from splitio.exceptions import TimeoutException
+import importlib
 import logging
+import os
+import threading
+import weakref
 
-try:
-    from splitio.models.events import SdkEvent
-except ImportError:
-    SdkEvent = None  # type: ignore  # Split < 10.6: no events API
+from split_openfeature_provider.flag_snapshot import has_snapshot, snapshot_config, collect_snapshot, \
+    collect_snapshot_async, snapshot_version, changed_flags, SnapshotWriter
+from split_openfeature_provider.track_queue import OVERFLOW_POLICIES
+from split_openfeature_provider.local_flag_file import LocalFlagFile, is_local_flag_file, check_sdk_internals
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _load_sdk_event():
+    try:
+        from splitio.models.events import SdkEvent
+    except ImportError:
+        return None  # Split < 10.6: no events API
+    return SdkEvent
+
+
+# Split SDK symbols are imported on first use: importing `splitio` loads the whole factory machinery
+_LAZY_SDK_SYMBOLS = {
+    "get_factory": lambda: importlib.import_module("splitio").get_factory,
+    "get_factory_async": lambda: importlib.import_module("splitio").get_factory_async,
+    "TimeoutException": lambda: importlib.import_module("splitio.exceptions").TimeoutException,
+    "SdkEvent": _load_sdk_event,
+}
+
+
+def __getattr__(name):
+    loader = _LAZY_SDK_SYMBOLS.get(name)
+    if loader is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = globals()[name] = loader()
+    return value
+
+
+def split_sdk_symbol(name):
+    """Return a Split SDK symbol (e.g. "SdkEvent"), importing the SDK on first use."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def sdk_version():
+    """Installed Split SDK version as a (major, minor) tuple, importing only its version module."""
+    version = importlib.import_module("splitio.version").__version__
+    return tuple(int(part) for part in version.split(".")[:2])
+
+
 # Sentinel for block_until_ready timeout (not a Split SdkEvent)
 SPLIT_EVENT_BUR_TIMEOUT = "block_until_ready_timeout"
 
+# Sentinel for readiness detected by the background re-check when the Split SDK has no events API (< 10.6)
+SPLIT_EVENT_READY_CHECK = "ready_check"
+
+# Sentinel for a new flag snapshot picked up by a forked worker (see PreforkMode)
+SPLIT_EVENT_SNAPSHOT_UPDATE = "snapshot_update"
+
+# Seconds between checks for a newly published snapshot in forked workers
+DEFAULT_SNAPSHOT_POLL_INTERVAL = 1
+
+# Seconds between checks for changes to the LocalFile flag file
+DEFAULT_LOCAL_FILE_POLL_INTERVAL = 1
+
+# Backoff bounds (seconds) for the background readiness re-check
+_READY_RECHECK_MIN_DELAY = 0.05
+_READY_RECHECK_MAX_DELAY = 2
+
 
 class SplitClientWrapper():
 
     def __init__(self, initial_context):
         self.sdk_ready = False
         self.split_client = None
+        self.snapshot_client = None
+        self._factory = None
+        self._snapshot_factory = None
+        self._live_task = None
+        self._threading_mode = None
         self._event_receiver = None
+        self._events_requested = False
+        self._events_registered = False
+        self._ready_watcher = None
+        self._ready_watcher_stop = threading.Event()
+        self._lock = threading.Lock()
+        self._init_thread = None
+        self._init_error = None
+        self._initialized = threading.Event()
+        self._create_task = None
+        self._destroyed = False
+        # impressions and events pipeline of a PreforkMode worker, set after the fork
+        self._worker_recorder = None
+        # event loop the asyncio factory runs on, set by create()
+        self.loop = None
 
         if not self._validate_context(initial_context):
             raise AttributeError()
@@ -32,6 +109,34 @@ class SplitClientWrapper():
         if initial_context.get("ReadyBlockTime") != None:
             self._ready_block_time = initial_context.get("ReadyBlockTime")
 
+        self._flag_file = None
+        if initial_context.get("LocalFile") != None:
+            # localhost factory whose storage is updated flag by flag when the file changes
+            self._api_key = "localhost"
+            self._config = dict(self._config, splitFile=initial_context.get("LocalFile"), localhostRefreshEnabled=False)
+            self._flag_file = LocalFlagFile(initial_context.get("LocalFile"))
+            self._local_file_poll_interval = initial_context.get("LocalFilePollInterval") \
+                or DEFAULT_LOCAL_FILE_POLL_INTERVAL
+
+        self._flag_sets = None
+        # names of the stored flags in the configured flag sets, None until known
+        self._flag_set_names = None
+        if initial_context.get("FlagSets") != None:
+            self._flag_sets = sorted(set(flag_set.strip().lower() for flag_set in initial_context.get("FlagSets")))
+            self._config = dict(self._config, flagSetsFilter=self._flag_sets)
+            # SDK_UPDATE keeps the flag set names current
+            self._events_requested = True
+
+        self._snapshot_dir = initial_context.get("SnapshotDirectory")
+        self._snapshot_writer = SnapshotWriter(self._snapshot_dir) if self._snapshot_dir is not None else None
+        self._snapshot_poll_interval = initial_context.get("SnapshotPollInterval") or DEFAULT_SNAPSHOT_POLL_INTERVAL
+        self._snapshot_version = None
+        if initial_context.get("PreforkMode"):
+            # the pre-fork process publishes a snapshot on every update, workers read it after the fork
+            self._events_requested = True
+            wrapper = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: wrapper() is not None and wrapper()._after_fork_in_child())
+
         if initial_context.get("ThreadingMode") != None:
             self._threading_mode = initial_context.get("ThreadingMode")
             if self._threading_mode == "asyncio":
@@ -41,55 +146,440 @@ class SplitClientWrapper():
         if initial_context.get("SplitClient") != None:
             self.split_client = initial_context.get("SplitClient")
             self._factory = self.split_client._factory
-            return
+            self.sdk_ready = self._is_factory_ready()
+            if self._events_requested:
+                self._register_split_events()
+            if self.sdk_ready:
+                self._refresh_flag_set_names()
+                self.save_snapshot()
+            else:
+                self._start_ready_watcher()
+            self._initialized.set()
+
+    def start(self):
+        """
+        Create the Split factory and wait for readiness in a background thread, without blocking the caller.
+        Several wrappers started one after the other initialize in parallel. Calling it again has no effect.
+        """
+        with self._lock:
+            if self._init_thread is not None or self._initialized.is_set():
+                return
+            self._init_thread = threading.Thread(target=self._initialize, name="SplitProviderInitialization",
+                                                 daemon=True)
+            self._init_thread.start()
+
+    def initialize(self):
+        """
+        Start the factory if needed and wait until it is ready or `ReadyBlockTime` expires. With a flag snapshot
+        on disk, it returns as soon as the snapshot is loaded and the live sync continues in the background.
+
+        :return: whether evaluations can be served, from live data or from the snapshot.
+        """
+        self.start()
+        self._initialized.wait()
+        if self._init_error is not None:
+            raise self._init_error
+        return self.sdk_ready or self.snapshot_client is not None
+
+    def _initialize(self):
+        try:
+            if self._snapshot_dir is not None and self._load_snapshot():
+                self._initialized.set()
+
+            if self._flag_file is not None:
+                try:
+                    check_sdk_internals()
+                except RuntimeError as ex:
+                    _LOGGER.error("SplitClientWrapper: %s, the Split SDK reloads the whole LocalFile instead", ex)
+                    self._flag_file = None
+                    self._config = dict(self._config, localhostRefreshEnabled=True)
+            if self._flag_file is not None:
+                # hashes first: a change made while the SDK loads the file is picked up by the next reload
+                self._flag_file.prime()
+            factory = split_sdk_symbol("get_factory")(self._api_key, config=self._config)
+            with self._lock:
+                self._factory = factory
+                self.split_client = factory.client()
+                destroyed = self._destroyed
+                register = self._events_requested
+            if destroyed:
+                factory.destroy()
+                return
+            if register:
+                self._register_split_events()
+            if self._flag_file is not None:
+                threading.Thread(target=self._watch_local_file, name="SplitProviderLocalFile", daemon=True).start()
+
+            try:
+                factory.block_until_ready(self._ready_block_time)
+                self._set_sdk_ready()
+            except split_sdk_symbol("TimeoutException"):
+                _LOGGER.debug("Split SDK timed out")
+                self._start_ready_watcher()
+        except Exception as ex:
+            _LOGGER.error("SplitClientWrapper: could not create the Split factory")
+            _LOGGER.debug(ex)
+            self._init_error = ex
+        finally:
+            self._initialized.set()
 
+    def _open_snapshot(self):
         try:
-            self._factory = get_factory(self._api_key, config=self._config)
-            self._factory.block_until_ready(self._ready_block_time)
-            self.sdk_ready = True
-        except TimeoutException:
-            _LOGGER.debug("Split SDK timed out")
-            self._notify_receiver(SPLIT_EVENT_BUR_TIMEOUT, None)
+            factory = split_sdk_symbol("get_factory")("localhost", config=snapshot_config(self._snapshot_dir))
+            factory.block_until_ready(self._ready_block_time)
+            return factory
+        except Exception as ex:
+            _LOGGER.warning("SplitClientWrapper: could not load the flag snapshot from %s: %s", self._snapshot_dir, ex)
+            return None
+
+    def _load_snapshot(self):
+        if not has_snapshot(self._snapshot_dir):
+            return False
+        factory = self._open_snapshot()
+        if factory is None:
+            return False
+        with self._lock:
+            if self._destroyed or self.sdk_ready:
+                factory.destroy()
+                return False
+            self._snapshot_factory = factory
+            self.snapshot_client = factory.client()
+        _LOGGER.info("SplitClientWrapper: serving evaluations from the flag snapshot until the SDK is ready")
+        return True
+
+    def _after_fork_in_child(self):
+        """
+        Post-fork hook of PreforkMode. The parent's SDK threads did not survive the fork, so the worker leaves
+        that factory untouched and serves the snapshot the parent publishes, reloading it when it changes.
+        Impressions and tracked events of the snapshot clients go through a WorkerRecorder of its own.
+        """
+        if self._destroyed:
+            return
+        self._lock = threading.Lock()
+        self._factory = None
+        self.split_client = None
+        self.sdk_ready = False
+        self._snapshot_factory = None
+        self.snapshot_client = None
+        self._snapshot_version = None
+        self._flag_set_names = None
+        self._ready_watcher = None
+        self._ready_watcher_stop = threading.Event()
+        self._init_error = None
+        self._initialized = threading.Event()
+        self._initialized.set()
+        self._worker_recorder = None
+        # workers only read the snapshot; the writer's thread and lock belong to the parent
+        self._snapshot_writer = None
+        if self._api_key and self._api_key != "localhost":
+            try:
+                from split_openfeature_provider.worker_recorder import WorkerRecorder
+                self._worker_recorder = WorkerRecorder(self._api_key, self._config)
+            except Exception as ex:
+                _LOGGER.error("SplitClientWrapper: could not start recording impressions and events in the worker, "
+                              "they will not be sent to Split: %s", ex)
+        self._refresh_snapshot()
+        threading.Thread(target=self._follow_snapshot, name="SplitProviderSnapshotFollower", daemon=True).start()
+
+    def _follow_snapshot(self):
+        while not self._ready_watcher_stop.wait(self._snapshot_poll_interval):
+            try:
+                self._refresh_snapshot()
+            except Exception as ex:
+                _LOGGER.warning("SplitClientWrapper: could not refresh the flag snapshot: %s", ex)
+
+    def _refresh_snapshot(self):
+        version = snapshot_version(self._snapshot_dir)
+        if version is None or version == self._snapshot_version:
+            return
+        factory = self._open_snapshot()
+        if factory is None:
+            return
+        self._snapshot_version = version
+        if self._worker_recorder is not None:
+            try:
+                self._worker_recorder.attach(factory)
+            except Exception as ex:
+                _LOGGER.error("SplitClientWrapper: could not record impressions and events in the worker, they "
+                              "will not be sent to Split: %s", ex)
+                self._worker_recorder.stop()
+                self._worker_recorder = None
+        with self._lock:
+            previous = self._snapshot_factory
+            self._snapshot_factory = factory
+            self.snapshot_client = factory.client()
+        if previous is None:
+            _LOGGER.info("SplitClientWrapper: serving evaluations from the published flag snapshot")
+            return
+        names = changed_flags(previous._storages, factory._storages)
+        previous.destroy()
+        self._notify_receiver(SPLIT_EVENT_SNAPSHOT_UPDATE, {"names": names} if names is not None else None)
+
+    def _watch_local_file(self):
+        while not self._ready_watcher_stop.wait(self._local_file_poll_interval):
+            try:
+                self._reload_local_file()
+            except Exception as ex:
+                _LOGGER.warning("SplitClientWrapper: could not reload the local flag file: %s", ex)
+
+    def _reload_local_file(self):
+        """
+        Apply the flags that changed in the LocalFile to the factory's storage. The storage notifies SDK_UPDATE
+        with the names of exactly those flags.
+        """
+        changes = self._flag_file.reload()
+        if changes is None:
+            return
+        storages = self._factory._storages
+        if changes.rule_based_segments is not None:
+            segments, change_number = changes.rule_based_segments
+            rbs_storage = storages["rule_based_segments"]
+            names = {segment.name for segment in segments}
+            rbs_storage.update(segments, [name for name in rbs_storage.get_segment_names() if name not in names],
+                               change_number)
+        storages["splits"].update(changes.to_add, changes.to_delete, changes.change_number)
+        _LOGGER.info("SplitClientWrapper: reloaded %d flags from the local flag file", len(changes.names))
+        if split_sdk_symbol("SdkEvent") is None:
+            self._notify_receiver(SPLIT_EVENT_SNAPSHOT_UPDATE, {"names": changes.names})
+
+    async def _load_snapshot_async(self):
+        if not has_snapshot(self._snapshot_dir):
+            return False
+        try:
+            factory = await split_sdk_symbol("get_factory_async")("localhost", config=snapshot_config(self._snapshot_dir))
+            await factory.block_until_ready(self._ready_block_time)
+        except Exception as ex:
+            _LOGGER.warning("SplitClientWrapper: could not load the flag snapshot from %s: %s", self._snapshot_dir, ex)
+            return False
+        self._snapshot_factory = factory
+        self.snapshot_client = factory.client()
+        _LOGGER.info("SplitClientWrapper: serving evaluations from the flag snapshot until the SDK is ready")
+        return True
+
+    def _release_snapshot(self):
+        with self._lock:
+            factory = self._snapshot_factory
+            self._snapshot_factory = None
+            self.snapshot_client = None
+        if factory is not None:
+            factory.destroy()
+
+    async def _release_snapshot_async(self):
+        factory = self._snapshot_factory
+        self._snapshot_factory = None
+        self.snapshot_client = None
+        if factory is not None:
+            await factory.destroy()
+
+    def save_snapshot(self):
+        """
+        Persist the live flag and segment definitions to `SnapshotDirectory`, if configured. The snapshot is
+        collected and written by the snapshot writer's thread, so SDK event handlers return immediately.
+        """
+        if self._snapshot_writer is None or not self.sdk_ready:
+            return
+        factory = self._factory
+        self._snapshot_writer.schedule(lambda: collect_snapshot(factory._storages))
 
-        self.split_client = self._factory.client()
+    async def save_snapshot_async(self):
+        """Asyncio counterpart of `save_snapshot`; files are written in the loop's default executor."""
+        if self._snapshot_writer is None or not self.sdk_ready:
+            return
+        import asyncio
+        try:
+            changes, segments = await collect_snapshot_async(self._factory._storages)
+            await asyncio.get_running_loop().run_in_executor(None, self._snapshot_writer.write, changes, segments)
+        except Exception as ex:
+            _LOGGER.warning("SplitClientWrapper: could not write the flag snapshot to %s: %s", self._snapshot_dir, ex)
 
     async def create(self):
+        """
+        Create the asyncio Split factory and wait for readiness up to `ReadyBlockTime`.
+        Concurrent and repeated calls share a single initialization.
+        """
+        import asyncio
+        if self._create_task is None:
+            self.loop = asyncio.get_running_loop()
+            self._create_task = self.loop.create_task(self._create())
+        await asyncio.shield(self._create_task)
+
+    async def _create(self):
         if self._initial_context.get("SplitClient") != None:
             self.split_client = self._initial_context.get("SplitClient")
             self._factory = self.split_client._factory
+            if self._is_factory_ready():
+                await self._set_sdk_ready_async()
+            else:
+                self._start_ready_watcher_async()
             await self._register_split_events_async()
             return
 
+        if self._snapshot_dir is not None and await self._load_snapshot_async():
+            # serve from the snapshot right away, the live factory syncs in the background
+            import asyncio
+            self._live_task = asyncio.get_running_loop().create_task(self._create_live())
+            return
+        await self._create_live()
+
+    async def _create_live(self):
         try:
-            self._factory = await get_factory_async(self._api_key, config=self._config)
+            self._factory = await split_sdk_symbol("get_factory_async")(self._api_key, config=self._config)
+            self.split_client = self._factory.client()
             await self._factory.block_until_ready(self._ready_block_time)
-            self.sdk_ready = True
-        except TimeoutException:
+            await self._set_sdk_ready_async()
+        except split_sdk_symbol("TimeoutException"):
             _LOGGER.debug("Split SDK timed out")
-            await self._notify_receiver_async(SPLIT_EVENT_BUR_TIMEOUT, None)
+            if self.snapshot_client is None:
+                await self._notify_receiver_async(SPLIT_EVENT_BUR_TIMEOUT, None)
+            self._start_ready_watcher_async()
 
-        self.split_client = self._factory.client()
         await self._register_split_events_async()
 
     def is_sdk_ready(self):
-        if self.sdk_ready:
-            return True
+        """
+        Return the cached readiness flag without blocking.
 
+        The flag is flipped by the SDK_READY event or by the background readiness re-check.
+        """
+        return self.sdk_ready
+
+    @property
+    def tracking_client(self):
+        """
+        Client tracked events are sent through: the live Split client, or in a PreforkMode worker the snapshot
+        client, whose factory records through the worker's own WorkerRecorder. None when events cannot be sent.
+        """
+        if self.split_client is not None:
+            return self.split_client
+        if self._worker_recorder is not None:
+            return self.snapshot_client
+        return None
+
+    def in_flag_sets(self, flag_name: str):
+        """
+        Whether a flag may belong to the configured `FlagSets`: False only when the flags of the sets are known
+        and the flag is not one of them.
+        """
+        names = self._flag_set_names
+        return names is None or flag_name in names
+
+    @property
+    def flag_sets(self):
+        return self._flag_sets
+
+    def _flag_set_storage(self):
+        if self._flag_sets is None or split_sdk_symbol("SdkEvent") is None:
+            # without SDK_UPDATE the names could not be kept current
+            return None
         try:
-            self._factory.block_until_ready(0.1)
+            return self._factory._storages["splits"]
+        except (AttributeError, KeyError, TypeError):
+            return None
+
+    def _refresh_flag_set_names(self):
+        storage = self._flag_set_storage()
+        if storage is None:
+            return
+        try:
+            self._flag_set_names = frozenset(storage.get_feature_flags_by_sets(self._flag_sets))
+        except Exception as ex:
+            _LOGGER.debug("SplitClientWrapper: could not read the flags of the flag sets: %s", ex)
+            self._flag_set_names = None
+
+    async def _refresh_flag_set_names_async(self):
+        storage = self._flag_set_storage()
+        if storage is None:
+            return
+        try:
+            self._flag_set_names = frozenset(await storage.get_feature_flags_by_sets(self._flag_sets))
+        except Exception as ex:
+            _LOGGER.debug("SplitClientWrapper: could not read the flags of the flag sets: %s", ex)
+            self._flag_set_names = None
+
+    def _is_factory_ready(self):
+        return bool(getattr(self._factory, "ready", False))
+
+    def _set_sdk_ready(self):
+        with self._lock:
+            if self.sdk_ready:
+                return
             self.sdk_ready = True
-        except TimeoutException:
-            _LOGGER.debug("Split SDK timed out")
+        _LOGGER.debug("SplitClientWrapper: Split SDK is ready")
+        self._refresh_flag_set_names()
+        self._release_snapshot()
+        self.save_snapshot()
 
-        return self.sdk_ready
+    async def _set_sdk_ready_async(self):
+        if self.sdk_ready:
+            return
+        self.sdk_ready = True
+        _LOGGER.debug("SplitClientWrapper: Split SDK is ready")
+        await self._refresh_flag_set_names_async()
+        await self._release_snapshot_async()
+        await self.save_snapshot_async()
+
+    def _start_ready_watcher(self):
+        """
+        Re-check factory readiness in a daemon thread with exponential backoff.
+
+        Covers Split SDK < 10.6 (no events API) and the window before a receiver registers for SDK_READY.
+        """
+        if self._ready_watcher is not None:
+            return
+        self._ready_watcher = threading.Thread(target=self._watch_ready, name="SplitProviderReadyWatcher", daemon=True)
+        self._ready_watcher.start()
+
+    def _watch_ready(self):
+        delay = _READY_RECHECK_MIN_DELAY
+        while not self.sdk_ready and not self._ready_watcher_stop.is_set():
+            if self._factory.destroyed:
+                return
+            if self._is_factory_ready():
+                self._set_sdk_ready()
+                if split_sdk_symbol("SdkEvent") is None:
+                    self._notify_receiver(SPLIT_EVENT_READY_CHECK, None)
+                return
+            self._ready_watcher_stop.wait(delay)
+            delay = min(delay * 2, _READY_RECHECK_MAX_DELAY)
+
+    def _start_ready_watcher_async(self):
+        """Asyncio counterpart of `_start_ready_watcher`, running as a task on the current loop."""
+        if self._ready_watcher is not None:
+            return
+        import asyncio
+        self._ready_watcher = asyncio.get_running_loop().create_task(self._watch_ready_async())
+
+    async def _watch_ready_async(self):
+        import asyncio
+        delay = _READY_RECHECK_MIN_DELAY
+        while not self.sdk_ready:
+            if self._factory.destroyed:
+                return
+            if self._is_factory_ready():
+                await self._set_sdk_ready_async()
+                if split_sdk_symbol("SdkEvent") is None:
+                    await self._notify_receiver_async(SPLIT_EVENT_READY_CHECK, None)
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _READY_RECHECK_MAX_DELAY)
 
     def set_event_receiver(self, receiver):
         """Set the receiver that will be notified of Split SDK events (e.g. the provider)."""
         self._event_receiver = receiver
 
     def register_for_split_events(self):
-        """Register for Split SDK events (SDK_READY, SDK_UPDATE). Pass the provider as receiver (or call set_event_receiver first)."""
-        self._register_split_events()
+        """
+        Register for Split SDK events (SDK_READY, SDK_UPDATE). Pass the provider as receiver (or call set_event_receiver first).
+        If the factory is still being created, registration happens as soon as it exists.
+        """
+        with self._lock:
+            self._events_requested = True
+            factory_created = self._factory is not None
+        if self._threading_mode == "asyncio":
+            # create() registers on the event loop
+            return
+        if factory_created:
+            self._register_split_events()
 
     def unregister_for_split_events(self):
         """Stop receiving Split SDK events."""
@@ -104,6 +594,15 @@ class SplitClientWrapper():
         except Exception as ex:
             _LOGGER.debug("Split event callback error: %s", ex)
 
+    def _on_sdk_ready(self, event_metadata):
+        self._set_sdk_ready()
+        self._notify_receiver(split_sdk_symbol("SdkEvent").SDK_READY, event_metadata)
+
+    def _on_sdk_update(self, event_metadata):
+        self._refresh_flag_set_names()
+        self._notify_receiver(split_sdk_symbol("SdkEvent").SDK_UPDATE, event_metadata)
+        self.save_snapshot()
+
     async def _notify_receiver_async(self, split_event, event_metadata):
         """Async version for use when the receiver is used in asyncio context (e.g. async event registration)."""
         if self._event_receiver is None:
@@ -118,51 +617,80 @@ class SplitClientWrapper():
         if self._factory is None:
             _LOGGER.warning("SplitClientWrapper: _factory is None, cannot register for SDK events")
             return
+        SdkEvent = split_sdk_symbol("SdkEvent")
         if SdkEvent is None:
             _LOGGER.debug("SplitClientWrapper: SdkEvent not available (Split SDK < 10.6?), skipping event registration")
             return
+        with self._lock:
+            if self._events_registered:
+                return
+            self._events_registered = True
         try:
             em = self._factory._events_manager
             if not hasattr(em, "register"):
                 _LOGGER.warning("SplitClientWrapper: events_manager has no register method")
                 return
-            em.register(SdkEvent.SDK_READY, lambda m: self._notify_receiver(SdkEvent.SDK_READY, m))
-            em.register(SdkEvent.SDK_UPDATE, lambda m: self._notify_receiver(SdkEvent.SDK_UPDATE, m))
+            em.register(SdkEvent.SDK_READY, self._on_sdk_ready)
+            em.register(SdkEvent.SDK_UPDATE, self._on_sdk_update)
             _LOGGER.info("SplitClientWrapper: registered for SDK_READY and SDK_UPDATE")
         except Exception as ex:
             _LOGGER.warning("Could not register Split events: %s", ex)
 
     def destroy(self, destroy_event=None):
-        self._factory.destroy(destroy_event)
+        if self._destroyed:
+            if destroy_event is not None:
+                destroy_event.set()
+            return
+        self._ready_watcher_stop.set()
+        if self._snapshot_writer is not None:
+            # the last scheduled snapshot is written before the factory goes away
+            self._snapshot_writer.stop()
+        self._release_snapshot()
+        if self._worker_recorder is not None:
+            self._worker_recorder.stop()
+            self._worker_recorder = None
+        with self._lock:
+            self._destroyed = True
+            factory = self._factory
+        if factory is None:
+            # still being created: _initialize destroys it once get_factory returns
+            if destroy_event is not None:
+                destroy_event.set()
+            return
+        factory.destroy(destroy_event)
 
     async def _register_split_events_async(self):
-        if self._factory is None or SdkEvent is None:
+        if self._factory is None:
+            return
+        SdkEvent = split_sdk_symbol("SdkEvent")
+        if SdkEvent is None:
             return
         try:
             em = self._factory._events_manager
             if hasattr(em, "register"):
                 async def handler_ready(m):
+                    await self._set_sdk_ready_async()
                     await self._notify_receiver_async(SdkEvent.SDK_READY, m)
                 async def handler_update(m):
+                    await self._refresh_flag_set_names_async()
                     await self._notify_receiver_async(SdkEvent.SDK_UPDATE, m)
+                    await self.save_snapshot_async()
                 await em.register(SdkEvent.SDK_READY, handler_ready)
                 await em.register(SdkEvent.SDK_UPDATE, handler_update)
         except Exception as ex:
             _LOGGER.debug("Could not register Split events: %s", ex)
 
     async def destroy_async(self):
-        await self._factory.destroy()
+        if self._ready_watcher is not None and not self._ready_watcher.done():
+            self._ready_watcher.cancel()
+        for task in (self._create_task, self._live_task):
+            if task is not None and not task.done():
+                task.cancel()
+        await self._release_snapshot_async()
+        if self._factory is not None:
+            await self._factory.destroy()
 
     async def is_sdk_ready_async(self):
-        if self.sdk_ready:
-            return True
-
-        try:
-            await self._factory.block_until_ready(0.1)
-            self.sdk_ready = True
-        except TimeoutException:
-            _LOGGER.debug("Split SDK timed out")
-
         return self.sdk_ready
 
     def _validate_context(self, initial_context):
@@ -170,8 +698,24 @@ class SplitClientWrapper():
             _LOGGER.error("SplitClientWrapper: initial_context must be of type `dict`")
             return False
 
-        if initial_context.get("SplitClient") == None and initial_context.get("SdkKey") == None:
-            _LOGGER.error("SplitClientWrapper: initial_context must contain keys `SplitClient` or `SdkKey`")
+        if initial_context.get("SplitClient") == None and initial_context.get("SdkKey") == None \
+                and initial_context.get("LocalFile") == None:
+            _LOGGER.error("SplitClientWrapper: initial_context must contain keys `SplitClient`, `SdkKey` or `LocalFile`")
+            return False
+
+        flag_sets = initial_context.get("FlagSets")
+        if flag_sets != None and (not isinstance(flag_sets, (list, tuple, set, frozenset)) or not flag_sets
+                                  or not all(isinstance(flag_set, str) and flag_set.strip() for flag_set in flag_sets)):
+            _LOGGER.error("SplitClientWrapper: key `FlagSets` must be a non-empty list of flag set names")
+            return False
+
+        local_file = initial_context.get("LocalFile")
+        if local_file != None and (not isinstance(local_file, str) or not is_local_flag_file(local_file)
+                                   or initial_context.get("SplitClient") != None
+                                   or initial_context.get("SdkKey") != None
+                                   or initial_context.get("ThreadingMode") == "asyncio"):
+            _LOGGER.error("SplitClientWrapper: key `LocalFile` must be the path of a `.yaml`, `.yml` or `.json` flag "
+                          "file and is not available with `SplitClient`, `SdkKey` or in asyncio mode")
             return False
 
         if initial_context.get("SdkKey") != None and not isinstance(initial_context.get("SdkKey"), str):
@@ -182,4 +726,79 @@ class SplitClientWrapper():
             _LOGGER.error("SplitClientWrapper: key `ConfigOptions` must be of type `dict`")
             return False
 
+        if initial_context.get("JsonDecoder") != None and not callable(initial_context.get("JsonDecoder")):
+            _LOGGER.error("SplitClientWrapper: key `JsonDecoder` must be callable")
+            return False
+
+        if initial_context.get("SnapshotDirectory") != None and not isinstance(initial_context.get("SnapshotDirectory"), str):
+            _LOGGER.error("SplitClientWrapper: key `SnapshotDirectory` must be of type `str`")
+            return False
+
+        for pool_option in ("AsyncPoolSize", "AsyncQueueSize", "ResultCacheSize", "TrackQueueSize", "TrackBatchSize",
+                            "EvaluationBatchSize"):
+            pool_value = initial_context.get(pool_option)
+            if pool_value != None and (isinstance(pool_value, bool) or not isinstance(pool_value, int) or pool_value < 1):
+                _LOGGER.error("SplitClientWrapper: key `%s` must be a positive `int`", pool_option)
+                return False
+
+        if initial_context.get("PreforkMode") and (initial_context.get("SnapshotDirectory") == None
+                                                   or initial_context.get("ThreadingMode") == "asyncio"):
+            _LOGGER.error("SplitClientWrapper: `PreforkMode` requires `SnapshotDirectory` and is not available in asyncio mode")
+            return False
+
+        if initial_context.get("OpenTelemetry") != None and not isinstance(initial_context.get("OpenTelemetry"), (bool, dict)):
+            _LOGGER.error("SplitClientWrapper: key `OpenTelemetry` must be a `bool` or a `dict` of hook options")
+            return False
+
+        coalesce_window = initial_context.get("EventCoalesceWindow")
+        if coalesce_window != None and (isinstance(coalesce_window, bool) or not isinstance(coalesce_window, (int, float))
+                                        or coalesce_window < 0):
+            _LOGGER.error("SplitClientWrapper: key `EventCoalesceWindow` must be a non-negative number")
+            return False
+
+        batch_window = initial_context.get("EvaluationBatchWindow")
+        if batch_window != None and (isinstance(batch_window, bool) or not isinstance(batch_window, (int, float))
+                                     or batch_window < 0):
+            _LOGGER.error("SplitClientWrapper: key `EvaluationBatchWindow` must be a non-negative number")
+            return False
+
+        if initial_context.get("SingleFlight") != None and not isinstance(initial_context.get("SingleFlight"), bool):
+            _LOGGER.error("SplitClientWrapper: key `SingleFlight` must be of type `bool`")
+            return False
+
+        poll_interval = initial_context.get("LocalFilePollInterval")
+        if poll_interval != None and (isinstance(poll_interval, bool) or not isinstance(poll_interval, (int, float))
+                                      or poll_interval <= 0):
+            _LOGGER.error("SplitClientWrapper: key `LocalFilePollInterval` must be a positive number")
+            return False
+
+        flush_interval = initial_context.get("TrackFlushInterval")
+        if flush_interval != None and (isinstance(flush_interval, bool) or not isinstance(flush_interval, (int, float))
+                                       or flush_interval <= 0):
+            _LOGGER.error("SplitClientWrapper: key `TrackFlushInterval` must be a positive number")
+            return False
+
+        if initial_context.get("TrackOverflowPolicy") != None and initial_context.get("TrackOverflowPolicy") not in OVERFLOW_POLICIES:
+            _LOGGER.error("SplitClientWrapper: key `TrackOverflowPolicy` must be one of %s", ", ".join(OVERFLOW_POLICIES))
+            return False
+
+        if initial_context.get("TrafficType") != None and not isinstance(initial_context.get("TrafficType"), str):
+            _LOGGER.error("SplitClientWrapper: key `TrafficType` must be of type `str`")
+            return False
+
+        cache_ttl = initial_context.get("ResultCacheTtl")
+        if cache_ttl != None and (isinstance(cache_ttl, bool) or not isinstance(cache_ttl, (int, float)) or cache_ttl <= 0):
+            _LOGGER.error("SplitClientWrapper: key `ResultCacheTtl` must be a positive number")
+            return False
+
+        excluded_flags = initial_context.get("ResultCacheExcludedFlags")
+        if excluded_flags != None and (isinstance(excluded_flags, str) or not isinstance(excluded_flags, (list, tuple, set, frozenset))):
+            _LOGGER.error("SplitClientWrapper: key `ResultCacheExcludedFlags` must be a list of flag names")
+            return False
+
+        slow_threshold = initial_context.get("SlowEvaluationThresholdMs")
+        if slow_threshold != None and (isinstance(slow_threshold, bool) or not isinstance(slow_threshold, (int, float))):
+            _LOGGER.error("SplitClientWrapper: key `SlowEvaluationThresholdMs` must be a number")
+            return False
+
         return True
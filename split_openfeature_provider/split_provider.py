@@ -1,21 +1,34 @@
 import typing
 import logging
-import json
+import threading
 
 from openfeature.hook import Hook
 from openfeature.evaluation_context import EvaluationContext
-from openfeature.exception import ErrorCode, GeneralError, ParseError, OpenFeatureError, TargetingKeyMissingError
+from openfeature.exception import ErrorCode, GeneralError, ParseError, OpenFeatureError, TargetingKeyMissingError, \
+    ProviderNotReadyError
 from openfeature.flag_evaluation import Reason, FlagResolutionDetails
 from openfeature.provider import AbstractProvider, Metadata
 from openfeature.event import ProviderEventDetails
-from split_openfeature_provider.split_client_wrapper import SplitClientWrapper, SPLIT_EVENT_BUR_TIMEOUT
+from split_openfeature_provider.split_client_wrapper import SplitClientWrapper, SPLIT_EVENT_BUR_TIMEOUT, \
+    SPLIT_EVENT_READY_CHECK, SPLIT_EVENT_SNAPSHOT_UPDATE, split_sdk_symbol
+from split_openfeature_provider.flag_snapshot import SOURCE_SNAPSHOT
+from split_openfeature_provider.evaluation_pool import EvaluationPool, DEFAULT_MAX_QUEUED
+from split_openfeature_provider.json_cache import ParsedJsonCache
+from split_openfeature_provider.parse_failures import ParseFailureBreaker
+from split_openfeature_provider.telemetry import create_hook
+from split_openfeature_provider.event_dispatcher import EventDispatcher
+from split_openfeature_provider.track_queue import TrackQueue, DEFAULT_MAX_SIZE, DEFAULT_BATCH_SIZE, \
+    DEFAULT_FLUSH_INTERVAL, DEFAULT_SEND_TIMEOUT, OVERFLOW_DROP_NEWEST
+from split_openfeature_provider.result_cache import EvaluationResultCache, DEFAULT_TTL_SECONDS
+from split_openfeature_provider.context_transformer import ContextTransformer, normalize_attributes, fingerprint
+from split_openfeature_provider.latency_recorder import LatencyRecorder, STAGE_READY, STAGE_CONTEXT, STAGE_SDK, \
+    STAGE_PROCESS
 
 _LOGGER = logging.getLogger(__name__)
 
-try:
-    from splitio.models.events import SdkEvent
-except ImportError:
-    SdkEvent = None  # type: ignore
+# Context attribute overriding the Split traffic type of tracked events
+TRAFFIC_TYPE_ATTRIBUTE = "trafficType"
+DEFAULT_TRAFFIC_TYPE = "user"
 
 
 def _flags_changed_from_sdk_update(event_metadata):
@@ -40,6 +53,20 @@ def _flags_changed_from_sdk_update(event_metadata):
     return None
 
 
+def _tracking_value_and_properties(tracking_event_details):
+    """
+    Split event value and properties of OpenFeature tracking event details: an object with `value` and
+    `attributes` (OpenFeature's TrackingEventDetails), or a mapping whose non-`value` entries are the properties.
+    """
+    if tracking_event_details is None:
+        return None, None
+    if isinstance(tracking_event_details, dict):
+        properties = {k: v for k, v in tracking_event_details.items() if k != "value"}
+        return tracking_event_details.get("value"), normalize_attributes(properties) or None
+    properties = getattr(tracking_event_details, "attributes", None)
+    return getattr(tracking_event_details, "value", None), normalize_attributes(properties) or None
+
+
 def _metadata_from_split(split_event, event_metadata):
     """Build OpenFeature event metadata dict from Split event (and optional Split metadata)."""
     meta = {"split_event": getattr(split_event, "value", str(split_event))}
@@ -59,6 +86,48 @@ def _metadata_from_split(split_event, event_metadata):
 
 class SplitProviderBase(AbstractProvider):
 
+    def _init_provider(self, initial_context):
+        self._split_client_wrapper = SplitClientWrapper(initial_context)
+        self._json_cache = ParsedJsonCache(initial_context.get("JsonDecoder"))
+        self._context_transformer = ContextTransformer()
+        self._parse_failures = ParseFailureBreaker()
+        self._hooks = []
+        if initial_context.get("OpenTelemetry"):
+            self._hooks.append(create_hook(initial_context.get("OpenTelemetry")))
+        self._result_cache = None
+        if initial_context.get("ResultCacheSize") != None:
+            self._result_cache = EvaluationResultCache(initial_context.get("ResultCacheSize"),
+                                                       initial_context.get("ResultCacheTtl") or DEFAULT_TTL_SECONDS,
+                                                       initial_context.get("ResultCacheExcludedFlags") or ())
+        # identical concurrent evaluations of the asyncio provider share one SDK call
+        self._single_flight = None
+        if initial_context.get("SingleFlight"):
+            # imported when configured, so that importing the package does not load asyncio
+            from split_openfeature_provider.single_flight import SingleFlight
+            self._single_flight = SingleFlight()
+        # concurrent evaluations of the asyncio provider for one targeting key share one get_treatments call
+        self._batcher = None
+        if initial_context.get("EvaluationBatchWindow") != None:
+            # imported when configured, so that importing the package does not load asyncio
+            from split_openfeature_provider.evaluation_batcher import EvaluationBatcher, DEFAULT_MAX_BATCH_SIZE
+            self._batcher = EvaluationBatcher(initial_context.get("EvaluationBatchWindow"),
+                                              initial_context.get("EvaluationBatchSize") or DEFAULT_MAX_BATCH_SIZE)
+        self._event_dispatcher = None
+        if initial_context.get("EventCoalesceWindow") != None:
+            self._event_dispatcher = EventDispatcher(initial_context.get("EventCoalesceWindow"))
+        self._traffic_type = initial_context.get("TrafficType") or DEFAULT_TRAFFIC_TYPE
+        self._track_options = (initial_context.get("TrackQueueSize") or DEFAULT_MAX_SIZE,
+                               initial_context.get("TrackBatchSize") or DEFAULT_BATCH_SIZE,
+                               initial_context.get("TrackFlushInterval") or DEFAULT_FLUSH_INTERVAL,
+                               initial_context.get("TrackOverflowPolicy") or OVERFLOW_DROP_NEWEST)
+        self._track_queue = None
+        # queue stopped by the last shutdown, kept for its counters; track() after a shutdown starts a new one
+        self._stopped_track_queue = None
+        self._track_lock = threading.Lock()
+        self._latency_recorder = None
+        if initial_context.get("LatencyTracking") or initial_context.get("SlowEvaluationThresholdMs") != None:
+            self._latency_recorder = LatencyRecorder(initial_context.get("SlowEvaluationThresholdMs"))
+
     def get_metadata(self) -> Metadata:
         return Metadata("Split")
 
@@ -78,26 +147,129 @@ class SplitProviderBase(AbstractProvider):
         """
         _LOGGER.debug("SplitProvider: received split event %s", split_event)
         if split_event == SPLIT_EVENT_BUR_TIMEOUT:
-            self.emit_provider_error(ProviderEventDetails(
+            self._emit(self.emit_provider_error, ProviderEventDetails(
                 message="Block until ready timed out",
                 error_code=ErrorCode.PROVIDER_NOT_READY,
                 metadata=_metadata_from_split(split_event, event_metadata),
             ))
             return
+        if split_event == SPLIT_EVENT_READY_CHECK:
+            self._emit(self.emit_provider_ready, ProviderEventDetails(
+                metadata=_metadata_from_split(split_event, event_metadata),
+            ))
+            return
+        if split_event == SPLIT_EVENT_SNAPSHOT_UPDATE:
+            self._handle_flags_update(split_event, event_metadata)
+            return
+        SdkEvent = split_sdk_symbol("SdkEvent")
         if SdkEvent is None:
             return
         if split_event == SdkEvent.SDK_READY:
-            self.emit_provider_ready(ProviderEventDetails(
+            self._emit(self.emit_provider_ready, ProviderEventDetails(
                 metadata=_metadata_from_split(split_event, event_metadata),
             ))
         elif split_event == SdkEvent.SDK_UPDATE:
-            flags_changed = _flags_changed_from_sdk_update(event_metadata)
-            details = ProviderEventDetails(
-                flags_changed=flags_changed,
-                metadata=_metadata_from_split(split_event, event_metadata),
-            )
-            _LOGGER.info("SplitProvider: emitting PROVIDER_CONFIGURATION_CHANGED flags_changed=%s", flags_changed)
-            self.emit_provider_configuration_changed(details)
+            self._handle_flags_update(split_event, event_metadata)
+
+    def _handle_flags_update(self, split_event, event_metadata):
+        flags_changed = _flags_changed_from_sdk_update(event_metadata)
+        details = ProviderEventDetails(
+            flags_changed=flags_changed,
+            metadata=_metadata_from_split(split_event, event_metadata),
+        )
+        self._json_cache.invalidate(flags_changed)
+        self._parse_failures.reset(flags_changed)
+        if self._result_cache is not None:
+            # segment updates carry no flag names, any cached result may be stale
+            self._result_cache.invalidate(flags_changed)
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.dispatch_update(self.emit_provider_configuration_changed, details)
+            return
+        _LOGGER.info("SplitProvider: emitting PROVIDER_CONFIGURATION_CHANGED flags_changed=%s", flags_changed)
+        self.emit_provider_configuration_changed(details)
+
+    def _emit(self, emit, details: ProviderEventDetails):
+        """Emit now, or from the dispatch thread when the provider was created with `EventCoalesceWindow`."""
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.dispatch(emit, details)
+        else:
+            emit(details)
+
+    def get_event_dispatch_stats(self):
+        """
+        Queue depth, merged event count and dispatch lag of the event dispatcher (see `EventDispatcher.stats`).
+        Empty unless the provider was created with `EventCoalesceWindow`.
+        """
+        if self._event_dispatcher is None:
+            return {}
+        return self._event_dispatcher.stats()
+
+    def _stop_event_dispatcher(self):
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.stop()
+
+    def _restart_event_dispatcher(self):
+        # a provider shut down and set again delivers its events again
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.restart()
+
+    def track(self, tracking_event_name: str, evaluation_context: EvaluationContext = None,
+              tracking_event_details: typing.Any = None):
+        """
+        Record a Split event for the context's targeting key. The event is queued and sent by a background
+        thread in batches, so tracking never waits on the Split SDK.
+
+        The traffic type is the context's `trafficType` attribute, or the `TrafficType` initialization option
+        (default "user"). The value and properties come from `tracking_event_details`.
+
+        :return: False when the event was dropped because the tracking queue is full.
+        """
+        if evaluation_context is None or not evaluation_context.targeting_key:
+            raise TargetingKeyMissingError("Missing targeting key")
+        attributes = evaluation_context.attributes or {}
+        traffic_type = attributes.get(TRAFFIC_TYPE_ATTRIBUTE) or self._traffic_type
+        value, properties = _tracking_value_and_properties(tracking_event_details)
+        return self._tracking_queue().put((evaluation_context.targeting_key, traffic_type, tracking_event_name,
+                                           value, properties))
+
+    def get_track_stats(self):
+        """
+        Depth, drop and flush counters of the tracking queue (see `TrackQueue.stats`), or of the queue stopped by
+        the last shutdown until events are tracked again.
+        """
+        track_queue = self._track_queue or self._stopped_track_queue
+        if track_queue is None:
+            return {}
+        return track_queue.stats()
+
+    def _tracking_queue(self):
+        track_queue = self._track_queue
+        if track_queue is None:
+            with self._track_lock:
+                if self._track_queue is None:
+                    max_size, batch_size, flush_interval, overflow = self._track_options
+                    self._track_queue = TrackQueue(self._send_tracking_events,
+                                                   lambda: self._split_client_wrapper.tracking_client is not None,
+                                                   max_size, batch_size, flush_interval, overflow)
+                track_queue = self._track_queue
+        return track_queue
+
+    def _send_tracking_events(self, events):
+        """Hand a batch of (key, traffic type, event type, value, properties) to the Split client."""
+        raise NotImplementedError()
+
+    def _retire_track_queue(self):
+        with self._track_lock:
+            track_queue = self._track_queue
+            if track_queue is not None:
+                self._track_queue = None
+                self._stopped_track_queue = track_queue
+        return track_queue
+
+    def _stop_track_queue(self):
+        track_queue = self._retire_track_queue()
+        if track_queue is not None:
+            track_queue.stop()
 
     def _on_split_event(self, split_event, event_metadata):
         """Map Split SDK events to OpenFeature provider events (sync path)."""
@@ -108,25 +280,164 @@ class SplitProviderBase(AbstractProvider):
         self._handle_split_event(split_event, event_metadata)
 
     def get_provider_hooks(self) -> typing.List[Hook]:
-        return []
+        return self._hooks
+
+    def _evaluation_client(self):
+        """
+        Return (client, from_snapshot): the live Split client once the SDK is ready, otherwise the client serving
+        the on-disk flag snapshot, or None when neither is available.
+        """
+        wrapper = self._split_client_wrapper
+        if wrapper.is_sdk_ready():
+            return wrapper.split_client, False
+        return wrapper.snapshot_client, True
 
     def _evaluate_treatment(self, key: str, evaluation_context: EvaluationContext, default_value):
         if evaluation_context is None:
             raise GeneralError("Evaluation Context must be provided for the Split Provider")
 
-        if not self._split_client_wrapper.is_sdk_ready():
-            return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+        timer = self._latency_recorder.start(key) if self._latency_recorder is not None else None
+        try:
+            split_client, from_snapshot = self._evaluation_client()
+            if split_client is None:
+                return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
                                                                ErrorCode.PROVIDER_NOT_READY)
+            if timer is not None:
+                timer.mark(STAGE_READY)
+
+            targeting_key = evaluation_context.targeting_key
+            if not targeting_key:
+                raise TargetingKeyMissingError("Missing targeting key")
+            if not self._split_client_wrapper.in_flag_sets(key):
+                return SplitProvider.outside_flag_sets_resolution(default_value)
+
+            cache_key = self._result_cache_key(key, evaluation_context, default_value, from_snapshot)
+            if cache_key is not None:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # an SDK_UPDATE landing during the SDK call must keep its stale result out of the cache
+            generation = self._result_cache.generation(key) if cache_key is not None else None
+            attributes = self._context_transformer.transform(evaluation_context)
+            if timer is not None:
+                timer.mark(STAGE_CONTEXT)
+            evaluated = split_client.get_treatment_with_config(targeting_key, key, attributes)
+            if timer is not None:
+                timer.mark(STAGE_SDK)
+            result = self._process_treatment(evaluated, default_value, key)
+            if from_snapshot:
+                SplitProvider.mark_from_snapshot(result)
+            elif cache_key is not None and result.error_code is None:
+                self._result_cache.put(cache_key, result, generation)
+            if timer is not None:
+                timer.mark(STAGE_PROCESS)
+            return result
+        finally:
+            if timer is not None:
+                timer.stop()
+
+    def _result_cache_key(self, key: str, evaluation_context: EvaluationContext, default_value, from_snapshot: bool):
+        """Result cache key of a live evaluation, or None when the cache is disabled or does not apply."""
+        if self._result_cache is None or from_snapshot:
+            return None
+        return self._result_cache.key(key, evaluation_context, default_value)
+
+    def _evaluate_treatments(self, flag_defaults: typing.Dict[str, typing.Any], evaluation_context: EvaluationContext):
+        if evaluation_context is None:
+            raise GeneralError("Evaluation Context must be provided for the Split Provider")
+
+        split_client, from_snapshot = self._evaluation_client()
+        if split_client is None:
+            return SplitProvider.not_ready_resolutions(flag_defaults)
+
+        targeting_key = evaluation_context.targeting_key
+        if not targeting_key:
+            raise TargetingKeyMissingError("Missing targeting key")
+
+        flag_defaults, outside = self._split_by_flag_sets(flag_defaults)
+        if not flag_defaults:
+            return outside
+        attributes = self._context_transformer.transform(evaluation_context)
+        evaluated = split_client.get_treatments_with_config(targeting_key, list(flag_defaults), attributes)
+        results = self._process_treatments(evaluated, flag_defaults)
+        if from_snapshot:
+            for result in results.values():
+                SplitProvider.mark_from_snapshot(result)
+        results.update(outside)
+        return results
+
+    def _evaluate_flag_set(self, flag_set: str, evaluation_context: EvaluationContext,
+                           flag_defaults: typing.Dict[str, typing.Any]):
+        if evaluation_context is None:
+            raise GeneralError("Evaluation Context must be provided for the Split Provider")
+
+        split_client, from_snapshot = self._evaluation_client()
+        if split_client is None:
+            return SplitProvider.not_ready_resolutions(flag_defaults or {})
 
         targeting_key = evaluation_context.targeting_key
         if not targeting_key:
             raise TargetingKeyMissingError("Missing targeting key")
+        flag_set = self._configured_flag_set(flag_set)
+        if flag_set is None:
+            return {}
+
+        attributes = self._context_transformer.transform(evaluation_context)
+        evaluated = split_client.get_treatments_with_config_by_flag_set(targeting_key, flag_set, attributes)
+        return self._process_flag_set(evaluated, flag_defaults, from_snapshot)
+
+    def _split_by_flag_sets(self, flag_defaults: typing.Dict[str, typing.Any]):
+        """
+        (flags to evaluate, resolutions of the flags outside the configured `FlagSets`); the latter never reach
+        the SDK.
+        """
+        wrapper = self._split_client_wrapper
+        if wrapper.flag_sets is None:
+            return flag_defaults, {}
+        outside = {flag_key: SplitProvider.outside_flag_sets_resolution(default_value)
+                   for flag_key, default_value in flag_defaults.items() if not wrapper.in_flag_sets(flag_key)}
+        if not outside:
+            return flag_defaults, outside
+        return {flag_key: default_value for flag_key, default_value in flag_defaults.items()
+                if flag_key not in outside}, outside
+
+    def _configured_flag_set(self, flag_set: str):
+        """The normalized flag set name, or None when it is not one of the configured `FlagSets`."""
+        flag_set = flag_set.strip().lower() if isinstance(flag_set, str) else None
+        flag_sets = self._split_client_wrapper.flag_sets
+        if not flag_set or (flag_sets is not None and flag_set not in flag_sets):
+            _LOGGER.debug("Flag set %r is not configured, no flags evaluated", flag_set)
+            return None
+        return flag_set
 
-        attributes = SplitProvider.transform_context(evaluation_context)
-        evaluated = self._split_client_wrapper.split_client.get_treatment_with_config(targeting_key, key, attributes)
-        return self._process_treatment(evaluated, default_value)
+    def _process_flag_set(self, evaluated, flag_defaults: typing.Dict[str, typing.Any], from_snapshot: bool):
+        """Resolutions of a flag set evaluation; flags without an entry in `flag_defaults` resolve to strings."""
+        flag_defaults = flag_defaults or {}
+        results = self._process_treatments(evaluated, {flag_key: flag_defaults.get(flag_key, "")
+                                                       for flag_key in (evaluated or {})})
+        if from_snapshot:
+            for result in results.values():
+                SplitProvider.mark_from_snapshot(result)
+        return results
 
-    def _process_treatment(self, evaluated, default_value):
+    def _process_treatments(self, evaluated, flag_defaults: typing.Dict[str, typing.Any]):
+        """
+        Coerce each treatment of a `get_treatments_with_config` result through `_process_treatment`.
+        A flag that fails to resolve yields an error resolution instead of failing the whole batch.
+        """
+        if evaluated is None:
+            evaluated = {}
+        results = {}
+        for flag_key, default_value in flag_defaults.items():
+            try:
+                results[flag_key] = self._process_treatment(evaluated.get(flag_key), default_value, flag_key)
+            except OpenFeatureError as ex:
+                results[flag_key] = SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+                                                                            ex.error_code, ex.error_message)
+        return results
+
+    def _process_treatment(self, evaluated, default_value, flag_key: str = None):
         try:
             treatment = None
             config = None
@@ -137,9 +448,13 @@ class SplitProviderBase(AbstractProvider):
             if SplitProvider.no_treatment(treatment) or treatment == "control":
                 return SplitProvider.construct_flag_resolution(default_value, treatment, None, Reason.DEFAULT,
                                                                ErrorCode.FLAG_NOT_FOUND)
+            value_type = type(default_value)
+            if self._parse_failures.is_open(flag_key, treatment, value_type):
+                return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+                                                               ErrorCode.PARSE_ERROR, "Could not convert treatment")
             value = treatment
             try:
-                if type(default_value) is int:
+                if value_type is int:
                     value = int(treatment)
                 elif isinstance(default_value, float):
                     value = float(treatment)
@@ -152,15 +467,15 @@ class SplitProviderBase(AbstractProvider):
                     else:
                         raise ParseError
                 elif isinstance(default_value, dict):
-                    value = json.loads(treatment)
+                    value = self._json_cache.get(flag_key, treatment)
 
             except Exception:
+                self._parse_failures.record(flag_key, treatment, value_type)
                 raise ParseError
 
             return SplitProvider.construct_flag_resolution(value, treatment, config)
 
         except ParseError as ex:
-            _LOGGER.error("Evaluation Parse error")
             _LOGGER.debug(ex)
             raise ParseError("Could not convert treatment")
 
@@ -174,9 +489,59 @@ class SplitProviderBase(AbstractProvider):
             _LOGGER.debug(ex)
             raise GeneralError("Failed to evaluate treatment")
 
+    def get_latency_snapshot(self):
+        """
+        Per-flag, per-stage evaluation latency histograms (see `LatencyRecorder.snapshot`).
+        Empty unless the provider was created with `LatencyTracking` or `SlowEvaluationThresholdMs`.
+        """
+        if self._latency_recorder is None:
+            return {}
+        return self._latency_recorder.snapshot()
+
+    def get_parse_failure_stats(self):
+        """Flag/treatment/type combinations known not to convert and the evaluations they short-circuited."""
+        return self._parse_failures.stats()
+
+    def get_single_flight_stats(self):
+        """
+        Counters of the coalescing of identical concurrent async evaluations (see `SingleFlight.stats`).
+        Empty unless the asyncio provider was created with `SingleFlight`.
+        """
+        if self._single_flight is None:
+            return {}
+        return self._single_flight.stats()
+
+    def get_evaluation_batch_stats(self):
+        """
+        Counters of the batching of concurrent async evaluations (see `EvaluationBatcher.stats`).
+        Empty unless the asyncio provider was created with `EvaluationBatchWindow`.
+        """
+        if self._batcher is None:
+            return {}
+        return self._batcher.stats()
+
+    def get_result_cache_stats(self):
+        """
+        Counters of the evaluation result cache (see `EvaluationResultCache.stats`).
+        Empty unless the provider was created with `ResultCacheSize`.
+        """
+        if self._result_cache is None:
+            return {}
+        return self._result_cache.stats()
+
+    def parsed_config(self, flag_key: str, config: str):
+        """
+        Return the Split dynamic config of a resolution (`flag_metadata["config"]`) decoded as an immutable mapping.
+        Decoded configs are cached per flag until an SDK_UPDATE names that flag.
+        """
+        if config is None:
+            return None
+        return self._json_cache.get(flag_key, config)
+
     @staticmethod
     def transform_context(evaluation_context: EvaluationContext):
-        return evaluation_context.attributes
+        """Uncached conversion of the context attributes to Split attributes (see `normalize_attributes`)."""
+        return normalize_attributes(evaluation_context.attributes)
 
     @staticmethod
     def no_treatment(treatment: str):
@@ -184,9 +549,29 @@ class SplitProviderBase(AbstractProvider):
 
     @staticmethod
     def construct_flag_resolution(value, variant, config, reason: Reason = Reason.TARGETING_MATCH,
-                                  error_code: ErrorCode = None):
-        return FlagResolutionDetails(value=value, error_code=error_code, reason=reason, variant=variant,
-                                     flag_metadata={"config": config})
+                                  error_code: ErrorCode = None, error_message: str = None):
+        return FlagResolutionDetails(value=value, error_code=error_code, error_message=error_message, reason=reason,
+                                     variant=variant, flag_metadata={"config": config})
+
+    @staticmethod
+    def mark_from_snapshot(resolution: FlagResolutionDetails):
+        """Flag a resolution served from the flag snapshot: reason CACHED and `flag_metadata["source"]`."""
+        if resolution.reason == Reason.TARGETING_MATCH:
+            resolution.reason = Reason.CACHED
+        resolution.flag_metadata["source"] = SOURCE_SNAPSHOT
+        return resolution
+
+    @staticmethod
+    def outside_flag_sets_resolution(default_value):
+        return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.DEFAULT,
+                                                       ErrorCode.FLAG_NOT_FOUND,
+                                                       "Flag is not in the configured flag sets")
+
+    @staticmethod
+    def not_ready_resolutions(flag_defaults: typing.Dict[str, typing.Any]):
+        return {flag_key: SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+                                                                  ErrorCode.PROVIDER_NOT_READY)
+                for flag_key, default_value in flag_defaults.items()}
 
     def resolve_boolean_details(self, flag_key: str, default_value: bool,
                                 evaluation_context: EvaluationContext = EvaluationContext()):
@@ -229,7 +614,24 @@ class SplitProviderBase(AbstractProvider):
 
 class SplitProvider(SplitProviderBase):
     def __init__(self, initial_context):
-        self._split_client_wrapper = SplitClientWrapper(initial_context)
+        self._init_provider(initial_context)
+        # factory creation and block_until_ready run in the background; initialize() waits for them
+        self._split_client_wrapper.start()
+        # a supplied SplitClient belongs to the caller, a factory created from SdkKey/LocalFile to the provider
+        self._owns_factory = initial_context.get("SplitClient") == None
+        self._pool_size = initial_context.get("AsyncPoolSize")
+        self._pool_queue_size = initial_context.get("AsyncQueueSize") or DEFAULT_MAX_QUEUED
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def initialize(self, evaluation_context: EvaluationContext):
+        """
+        Wait up to `ReadyBlockTime` for the Split SDK. Raising makes OpenFeature report PROVIDER_ERROR;
+        PROVIDER_READY follows once the SDK becomes ready.
+        """
+        self._restart_event_dispatcher()
+        if not self._split_client_wrapper.initialize():
+            raise ProviderNotReadyError("Split SDK is not ready yet, block until ready timed out")
 
     def resolve_boolean_details(self, flag_key: str, default_value: bool,
                                 evaluation_context: EvaluationContext = EvaluationContext()):
@@ -251,15 +653,262 @@ class SplitProvider(SplitProviderBase):
                                evaluation_context: EvaluationContext = EvaluationContext()):
         return self._evaluate_treatment(flag_key, evaluation_context, default_value)
 
+    def resolve_bulk_details(self, flag_defaults: typing.Dict[str, typing.Any],
+                             evaluation_context: EvaluationContext = EvaluationContext()):
+        """
+        Evaluate several flags for the same context with a single `get_treatments_with_config` call.
+
+        :param flag_defaults: mapping of flag key to its typed default value; the default's type selects the coercion.
+        :return: dict of flag key to FlagResolutionDetails.
+        """
+        return self._evaluate_treatments(flag_defaults, evaluation_context)
+
+    def resolve_flag_set_details(self, flag_set: str, evaluation_context: EvaluationContext = EvaluationContext(),
+                                 flag_defaults: typing.Dict[str, typing.Any] = None):
+        """
+        Evaluate every flag of a flag set for the same context with a single `get_treatments_with_config_by_flag_set`
+        call.
+
+        :param flag_defaults: optional typed defaults of some of the set's flags; the others resolve to strings.
+        :return: dict of flag key to FlagResolutionDetails, empty when the set is not among the configured `FlagSets`.
+        """
+        return self._evaluate_flag_set(flag_set, evaluation_context, flag_defaults)
+
+    def shutdown(self):
+        """
+        Stop the thread pool behind the async resolve methods, deliver pending events and send queued tracking
+        events, then destroy the Split factory the provider created. A factory supplied through `SplitClient` is
+        left to its owner.
+        """
+        self._stop_event_dispatcher()
+        self._stop_track_queue()
+        with self._pool_lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown()
+        if self._owns_factory:
+            self._split_client_wrapper.destroy()
+
+    def _send_tracking_events(self, events):
+        split_client = self._split_client_wrapper.tracking_client
+        return sum(1 for event in events if split_client.track(*event))
+
+    def get_pool_stats(self):
+        """Saturation counters of the thread pool serving the async resolve methods (see `EvaluationPool.stats`)."""
+        if self._pool is None:
+            return {}
+        return self._pool.stats()
+
+    def _evaluation_pool(self):
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = EvaluationPool(self._pool_size, self._pool_queue_size)
+                pool = self._pool
+        return pool
+
+    async def _run_in_pool(self, function, *args):
+        """Run a sync evaluation on the bounded thread pool so the calling event loop is never blocked."""
+        import asyncio
+        return await asyncio.wrap_future(self._evaluation_pool().submit(function, *args))
+
+    async def resolve_boolean_details_async(self, flag_key: str, default_value: bool,
+                                            evaluation_context: EvaluationContext = EvaluationContext()):
+        return await self._run_in_pool(self._evaluate_treatment, flag_key, evaluation_context, default_value)
+
+    async def resolve_string_details_async(self, flag_key: str, default_value: str,
+                                           evaluation_context: EvaluationContext = EvaluationContext()):
+        return await self._run_in_pool(self._evaluate_treatment, flag_key, evaluation_context, default_value)
+
+    async def resolve_integer_details_async(self, flag_key: str, default_value: int,
+                                            evaluation_context: EvaluationContext = EvaluationContext()):
+        return await self._run_in_pool(self._evaluate_treatment, flag_key, evaluation_context, default_value)
+
+    async def resolve_float_details_async(self, flag_key: str, default_value: float,
+                                          evaluation_context: EvaluationContext = EvaluationContext()):
+        return await self._run_in_pool(self._evaluate_treatment, flag_key, evaluation_context, default_value)
+
+    async def resolve_object_details_async(self, flag_key: str, default_value: dict,
+                                           evaluation_context: EvaluationContext = EvaluationContext()):
+        return await self._run_in_pool(self._evaluate_treatment, flag_key, evaluation_context, default_value)
+
+    async def resolve_bulk_details_async(self, flag_defaults: typing.Dict[str, typing.Any],
+                                         evaluation_context: EvaluationContext = EvaluationContext()):
+        """Async counterpart of `resolve_bulk_details`, evaluated on the bounded thread pool."""
+        return await self._run_in_pool(self._evaluate_treatments, flag_defaults, evaluation_context)
+
+    async def resolve_flag_set_details_async(self, flag_set: str,
+                                             evaluation_context: EvaluationContext = EvaluationContext(),
+                                             flag_defaults: typing.Dict[str, typing.Any] = None):
+        """Async counterpart of `resolve_flag_set_details`, evaluated on the bounded thread pool."""
+        return await self._run_in_pool(self._evaluate_flag_set, flag_set, evaluation_context, flag_defaults)
+
 class SplitProviderAsync(SplitProviderBase):
     def __init__(self, initial_context):
         if isinstance(initial_context, dict):
             initial_context["ThreadingMode"] = "asyncio"
-        self._split_client_wrapper = SplitClientWrapper(initial_context)
+        self._init_provider(initial_context)
+        self._loop_thread = None
+        self._loop_thread_lock = threading.Lock()
+        self._track_flush_task = None
 
     async def create(self):
         await self._split_client_wrapper.create()
 
+    def initialize(self, evaluation_context: EvaluationContext):
+        """
+        OpenFeature initializes providers synchronously, so the asyncio factory cannot be awaited here: await
+        `create()` before `api.set_provider` to start out ready. When `create()` has not completed, it is scheduled
+        on the running loop, initialization reports PROVIDER_NOT_READY and PROVIDER_READY is emitted once the SDK
+        is ready, or PROVIDER_ERROR if `create()` fails. Without a running loop, the factory is created on the
+        provider's own event loop thread.
+        """
+        self._restart_event_dispatcher()
+        wrapper = self._split_client_wrapper
+        if wrapper.is_sdk_ready() or wrapper.snapshot_client is not None:
+            return
+        import asyncio
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._factory_loop()
+            if not (wrapper.is_sdk_ready() or wrapper.snapshot_client is not None):
+                raise ProviderNotReadyError("Split SDK is not ready yet, block until ready timed out")
+            return
+        self._create_task = loop.create_task(self.create())
+        self._create_task.add_done_callback(self._on_create_done)
+        raise ProviderNotReadyError("Split SDK is initializing, await provider.create() before api.set_provider "
+                                    "to start ready")
+
+    def _on_create_done(self, task):
+        if task.cancelled() or task.exception() is None:
+            return
+        _LOGGER.error("SplitProviderAsync: Split SDK initialization failed: %s", task.exception())
+        self._emit(self.emit_provider_error, ProviderEventDetails(
+            message="Split SDK initialization failed: %s" % task.exception(),
+            error_code=ErrorCode.GENERAL,
+        ))
+
+    def shutdown(self):
+        """
+        Destroy the factory and stop the event loop thread, if the provider started one for sync callers.
+        Called from the event loop running the factory, the queued tracking events are sent by a task on that
+        loop; `await shutdown_async()` waits for them instead.
+        """
+        self._stop_event_dispatcher()
+        if self._on_factory_loop():
+            import asyncio
+            if self._track_flush_task is None:
+                self._track_flush_task = asyncio.get_running_loop().create_task(self._flush_track_queue_async())
+        else:
+            self._stop_track_queue()
+        with self._loop_thread_lock:
+            loop_thread = self._loop_thread
+            self._loop_thread = None
+        if loop_thread is not None:
+            loop_thread.run(self._split_client_wrapper.destroy_async())
+            loop_thread.stop()
+
+    async def shutdown_async(self):
+        """Shut down, sending the queued tracking events from the event loop running the factory."""
+        if not self._on_factory_loop():
+            self.shutdown()
+            return
+        self._stop_event_dispatcher()
+        if self._track_flush_task is None:
+            await self._flush_track_queue_async()
+        else:
+            await self._track_flush_task
+
+    async def _flush_track_queue_async(self):
+        track_queue = self._retire_track_queue()
+        if track_queue is not None:
+            # the tracking thread would block on this loop through _run_sync, so the last batches are awaited here
+            track_queue.stop(flush=False)
+            await track_queue.flush_async(self._send_tracking_events_async)
+
+    def _on_factory_loop(self):
+        import asyncio
+        loop = self._split_client_wrapper.loop
+        return loop is not None and asyncio._get_running_loop() is loop
+
+    def _factory_loop(self):
+        """
+        Event loop the asyncio factory runs on. When `create()` was never awaited, the factory is created on a
+        dedicated event loop thread owned by the provider, so sync-only processes can use it too.
+        """
+        loop = self._split_client_wrapper.loop
+        if loop is not None:
+            return loop
+        with self._loop_thread_lock:
+            if self._loop_thread is None:
+                from split_openfeature_provider.event_loop_thread import EventLoopThread
+                self._loop_thread = EventLoopThread()
+                self._loop_thread.run(self.create())
+            return self._loop_thread.loop
+
+    def _send_tracking_events(self, events):
+        # a stalled factory loop fails the batch instead of blocking the tracking thread, and so shutdown, forever
+        return self._run_sync(self._send_tracking_events_async, events, timeout=DEFAULT_SEND_TIMEOUT)
+
+    async def _send_tracking_events_async(self, events):
+        split_client = self._split_client_wrapper.split_client
+        sent = 0
+        for event in events:
+            if await split_client.track(*event):
+                sent += 1
+        return sent
+
+    def _run_sync(self, coroutine_function, *args, timeout: float = None):
+        """
+        Run an evaluation coroutine on the factory's event loop and wait for it from the calling thread, at most
+        `timeout` seconds when given (the coroutine is then cancelled and TimeoutError raised).
+        """
+        import asyncio
+        import concurrent.futures
+        loop = self._factory_loop()
+        if asyncio._get_running_loop() is loop:
+            raise GeneralError("Synchronous evaluation would block the event loop running the Split factory, "
+                               "use the async methods instead")
+        future = asyncio.run_coroutine_threadsafe(coroutine_function(*args), loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def resolve_boolean_details(self, flag_key: str, default_value: bool,
+                                evaluation_context: EvaluationContext = EvaluationContext()):
+        return self._run_sync(self._evaluate_treatment_async, flag_key, evaluation_context, default_value)
+
+    def resolve_string_details(self, flag_key: str, default_value: str,
+                               evaluation_context: EvaluationContext = EvaluationContext()):
+        return self._run_sync(self._evaluate_treatment_async, flag_key, evaluation_context, default_value)
+
+    def resolve_integer_details(self, flag_key: str, default_value: int,
+                                evaluation_context: EvaluationContext = EvaluationContext()):
+        return self._run_sync(self._evaluate_treatment_async, flag_key, evaluation_context, default_value)
+
+    def resolve_float_details(self, flag_key: str, default_value: float,
+                              evaluation_context: EvaluationContext = EvaluationContext()):
+        return self._run_sync(self._evaluate_treatment_async, flag_key, evaluation_context, default_value)
+
+    def resolve_object_details(self, flag_key: str, default_value: dict,
+                               evaluation_context: EvaluationContext = EvaluationContext()):
+        return self._run_sync(self._evaluate_treatment_async, flag_key, evaluation_context, default_value)
+
+    def resolve_bulk_details(self, flag_defaults: typing.Dict[str, typing.Any],
+                             evaluation_context: EvaluationContext = EvaluationContext()):
+        """Sync counterpart of `resolve_bulk_details_async`, evaluated on the factory's event loop."""
+        return self._run_sync(self._evaluate_treatments_async, flag_defaults, evaluation_context)
+
+    def resolve_flag_set_details(self, flag_set: str, evaluation_context: EvaluationContext = EvaluationContext(),
+                                 flag_defaults: typing.Dict[str, typing.Any] = None):
+        """Sync counterpart of `resolve_flag_set_details_async`, evaluated on the factory's event loop."""
+        return self._run_sync(self._evaluate_flag_set_async, flag_set, evaluation_context, flag_defaults)
+
     async def resolve_boolean_details_async(self, flag_key: str, default_value: bool,
                                 evaluation_context: EvaluationContext = EvaluationContext()):
         return await self._evaluate_treatment_async(flag_key, evaluation_context, default_value)
@@ -280,18 +929,129 @@ class SplitProviderAsync(SplitProviderBase):
                                evaluation_context: EvaluationContext = EvaluationContext()):
         return await self._evaluate_treatment_async(flag_key, evaluation_context, default_value)
 
+    async def resolve_bulk_details_async(self, flag_defaults: typing.Dict[str, typing.Any],
+                                         evaluation_context: EvaluationContext = EvaluationContext()):
+        """
+        Evaluate several flags for the same context with a single `get_treatments_with_config` call.
+
+        :param flag_defaults: mapping of flag key to its typed default value; the default's type selects the coercion.
+        :return: dict of flag key to FlagResolutionDetails.
+        """
+        return await self._evaluate_treatments_async(flag_defaults, evaluation_context)
+
+    async def resolve_flag_set_details_async(self, flag_set: str,
+                                             evaluation_context: EvaluationContext = EvaluationContext(),
+                                             flag_defaults: typing.Dict[str, typing.Any] = None):
+        """
+        Evaluate every flag of a flag set for the same context with a single `get_treatments_with_config_by_flag_set`
+        call.
+
+        :param flag_defaults: optional typed defaults of some of the set's flags; the others resolve to strings.
+        :return: dict of flag key to FlagResolutionDetails, empty when the set is not among the configured `FlagSets`.
+        """
+        return await self._evaluate_flag_set_async(flag_set, evaluation_context, flag_defaults)
+
     async def _evaluate_treatment_async(self, key: str, evaluation_context: EvaluationContext, default_value):
         if evaluation_context is None:
             raise GeneralError("Evaluation Context must be provided for the Split Provider")
 
-        if not await self._split_client_wrapper.is_sdk_ready_async():
-            return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
+        timer = self._latency_recorder.start(key) if self._latency_recorder is not None else None
+        try:
+            split_client, from_snapshot = self._evaluation_client()
+            if split_client is None:
+                return SplitProvider.construct_flag_resolution(default_value, None, None, Reason.ERROR,
                                                                ErrorCode.PROVIDER_NOT_READY)
+            if timer is not None:
+                timer.mark(STAGE_READY)
+
+            targeting_key = evaluation_context.targeting_key
+            if not targeting_key:
+                raise TargetingKeyMissingError("Missing targeting key")
+            if not self._split_client_wrapper.in_flag_sets(key):
+                return SplitProvider.outside_flag_sets_resolution(default_value)
+
+            cache_key = self._result_cache_key(key, evaluation_context, default_value, from_snapshot)
+            if cache_key is not None:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # an SDK_UPDATE landing during the SDK call must keep its stale result out of the cache
+            generation = self._result_cache.generation(key) if cache_key is not None else None
+            attributes = self._context_transformer.transform(evaluation_context)
+            if timer is not None:
+                timer.mark(STAGE_CONTEXT)
+            context_key = None
+            if self._batcher is not None or self._single_flight is not None:
+                context_attributes = evaluation_context.attributes
+                # None for unhashable attributes, which are evaluated on their own
+                context_key = fingerprint(context_attributes) if context_attributes else ()
+            if self._batcher is not None and context_key is not None:
+                evaluated = await self._batcher.load(
+                    (split_client, targeting_key, context_key), key,
+                    lambda flag_keys: split_client.get_treatments_with_config(targeting_key, flag_keys, attributes))
+            elif self._single_flight is not None and context_key is not None:
+                # callers after an invalidation do not join a call started before it
+                evaluated = await self._single_flight.call(
+                    (split_client, key, targeting_key, context_key, generation),
+                    lambda: split_client.get_treatment_with_config(targeting_key, key, attributes))
+            else:
+                evaluated = await split_client.get_treatment_with_config(targeting_key, key, attributes)
+            if timer is not None:
+                timer.mark(STAGE_SDK)
+            result = self._process_treatment(evaluated, default_value, key)
+            if from_snapshot:
+                SplitProvider.mark_from_snapshot(result)
+            elif cache_key is not None and result.error_code is None:
+                self._result_cache.put(cache_key, result, generation)
+            if timer is not None:
+                timer.mark(STAGE_PROCESS)
+            return result
+        finally:
+            if timer is not None:
+                timer.stop()
+
+    async def _evaluate_treatments_async(self, flag_defaults: typing.Dict[str, typing.Any],
+                                         evaluation_context: EvaluationContext):
+        if evaluation_context is None:
+            raise GeneralError("Evaluation Context must be provided for the Split Provider")
+
+        split_client, from_snapshot = self._evaluation_client()
+        if split_client is None:
+            return SplitProvider.not_ready_resolutions(flag_defaults)
+
+        targeting_key = evaluation_context.targeting_key
+        if not targeting_key:
+            raise TargetingKeyMissingError("Missing targeting key")
+
+        flag_defaults, outside = self._split_by_flag_sets(flag_defaults)
+        if not flag_defaults:
+            return outside
+        attributes = self._context_transformer.transform(evaluation_context)
+        evaluated = await split_client.get_treatments_with_config(targeting_key, list(flag_defaults), attributes)
+        results = self._process_treatments(evaluated, flag_defaults)
+        if from_snapshot:
+            for result in results.values():
+                SplitProvider.mark_from_snapshot(result)
+        results.update(outside)
+        return results
+
+    async def _evaluate_flag_set_async(self, flag_set: str, evaluation_context: EvaluationContext,
+                                       flag_defaults: typing.Dict[str, typing.Any]):
+        if evaluation_context is None:
+            raise GeneralError("Evaluation Context must be provided for the Split Provider")
+
+        split_client, from_snapshot = self._evaluation_client()
+        if split_client is None:
+            return SplitProvider.not_ready_resolutions(flag_defaults or {})
 
         targeting_key = evaluation_context.targeting_key
         if not targeting_key:
             raise TargetingKeyMissingError("Missing targeting key")
+        flag_set = self._configured_flag_set(flag_set)
+        if flag_set is None:
+            return {}
 
-        attributes = SplitProvider.transform_context(evaluation_context)
-        evaluated = await self._split_client_wrapper.split_client.get_treatment_with_config(targeting_key, key, attributes)
-        return self._process_treatment(evaluated, default_value)
+        attributes = self._context_transformer.transform(evaluation_context)
+        evaluated = await split_client.get_treatments_with_config_by_flag_set(targeting_key, flag_set, attributes)
+        return self._process_flag_set(evaluated, flag_defaults, from_snapshot)
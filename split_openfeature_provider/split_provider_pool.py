@@ -0,0 +1,388 @@
+import contextlib
+import logging
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent
+from openfeature.exception import GeneralError
+from openfeature.hook import Hook
+from openfeature.provider import AbstractProvider, Metadata
+from split_openfeature_provider.split_provider import SplitProvider
+from split_openfeature_provider.telemetry import create_hook
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_FACTORIES = 16
+
+# Context attribute read by the default SDK key resolver
+SDK_KEY_ATTRIBUTE = "splitSdkKey"
+
+# Options naming a single file, directory or process layout, which tenants cannot share
+_PER_ENVIRONMENT_OPTIONS = ("SnapshotDirectory", "PreforkMode", "LocalFile")
+
+
+def sdk_key_from_context(evaluation_context: EvaluationContext):
+    """Default `SdkKeyResolver`: the `splitSdkKey` attribute of the evaluation context."""
+    if evaluation_context is None or not evaluation_context.attributes:
+        return None
+    return evaluation_context.attributes.get(SDK_KEY_ATTRIBUTE)
+
+
+def _mask(sdk_key):
+    return "*" + sdk_key[-4:]
+
+
+def _storage_counts(factory):
+    try:
+        storages = factory._storages
+        segment_names = storages["splits"].get_segment_names()
+        segments = [storages["segments"].get(name) for name in segment_names]
+        return {
+            "flags": len(storages["splits"].get_split_names()),
+            "segments": len(segment_names),
+            "segment_keys": sum(len(segment.keys) for segment in segments if segment is not None),
+        }
+    except Exception:
+        # not created yet, or a storage that is not held in memory
+        return {"flags": None, "segments": None, "segment_keys": None}
+
+
+class _Tenant():
+    __slots__ = ("provider", "last_used", "evaluations", "in_use", "evicted")
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.last_used = time.monotonic()
+        self.evaluations = 0
+        # evaluations and track calls running on the provider; an evicted tenant is destroyed when it drops to 0
+        self.in_use = 0
+        self.evicted = False
+
+
+class SplitProviderPool(AbstractProvider):
+    """
+    One OpenFeature provider serving several Split environments, each with its own SDK key.
+
+    The SDK key of every evaluation comes from `SdkKeyResolver` (by default the `splitSdkKey` context
+    attribute). Providers are created on first use and shared by all evaluations for that key; at most
+    `MaxFactories` are kept alive, the least recently used being destroyed to make room once the evaluations
+    running on it have returned. The remaining entries of `initial_context` (ConfigOptions, ReadyBlockTime, ...)
+    configure every tenant's provider; `SnapshotDirectory`, `PreforkMode` and `LocalFile` are rejected, as
+    every environment would share the same snapshot files or flag file.
+    """
+
+    def __init__(self, initial_context):
+        if not isinstance(initial_context, dict):
+            _LOGGER.error("SplitProviderPool: initial_context must be of type `dict`")
+            raise AttributeError()
+
+        template = dict(initial_context)
+        self._resolver = template.pop("SdkKeyResolver", None) or sdk_key_from_context
+        self._max_factories = template.pop("MaxFactories", DEFAULT_MAX_FACTORIES)
+        telemetry = template.pop("OpenTelemetry", None)
+        if not callable(self._resolver):
+            _LOGGER.error("SplitProviderPool: key `SdkKeyResolver` must be callable")
+            raise AttributeError()
+        if isinstance(self._max_factories, bool) or not isinstance(self._max_factories, int) or self._max_factories < 1:
+            _LOGGER.error("SplitProviderPool: key `MaxFactories` must be a positive `int`")
+            raise AttributeError()
+        if template.get("SdkKey") != None or template.get("SplitClient") != None:
+            _LOGGER.error("SplitProviderPool: SDK keys are resolved per evaluation, remove `SdkKey`/`SplitClient`")
+            raise AttributeError()
+        shared = [option for option in _PER_ENVIRONMENT_OPTIONS if template.get(option)]
+        if shared:
+            _LOGGER.error("SplitProviderPool: `%s` cannot be shared by several SDK keys", "`/`".join(shared))
+            raise AttributeError()
+
+        self._template = template
+        self._hooks = [create_hook(telemetry)] if telemetry else []
+        self._tenants = OrderedDict()
+        self._lock = threading.Lock()
+        self._views = []
+        self._sdk_key = None
+        self._evictions = 0
+
+    def get_metadata(self) -> Metadata:
+        return Metadata("Split")
+
+    def get_provider_hooks(self) -> typing.List[Hook]:
+        return self._hooks
+
+    def attach(self, on_emit):
+        super().attach(on_emit)
+        self._add_view(self)
+
+    def detach(self):
+        self._remove_view(self)
+        super().detach()
+
+    def shutdown(self):
+        """Destroy every tenant's factory."""
+        with self._lock:
+            tenants = list(self._tenants.values())
+            self._tenants.clear()
+        for tenant in tenants:
+            self._evict(tenant)
+
+    def tenant(self, sdk_key: str):
+        """
+        Provider bound to one SDK key but backed by this pool, e.g. to register per OpenFeature domain with
+        `api.set_provider(pool.tenant(key), domain)`.
+        """
+        return SplitTenantProvider(self, sdk_key)
+
+    def stats(self):
+        """
+        Per tenant (keyed by the last four characters of the SDK key): readiness, evaluation count, idle seconds
+        and the number of flags, segments and segment keys held in memory.
+        """
+        with self._lock:
+            tenants = list(self._tenants.items())
+        now = time.monotonic()
+        stats = {}
+        for sdk_key, tenant in tenants:
+            wrapper = tenant.provider._split_client_wrapper
+            tenant_stats = {
+                "ready": wrapper.is_sdk_ready(),
+                "evaluations": tenant.evaluations,
+                "idle_seconds": now - tenant.last_used,
+            }
+            tenant_stats.update(_storage_counts(wrapper._factory))
+            stats[_mask(sdk_key)] = tenant_stats
+        return stats
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    def _add_view(self, view):
+        with self._lock:
+            self._views.append(view)
+
+    def _remove_view(self, view):
+        with self._lock:
+            if view in self._views:
+                self._views.remove(view)
+
+    def _on_tenant_event(self, sdk_key, event, details):
+        if event != ProviderEvent.PROVIDER_CONFIGURATION_CHANGED:
+            return
+        for view in list(self._views):
+            if view._sdk_key is None or view._sdk_key == sdk_key:
+                view.emit(event, details)
+
+    def _acquire(self, sdk_key):
+        """Tenant of `sdk_key`, created if needed and held until `_release`, so eviction cannot destroy it."""
+        if not sdk_key or not isinstance(sdk_key, str):
+            raise GeneralError("No Split SDK key resolved for the evaluation context")
+
+        with self._lock:
+            tenant = self._tenants.get(sdk_key)
+            if tenant is not None:
+                return self._use(sdk_key, tenant)
+
+        # built outside the lock and before anything is evicted, so a failure leaves the pool untouched
+        provider = SplitProvider(dict(self._template, SdkKey=sdk_key))
+        provider.attach(lambda _, event, details: self._on_tenant_event(sdk_key, event, details))
+        evicted = None
+        with self._lock:
+            tenant = self._tenants.get(sdk_key)
+            if tenant is None:
+                if len(self._tenants) >= self._max_factories:
+                    _, evicted = self._tenants.popitem(last=False)
+                    self._evictions += 1
+                tenant = self._tenants[sdk_key] = _Tenant(provider)
+                provider = None
+            # else another thread created it meanwhile
+            self._use(sdk_key, tenant)
+        if provider is not None:
+            self._destroy(provider)
+        if evicted is not None:
+            _LOGGER.info("SplitProviderPool: evicting the least recently used factory (%s)",
+                         _mask(evicted.provider._split_client_wrapper._api_key))
+            self._evict(evicted)
+        return tenant
+
+    def _use(self, sdk_key, tenant):
+        # called with the lock held
+        self._tenants.move_to_end(sdk_key)
+        tenant.last_used = time.monotonic()
+        tenant.evaluations += 1
+        tenant.in_use += 1
+        return tenant
+
+    def _release(self, tenant):
+        with self._lock:
+            tenant.in_use -= 1
+            destroy = tenant.evicted and tenant.in_use == 0
+        if destroy:
+            self._destroy(tenant.provider)
+
+    def _evict(self, tenant):
+        with self._lock:
+            tenant.evicted = True
+            destroy = tenant.in_use == 0
+        if destroy:
+            self._destroy(tenant.provider)
+
+    @contextlib.contextmanager
+    def _ready_provider(self, sdk_key):
+        tenant = self._acquire(sdk_key)
+        try:
+            wrapper = tenant.provider._split_client_wrapper
+            if not wrapper.is_sdk_ready():
+                # first evaluations of a tenant wait up to ReadyBlockTime, like set_provider would
+                try:
+                    wrapper.initialize()
+                except Exception as ex:
+                    raise GeneralError("Could not create the Split factory: %s" % ex)
+            yield tenant.provider
+        finally:
+            self._release(tenant)
+
+    @contextlib.asynccontextmanager
+    async def _ready_provider_async(self, sdk_key):
+        tenant = self._acquire(sdk_key)
+        try:
+            wrapper = tenant.provider._split_client_wrapper
+            if not wrapper.is_sdk_ready():
+                import asyncio
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, wrapper.initialize)
+                except Exception as ex:
+                    raise GeneralError("Could not create the Split factory: %s" % ex)
+            yield tenant.provider
+        finally:
+            self._release(tenant)
+
+    @staticmethod
+    def _destroy(provider):
+        provider.detach()
+        # destroys the tenant's factory as well
+        provider.shutdown()
+
+    def _key(self, evaluation_context):
+        return self._resolver(evaluation_context)
+
+    def track(self, tracking_event_name: str, evaluation_context: EvaluationContext = None,
+              tracking_event_details: typing.Any = None):
+        """Queue a Split event on the provider of the context's SDK key (see `SplitProvider.track`)."""
+        tenant = self._acquire(self._key(evaluation_context))
+        try:
+            return tenant.provider.track(tracking_event_name, evaluation_context, tracking_event_details)
+        finally:
+            self._release(tenant)
+
+    def resolve_boolean_details(self, flag_key: str, default_value: bool,
+                                evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_boolean_details(flag_key, default_value, evaluation_context)
+
+    def resolve_string_details(self, flag_key: str, default_value: str,
+                               evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_string_details(flag_key, default_value, evaluation_context)
+
+    def resolve_integer_details(self, flag_key: str, default_value: int,
+                                evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_integer_details(flag_key, default_value, evaluation_context)
+
+    def resolve_float_details(self, flag_key: str, default_value: float,
+                              evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_float_details(flag_key, default_value, evaluation_context)
+
+    def resolve_object_details(self, flag_key: str, default_value: dict,
+                               evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_object_details(flag_key, default_value, evaluation_context)
+
+    def resolve_bulk_details(self, flag_defaults: typing.Dict[str, typing.Any],
+                             evaluation_context: EvaluationContext = EvaluationContext()):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_bulk_details(flag_defaults, evaluation_context)
+
+    def resolve_flag_set_details(self, flag_set: str, evaluation_context: EvaluationContext = EvaluationContext(),
+                                 flag_defaults: typing.Dict[str, typing.Any] = None):
+        with self._ready_provider(self._key(evaluation_context)) as provider:
+            return provider.resolve_flag_set_details(flag_set, evaluation_context, flag_defaults)
+
+    async def resolve_boolean_details_async(self, flag_key: str, default_value: bool,
+                                            evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_boolean_details_async(flag_key, default_value, evaluation_context)
+
+    async def resolve_string_details_async(self, flag_key: str, default_value: str,
+                                           evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_string_details_async(flag_key, default_value, evaluation_context)
+
+    async def resolve_integer_details_async(self, flag_key: str, default_value: int,
+                                            evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_integer_details_async(flag_key, default_value, evaluation_context)
+
+    async def resolve_float_details_async(self, flag_key: str, default_value: float,
+                                          evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_float_details_async(flag_key, default_value, evaluation_context)
+
+    async def resolve_object_details_async(self, flag_key: str, default_value: dict,
+                                           evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_object_details_async(flag_key, default_value, evaluation_context)
+
+    async def resolve_bulk_details_async(self, flag_defaults: typing.Dict[str, typing.Any],
+                                         evaluation_context: EvaluationContext = EvaluationContext()):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_bulk_details_async(flag_defaults, evaluation_context)
+
+    async def resolve_flag_set_details_async(self, flag_set: str,
+                                             evaluation_context: EvaluationContext = EvaluationContext(),
+                                             flag_defaults: typing.Dict[str, typing.Any] = None):
+        async with self._ready_provider_async(self._key(evaluation_context)) as provider:
+            return await provider.resolve_flag_set_details_async(flag_set, evaluation_context, flag_defaults)
+
+
+class SplitTenantProvider(SplitProviderPool):
+    """Provider for a single SDK key of a `SplitProviderPool`, sharing the pool's factories and LRU cap."""
+
+    def __init__(self, pool: SplitProviderPool, sdk_key: str):
+        self._pool = pool
+        self._sdk_key = sdk_key
+        self._hooks = pool._hooks
+
+    def attach(self, on_emit):
+        AbstractProvider.attach(self, on_emit)
+        self._pool._add_view(self)
+
+    def detach(self):
+        self._pool._remove_view(self)
+        AbstractProvider.detach(self)
+
+    def shutdown(self):
+        # factories belong to the pool
+        pass
+
+    def tenant(self, sdk_key: str):
+        return self._pool.tenant(sdk_key)
+
+    def stats(self):
+        return {key: value for key, value in self._pool.stats().items() if key == _mask(self._sdk_key)}
+
+    @property
+    def evictions(self):
+        return self._pool.evictions
+
+    def _key(self, evaluation_context):
+        return self._sdk_key
+
+    def _acquire(self, sdk_key):
+        return self._pool._acquire(sdk_key)
+
+    def _release(self, tenant):
+        self._pool._release(tenant)
@@ -0,0 +1,119 @@
+import random
+import threading
+import time
+import typing
+
+from openfeature.flag_evaluation import FlagEvaluationDetails
+from openfeature.hook import Hook, HookContext, HookHints
+
+INSTRUMENTATION_NAME = "split_openfeature_provider"
+PROVIDER_NAME = "Split"
+
+EVALUATIONS_METRIC = "feature_flag.evaluations"
+DURATION_METRIC = "feature_flag.evaluation.duration"
+SPAN_NAME = "feature_flag.evaluation"
+
+_START = "start_ns"
+_SPAN = "span"
+
+
+class OpenTelemetryHook(Hook):
+    """
+    Provider hook exporting OpenFeature evaluations to OpenTelemetry.
+
+    Every evaluation is counted in the `feature_flag.evaluations` counter, by flag, reason and error code (so
+    PROVIDER_NOT_READY and PARSE_ERROR rates are read from it). Counts are kept in process, per pre-built attribute
+    set, and reported when the metric reader collects, so counting costs a dict lookup instead of an SDK call.
+    `latency_sample_rate` of the evaluations, chosen when they start, also record their duration in the
+    `feature_flag.evaluation.duration` histogram (seconds), and `span_sample_rate` of them are traced with a span
+    carrying the flag key and variant.
+
+    Requires the `opentelemetry-api` package; meter and tracer default to the globally configured providers.
+    """
+
+    def __init__(self, meter_provider=None, tracer_provider=None, latency_sample_rate: float = 0.1,
+                 span_sample_rate: float = 0.0):
+        try:
+            from opentelemetry import metrics, trace
+            from opentelemetry.metrics import Observation
+        except ImportError:
+            raise ImportError("OpenTelemetryHook requires opentelemetry-api, "
+                              "install split_openfeature_provider[otel]")
+        self._observation = Observation
+        self._counts = {}
+        self._lock = threading.Lock()
+        meter = (meter_provider or metrics.get_meter_provider()).get_meter(INSTRUMENTATION_NAME)
+        meter.create_observable_counter(EVALUATIONS_METRIC, callbacks=[self._observe_evaluations],
+                                        unit="{evaluation}", description="Feature flag evaluations")
+        self._duration = meter.create_histogram(DURATION_METRIC, unit="s",
+                                                description="Duration of feature flag evaluations")
+        self._tracer = None
+        if span_sample_rate > 0:
+            self._tracer = (tracer_provider or trace.get_tracer_provider()).get_tracer(INSTRUMENTATION_NAME)
+        self._latency_sample_rate = latency_sample_rate
+        self._span_sample_rate = span_sample_rate
+
+    @staticmethod
+    def _sampled(rate):
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def _count(self, flag_key, reason, error_code):
+        """Count an evaluation and return the attribute set of its (flag, reason, error code)."""
+        key = (flag_key, reason, error_code)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                attributes = {
+                    "feature_flag.key": flag_key,
+                    "feature_flag.provider_name": PROVIDER_NAME,
+                    "feature_flag.result.reason": str(getattr(reason, "value", reason) or ""),
+                }
+                if error_code is not None:
+                    attributes["error.type"] = str(getattr(error_code, "value", error_code))
+                entry = self._counts[key] = [attributes, 0]
+            entry[1] += 1
+        return entry[0]
+
+    def _observe_evaluations(self, options):
+        with self._lock:
+            counts = [(attributes, count) for attributes, count in self._counts.values()]
+        return [self._observation(count, attributes) for attributes, count in counts]
+
+    def before(self, hook_context: HookContext, hints: HookHints):
+        if self._sampled(self._latency_sample_rate):
+            hook_context.hook_data[_START] = time.perf_counter_ns()
+        if self._tracer is not None and self._sampled(self._span_sample_rate):
+            hook_context.hook_data[_SPAN] = self._tracer.start_span(SPAN_NAME, attributes={
+                "feature_flag.key": hook_context.flag_key,
+                "feature_flag.provider_name": PROVIDER_NAME,
+            })
+        return None
+
+    def finally_after(self, hook_context: HookContext, details: FlagEvaluationDetails, hints: HookHints):
+        attributes = self._count(hook_context.flag_key, details.reason, details.error_code)
+        hook_data = hook_context.hook_data
+        start = hook_data.get(_START)
+        if start is not None:
+            self._duration.record((time.perf_counter_ns() - start) / 1e9, attributes)
+        span = hook_data.get(_SPAN)
+        if span is not None:
+            self._end_span(span, details)
+
+    @staticmethod
+    def _end_span(span, details: FlagEvaluationDetails):
+        if details.variant is not None:
+            span.set_attribute("feature_flag.result.variant", str(details.variant))
+        if details.reason is not None:
+            span.set_attribute("feature_flag.result.reason", str(getattr(details.reason, "value", details.reason)))
+        if details.error_code is not None:
+            from opentelemetry.trace import Status, StatusCode
+            span.set_attribute("error.type", str(getattr(details.error_code, "value", details.error_code)))
+            span.set_status(Status(StatusCode.ERROR, details.error_message))
+        span.end()
+
+
+def create_hook(options: typing.Union[bool, typing.Dict[str, typing.Any]]):
+    """Hook for the `OpenTelemetry` initialization option: True, or a dict of `OpenTelemetryHook` arguments."""
+    if isinstance(options, dict):
+        return OpenTelemetryHook(**options)
+    return OpenTelemetryHook()
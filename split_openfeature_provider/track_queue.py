@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+import typing
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1
+# Seconds a batch may take to reach a Split client running on another thread's event loop
+DEFAULT_SEND_TIMEOUT = 5
+
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST)
+
+
+class TrackQueue():
+    """
+    Bounded buffer of tracking events, handed to `send` in batches from a background thread.
+
+    `put` never blocks: once `max_size` events are waiting, the overflow policy drops either the incoming event
+    (`drop_newest`) or the oldest one (`drop_oldest`). A batch is sent when `batch_size` events are waiting or
+    `flush_interval` seconds after the previous flush, and only while `can_send()` is true; `stop` flushes what
+    is left. `send(batch)` returns the number of events the SDK accepted.
+    """
+
+    def __init__(self, send: typing.Callable[[list], int], can_send: typing.Callable[[], bool] = None,
+                 max_size: int = DEFAULT_MAX_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, overflow: str = OVERFLOW_DROP_NEWEST):
+        self._send = send
+        self._can_send = can_send
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._queued = 0
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._max_depth = 0
+        self._thread = threading.Thread(target=self._run, name="SplitProviderTrack", daemon=True)
+        self._thread.start()
+
+    def put(self, event):
+        """Queue an event; return False when it was dropped by the overflow policy."""
+        with self._condition:
+            if self._stopped:
+                self._dropped += 1
+                return False
+            accepted = True
+            if len(self._events) >= self._max_size:
+                self._dropped += 1
+                if self._overflow == OVERFLOW_DROP_OLDEST:
+                    self._events.popleft()
+                else:
+                    accepted = False
+                if self._dropped == 1 or self._dropped % 1000 == 0:
+                    _LOGGER.warning("TrackQueue: queue full (%d events), %d events dropped so far",
+                                    self._max_size, self._dropped)
+            if accepted:
+                self._events.append(event)
+                self._queued += 1
+                if len(self._events) > self._max_depth:
+                    self._max_depth = len(self._events)
+                if len(self._events) >= self._batch_size:
+                    self._condition.notify()
+            return accepted
+
+    def _run(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self._flush_interval
+                while not self._stopped and len(self._events) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+            self._flush()
+
+    def _flush(self, final: bool = False):
+        if self._can_send is not None and not self._can_send():
+            if final:
+                self._drop_pending()
+            return
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                sent = self._send(batch)
+            except Exception as ex:
+                _LOGGER.debug("TrackQueue: sending %d events failed: %s", len(batch), ex)
+                sent = 0
+            self._record(batch, sent)
+
+    def _next_batch(self):
+        with self._condition:
+            if not self._events:
+                return None
+            return [self._events.popleft() for _ in range(min(self._batch_size, len(self._events)))]
+
+    def _record(self, batch, sent):
+        with self._condition:
+            self._flushes += 1
+            self._sent += sent
+            self._failed += len(batch) - sent
+
+    def _drop_pending(self):
+        with self._condition:
+            pending = len(self._events)
+            self._events.clear()
+            self._dropped += pending
+        if pending:
+            _LOGGER.warning("TrackQueue: Split client unavailable, %d tracking events dropped", pending)
+
+    def flush(self):
+        """Send every queued event now, from the calling thread."""
+        self._flush()
+
+    def stats(self):
+        """Return {"depth", "max_depth", "queued", "sent", "failed", "dropped", "flushes"}."""
+        with self._condition:
+            return {
+                "depth": len(self._events),
+                "max_depth": self._max_depth,
+                "queued": self._queued,
+                "sent": self._sent,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "flushes": self._flushes,
+            }
+
+    async def flush_async(self, send: typing.Callable[[list], typing.Awaitable[int]]):
+        """
+        Send every queued event with the awaitable `send(batch)` from the calling event loop, dropping them when
+        `can_send()` is false. Used after `stop(flush=False)` when the SDK client lives on that loop.
+        """
+        if self._can_send is not None and not self._can_send():
+            self._drop_pending()
+            return
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                sent = await send(batch)
+            except Exception as ex:
+                _LOGGER.debug("TrackQueue: sending %d events failed: %s", len(batch), ex)
+                sent = 0
+            self._record(batch, sent)
+
+    def stop(self, timeout: float = 5, flush: bool = True):
+        """
+        Stop the background thread and send the events still queued. With `flush` False the thread is not waited
+        for and the remaining events stay queued for `flush_async`.
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify()
+        if not flush:
+            return
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._flush(final=True)
@@ -0,0 +1,119 @@
+import logging
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait for the last impressions and events of a worker to be posted on shutdown
+DEFAULT_STOP_TIMEOUT = 5
+
+# Split SDK (major, minor) versions the recorder was tested with: it assembles the pipeline from SDK internals
+# (set_classes, _wrap_impression_listener, the factory's _recorder) that change between minor versions
+TESTED_SDK_VERSIONS = ((10, 6), (10, 7))
+
+
+class WorkerRecorder():
+    """
+    Impressions and events pipeline of a PreforkMode worker.
+
+    Workers evaluate against the published snapshot through localhost factories, which discard impressions and
+    events. Each worker builds this recorder after the fork and attaches it to every snapshot factory it opens:
+    impressions and tracked events are queued in memory and posted to Split by the worker's own background tasks,
+    with the SDK key, impressions mode and rates of the provider's configuration, as a standard factory does.
+    Flags and segments are still only synchronized by the pre-fork process.
+
+    Raises RuntimeError on a Split SDK version outside TESTED_SDK_VERSIONS.
+    """
+
+    def __init__(self, sdk_key: str, config: dict = None):
+        from split_openfeature_provider.split_client_wrapper import sdk_version
+        version = sdk_version()
+        if version not in TESTED_SDK_VERSIONS:
+            raise RuntimeError("untested Split SDK version %d.%d, workers record impressions and events with "
+                               "Split SDK %s" % (version + (" or ".join("%d.%d" % v for v in TESTED_SDK_VERSIONS),)))
+
+        from splitio.api.client import HttpClient
+        from splitio.api.events import EventsAPI
+        from splitio.api.impressions import ImpressionsAPI
+        from splitio.api.telemetry import TelemetryAPI
+        from splitio.client import util
+        from splitio.client.config import sanitize
+        from splitio.client.factory import _wrap_impression_listener
+        from splitio.engine.impressions import set_classes
+        from splitio.engine.impressions.impressions import Manager as ImpressionsManager
+        from splitio.engine.impressions.manager import Counter as ImpressionsCounter
+        from splitio.engine.impressions.unique_keys_tracker import UniqueKeysTracker
+        from splitio.engine.telemetry import TelemetryStorageProducer
+        from splitio.recorder.recorder import StandardRecorder
+        from splitio.storage.inmemmory import InMemoryEventStorage, InMemoryImpressionStorage, \
+            InMemoryTelemetryStorage
+        from splitio.sync.event import EventSynchronizer
+        from splitio.sync.impression import ImpressionSynchronizer
+        from splitio.tasks.events_sync import EventsSyncTask
+        from splitio.tasks.impressions_sync import ImpressionsSyncTask
+
+        cfg = sanitize(sdk_key, dict(config or {}))
+        self._labels_enabled = cfg["labelsEnabled"]
+        telemetry_producer = TelemetryStorageProducer(InMemoryTelemetryStorage())
+        runtime_producer = telemetry_producer.get_telemetry_runtime_producer()
+        http_options = {}
+        if cfg.get("proxyUrl"):
+            # proxyUrl is supported from Split SDK 10.7
+            http_options["proxies"] = {"https": cfg["proxyUrl"], "http": cfg["proxyUrl"]}
+        http_client = HttpClient(timeout=cfg.get("connectionTimeout"), **http_options)
+        metadata = util.get_metadata(cfg)
+        apis = {
+            "impressions": ImpressionsAPI(http_client, sdk_key, metadata, runtime_producer, cfg["impressionsMode"]),
+            "events": EventsAPI(http_client, sdk_key, metadata, runtime_producer),
+            "telemetry": TelemetryAPI(http_client, sdk_key, metadata, runtime_producer),
+        }
+        self._impression_storage = impression_storage = InMemoryImpressionStorage(cfg["impressionsQueueSize"],
+                                                                                  runtime_producer)
+        self._event_storage = event_storage = InMemoryEventStorage(cfg["eventsQueueSize"], runtime_producer)
+
+        imp_counter = ImpressionsCounter()
+        unique_keys_tracker = UniqueKeysTracker()
+        _, _, unique_keys_task, clear_filter_task, _, impressions_count_task, imp_strategy, none_strategy = \
+            set_classes("MEMORY", cfg["impressionsMode"], apis, imp_counter, unique_keys_tracker)
+        impressions_task = ImpressionsSyncTask(
+            ImpressionSynchronizer(apis["impressions"], impression_storage,
+                                   cfg["impressionsBulkSize"]).synchronize_impressions,
+            cfg["impressionsRefreshRate"])
+        events_task = EventsSyncTask(
+            EventSynchronizer(apis["events"], event_storage, cfg["eventsBulkSize"]).synchronize_events,
+            cfg["eventsPushRate"])
+        impression_storage.set_queue_full_hook(impressions_task.flush)
+        event_storage.set_queue_full_hook(events_task.flush)
+        self._tasks = [task for task in (impressions_task, events_task, impressions_count_task, unique_keys_task,
+                                         clear_filter_task) if task is not None]
+
+        self.recorder = StandardRecorder(
+            ImpressionsManager(imp_strategy, none_strategy, runtime_producer),
+            event_storage,
+            impression_storage,
+            telemetry_producer.get_telemetry_evaluation_producer(),
+            runtime_producer,
+            _wrap_impression_listener(cfg["impressionListener"], metadata),
+            imp_counter=imp_counter,
+            unique_keys_tracker=unique_keys_tracker,
+        )
+        for task in self._tasks:
+            task.start()
+
+    def attach(self, factory):
+        """Record the impressions and events of the clients `factory` creates from now on."""
+        if not hasattr(factory, "_recorder"):
+            raise RuntimeError("Split factory without a recorder to replace")
+        factory._recorder = self.recorder
+        factory._labels_enabled = self._labels_enabled
+
+    def stop(self, timeout: float = DEFAULT_STOP_TIMEOUT):
+        """Stop the background tasks, posting the impressions and events still queued."""
+        stopped = []
+        for task in self._tasks:
+            event = threading.Event()
+            task.stop(event)
+            stopped.append(event)
+        for event in stopped:
+            if not event.wait(timeout):
+                _LOGGER.warning("WorkerRecorder: impressions and events not posted within %ss", timeout)
+                return
@@ -6,7 +6,7 @@ from openfeature.evaluation_context import EvaluationContext
 from openfeature.exception import ErrorCode
 from openfeature.flag_evaluation import Reason
 from splitio import get_factory
-from split_openfeature_provider import SplitProvider
+from split_openfeature_provider import SplitProvider, SplitProviderAsync
 
 class TestClient(object):
     # The following are splits with treatments defined in the split.yaml file
@@ -152,6 +152,17 @@ class TestClient(object):
         assert details.error_code == ErrorCode.PARSE_ERROR
         assert details.value == {"val": "control"}
 
+    def test_bulk_details(self):
+        results = self.provider.resolve_bulk_details(
+            {self.my_feature: False, self.int_feature: 0, self.float_feature: 0.0, "non-existent-feature": "blah"},
+            EvaluationContext(targeting_key="key"))
+        assert results[self.my_feature].value
+        assert results[self.my_feature].flag_metadata["config"] == "{\"desc\" : \"this applies only to ON treatment\"}"
+        assert results[self.int_feature].value == 32
+        assert results[self.float_feature].value == 50.5
+        assert results["non-existent-feature"].value == "blah"
+        assert results["non-existent-feature"].error_code == ErrorCode.FLAG_NOT_FOUND
+
     def test_boolean_fail(self, client):
         # attempt to fetch an object treatment as a Boolean. Should result in the default
         value = client.get_boolean_value(self.obj_feature, False)
@@ -190,3 +201,16 @@ class TestClientInternal(TestClient):
     @pytest.fixture
     def provider(self):
         return SplitProvider({"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"}})
+
+class TestClientAsyncProviderFromSync(TestClient):
+    # sync evaluations on the asyncio provider run on its own event loop thread
+    @pytest.fixture
+    def provider(self):
+        provider = SplitProviderAsync({"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"}})
+        yield provider
+        provider.shutdown()
+
+    def _destroy_factory(self):
+        factory = self.provider._split_client_wrapper._factory
+        self.provider.shutdown()
+        assert factory.destroyed
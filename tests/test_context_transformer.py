@@ -0,0 +1,95 @@
+import unittest
+from datetime import date, datetime, timezone
+from enum import Enum
+
+from openfeature.evaluation_context import EvaluationContext
+from split_openfeature_provider.context_transformer import ContextTransformer, normalize_attributes, fingerprint
+
+
+class Plan(Enum):
+    PRO = "pro"
+
+
+class TestNormalizeAttributes(unittest.TestCase):
+    def test_primitives_pass_through(self):
+        attributes = {"country": "ar", "age": 30, "score": 1.5, "beta": True}
+        assert normalize_attributes(attributes) == attributes
+
+    def test_conversions(self):
+        converted = normalize_attributes({
+            "signup": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+            "naive": datetime(2024, 1, 1, 12, 0),
+            "birthday": date(2024, 1, 1),
+            "roles": {"admin"},
+            "ids": [1, None, 2],
+            "plan": Plan.PRO,
+            "user": {"org": {"tier": "gold"}, "seats": 10},
+            "missing": None,
+        })
+        assert converted == {
+            "signup": 1704110400,
+            "naive": 1704110400,
+            "birthday": 1704067200,
+            "roles": ["admin"],
+            "ids": ["1", "2"],
+            "plan": "pro",
+            "user.org.tier": "gold",
+            "user.seats": 10,
+        }
+
+    def test_empty(self):
+        assert normalize_attributes(None) == {}
+        assert normalize_attributes({}) == {}
+
+    def test_fingerprint_types(self):
+        assert fingerprint({"a": True}) != fingerprint({"a": 1})
+        assert fingerprint({"a": [1, 2]}) == fingerprint({"a": [1, 2]})
+        assert fingerprint({"a": {"b": {1, 2}}}) == fingerprint({"a": {"b": {2, 1}}})
+        assert fingerprint({"ids": [True]}) != fingerprint({"ids": [1]})
+        assert fingerprint({"ids": [1]}) != fingerprint({"ids": [1.0]})
+        assert fingerprint({"ids": (True,)}) != fingerprint({"ids": (1,)})
+        assert fingerprint({"ids": frozenset([True])}) != fingerprint({"ids": frozenset([1])})
+        assert fingerprint({"a": {"b": [True]}}) != fingerprint({"a": {"b": [1]}})
+
+    def test_fingerprint_unhashable(self):
+        assert fingerprint({"raw": bytearray(b"x")}) is None
+        assert fingerprint({"raw": [bytearray(b"x")]}) is None
+
+
+class TestContextTransformer(unittest.TestCase):
+    def test_interned_per_attribute_set(self):
+        transformer = ContextTransformer()
+        first = transformer.transform(EvaluationContext("key1", {"country": "ar", "roles": ["a"]}))
+        second = transformer.transform(EvaluationContext("key2", {"country": "ar", "roles": ["a"]}))
+        third = transformer.transform(EvaluationContext("key1", {"country": "us", "roles": ["a"]}))
+        assert first is second
+        assert first is not third
+        assert len(transformer) == 2
+        with self.assertRaises(TypeError):
+            first["country"] = "us"
+
+    def test_nested_item_types_not_shared(self):
+        transformer = ContextTransformer()
+        assert transformer.transform(EvaluationContext("key", {"ids": [True]})) == {"ids": ["True"]}
+        assert transformer.transform(EvaluationContext("key", {"ids": [1]})) == {"ids": ["1"]}
+        assert transformer.transform(EvaluationContext("key", {"ids": (1.0,)})) == {"ids": ["1.0"]}
+
+    def test_unhashable_values_not_interned(self):
+        transformer = ContextTransformer()
+        converted = transformer.transform(EvaluationContext("key", {"country": "ar", "raw": bytearray(b"x")}))
+        assert converted["country"] == "ar"
+        assert len(transformer) == 0
+
+    def test_bounded(self):
+        transformer = ContextTransformer(max_entries=2)
+        for i in range(5):
+            transformer.transform(EvaluationContext("key", {"i": i}))
+        assert len(transformer) == 2
+
+    def test_disabled(self):
+        transformer = ContextTransformer(max_entries=0)
+        assert transformer.transform(EvaluationContext("key", {"i": 1})) == {"i": 1}
+        assert len(transformer) == 0
+
+    def test_empty_attributes(self):
+        assert ContextTransformer().transform(EvaluationContext("key")) == {}
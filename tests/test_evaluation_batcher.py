@@ -0,0 +1,149 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+
+from split_openfeature_provider import SplitProviderAsync
+from split_openfeature_provider.evaluation_batcher import EvaluationBatcher
+
+
+class SlowFetch():
+    """Batch fetch recording the flags of each call; each call waits until `release` is set."""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def __call__(self, flag_keys):
+        self.calls.append(flag_keys)
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {flag_key: flag_key.upper() for flag_key in flag_keys if flag_key != "missing"}
+
+
+class TestEvaluationBatcher:
+    @pytest.mark.asyncio
+    async def test_same_iteration_batched(self):
+        batcher = EvaluationBatcher()
+        fetch = SlowFetch()
+        fetch.release.set()
+        flags = ["a", "b", "a", "missing"]
+        results = await asyncio.gather(*[batcher.load("user", flag, fetch) for flag in flags],
+                                       batcher.load("other", "c", fetch))
+        assert results == ["A", "B", "A", None, "C"]
+        assert sorted(fetch.calls) == [["a", "b", "missing"], ["c"]]
+        stats = batcher.stats()
+        assert stats["requests"] == 5
+        assert stats["batched"] == 3
+        assert stats["fetches"] == 2
+        assert stats["max_fetched"] == 3
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_window_collects_later_requests(self):
+        batcher = EvaluationBatcher(0.05)
+        fetch = SlowFetch()
+        fetch.release.set()
+        first = asyncio.ensure_future(batcher.load("user", "a", fetch))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(batcher.load("user", "b", fetch))
+        assert await asyncio.gather(first, second) == ["A", "B"]
+        assert fetch.calls == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_fetched_before_window(self):
+        batcher = EvaluationBatcher(10, 2)
+        fetch = SlowFetch()
+        fetch.release.set()
+        results = await asyncio.wait_for(asyncio.gather(*[batcher.load("user", flag, fetch) for flag in "ab"]), 1)
+        assert results == ["A", "B"]
+        assert batcher.stats()["full_fetches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        batcher = EvaluationBatcher()
+        fetch = SlowFetch(ValueError("sdk"))
+        fetch.release.set()
+        results = await asyncio.gather(*[batcher.load("user", flag, fetch) for flag in "ab"], return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert batcher.stats()["failed_fetches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetch_resolves_callers(self):
+        batcher = EvaluationBatcher()
+        fetch = SlowFetch(asyncio.CancelledError())
+        fetch.release.set()
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.load("user", flag, fetch) for flag in "ab"], return_exceptions=True), 1)
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        assert batcher.stats()["failed_fetches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        batcher = EvaluationBatcher()
+        fetch = SlowFetch()
+        first = asyncio.ensure_future(batcher.load("user", "a", fetch))
+        second = asyncio.ensure_future(batcher.load("user", "a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        fetch.release.set()
+        assert await second == "A"
+        assert first.cancelled()
+        assert fetch.calls == [["a"]]
+
+
+class TestProviderEvaluationBatching:
+    @pytest.mark.asyncio
+    async def test_concurrent_evaluations_share_sdk_call(self):
+        calls = []
+
+        async def get_treatments_with_config(key, flag_keys, attributes=None):
+            calls.append((key, flag_keys, attributes))
+            return {"enabled": ("on", None), "limit": ("25", '{"unit": "items"}')}
+
+        client = MagicMock()
+        client.get_treatments_with_config = get_treatments_with_config
+        provider = SplitProviderAsync({"SplitClient": client, "EvaluationBatchWindow": 0.01})
+        await provider.create()
+
+        context = EvaluationContext("key", {"plan": "gold"})
+        results = await asyncio.gather(
+            provider.resolve_boolean_details_async("enabled", False, context),
+            provider.resolve_integer_details_async("limit", 0, context),
+            provider.resolve_string_details_async("enabled", "off", context),
+            provider.resolve_string_details_async("enabled", "off", EvaluationContext("key", {"plan": "free"})))
+
+        assert [result.value for result in results] == [True, 25, "on", "on"]
+        assert results[1].flag_metadata == {"config": '{"unit": "items"}'}
+        assert sorted(flag_keys for _, flag_keys, _ in calls) == [["enabled"], ["enabled", "limit"]]
+        stats = provider.get_evaluation_batch_stats()
+        assert stats["requests"] == 4
+        assert stats["fetches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_flag_in_batch(self):
+        client = MagicMock()
+
+        async def get_treatments_with_config(key, flag_keys, attributes=None):
+            return {}
+
+        client.get_treatments_with_config = get_treatments_with_config
+        provider = SplitProviderAsync({"SplitClient": client, "EvaluationBatchWindow": 0})
+        await provider.create()
+        details = await provider.resolve_boolean_details_async("flag", False, EvaluationContext("key"))
+        assert details.value is False
+        assert details.error_code is not None
+
+    def test_disabled_by_default(self):
+        provider = SplitProviderAsync({"SplitClient": MagicMock()})
+        assert provider.get_evaluation_batch_stats() == {}
+
+    def test_invalid_context(self):
+        for options in ({"EvaluationBatchWindow": -1}, {"EvaluationBatchWindow": "0.01"},
+                        {"EvaluationBatchWindow": 0, "EvaluationBatchSize": 0}):
+            with pytest.raises(AttributeError):
+                SplitProviderAsync(dict(options, SplitClient=MagicMock()))
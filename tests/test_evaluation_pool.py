@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import GeneralError
+from split_openfeature_provider import SplitProvider
+from split_openfeature_provider.evaluation_pool import EvaluationPool
+
+
+class TestEvaluationPool:
+    def test_runs_and_counts(self):
+        pool = EvaluationPool(max_workers=2, max_queued=10)
+        assert [pool.submit(pow, 2, i).result() for i in range(4)] == [1, 2, 4, 8]
+        stats = pool.stats()
+        assert stats["workers"] == 2
+        assert stats["submitted"] == stats["completed"] == 4
+        assert stats["active"] == stats["queued"] == stats["rejected"] == stats["cancelled"] == 0
+        pool.shutdown(wait=True)
+
+    def test_rejects_when_queue_full(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        pool = EvaluationPool(max_workers=1, max_queued=2)
+        running = pool.submit(block)
+        started.wait()
+        waiting = [pool.submit(block), pool.submit(block)]
+        with pytest.raises(GeneralError):
+            pool.submit(block)
+
+        stats = pool.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == stats["max_queued"] == 2
+        assert stats["rejected"] == 1
+
+        release.set()
+        for future in [running] + waiting:
+            future.result()
+        assert pool.stats()["completed"] == 3
+        pool.shutdown(wait=True)
+
+    def test_cancelled_while_queued_frees_slot(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        pool = EvaluationPool(max_workers=1, max_queued=2)
+        running = pool.submit(block)
+        started.wait()
+        waiting = [pool.submit(block), pool.submit(block)]
+        for future in waiting:
+            assert future.cancel()
+        stats = pool.stats()
+        assert stats["queued"] == 0
+        assert stats["cancelled"] == 2
+
+        # the freed slots accept new evaluations
+        queued = pool.submit(pow, 2, 3)
+        release.set()
+        running.result()
+        assert queued.result() == 8
+        assert pool.stats()["completed"] == 2
+        pool.shutdown(wait=True)
+
+
+class TestProviderPoolCancellation:
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_do_not_saturate_pool(self):
+        release = threading.Event()
+        client = MagicMock()
+
+        def get_treatment_with_config(*_):
+            release.wait()
+            return ("on", None)
+
+        client.get_treatment_with_config.side_effect = get_treatment_with_config
+        provider = SplitProvider({"SplitClient": client, "AsyncPoolSize": 1, "AsyncQueueSize": 5})
+        context = EvaluationContext("key")
+
+        running = asyncio.ensure_future(provider.resolve_boolean_details_async("flag", False, context))
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(provider.resolve_boolean_details_async("flag", False, context), 0.01)
+        assert provider.get_pool_stats()["queued"] == 0
+
+        release.set()
+        assert (await running).value is True
+        assert (await provider.resolve_boolean_details_async("flag", False, context)).value is True
+        assert provider.get_pool_stats()["cancelled"] == 5
+        provider.shutdown()
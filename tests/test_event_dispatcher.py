@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from openfeature.event import ProviderEvent, ProviderEventDetails
+from split_openfeature_provider import SplitProvider
+from split_openfeature_provider.event_dispatcher import EventDispatcher
+
+
+class TestEventDispatcher(unittest.TestCase):
+    def test_updates_merged_within_window(self):
+        dispatcher = EventDispatcher(0.2)
+        delivered = []
+        for names in (["a"], ["b", "a"], ["c"]):
+            dispatcher.dispatch_update(delivered.append, ProviderEventDetails(flags_changed=names, metadata={"n": 1}))
+        dispatcher.stop()
+        assert len(delivered) == 1
+        assert delivered[0].flags_changed == ["a", "b", "c"]
+        assert delivered[0].metadata == {"n": 1, "coalesced_events": 3}
+        stats = dispatcher.stats()
+        assert stats["received"] == 3
+        assert stats["delivered"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["max_depth"] >= 1
+
+    def test_update_without_names(self):
+        dispatcher = EventDispatcher(0.2)
+        delivered = []
+        dispatcher.dispatch_update(delivered.append, ProviderEventDetails(flags_changed=["a"]))
+        dispatcher.dispatch_update(delivered.append, ProviderEventDetails(flags_changed=[]))
+        dispatcher.stop()
+        assert delivered[0].flags_changed == []
+
+    def test_order_kept_around_other_events(self):
+        dispatcher = EventDispatcher(0.2)
+        delivered = []
+        dispatcher.dispatch_update(lambda details: delivered.append(("update", details.flags_changed)),
+                                   ProviderEventDetails(flags_changed=["a"]))
+        dispatcher.dispatch(lambda details: delivered.append(("error", details.message)),
+                            ProviderEventDetails(message="boom"))
+        dispatcher.dispatch_update(lambda details: delivered.append(("update", details.flags_changed)),
+                                   ProviderEventDetails(flags_changed=["b"]))
+        dispatcher.stop()
+        assert delivered == [("update", ["a"]), ("error", "boom"), ("update", ["b"])]
+
+    def test_slow_handler_does_not_block(self):
+        dispatcher = EventDispatcher()
+        release = threading.Event()
+        delivered = []
+        def slow(details):
+            release.wait(5)
+            delivered.append(details)
+        start = time.monotonic()
+        for _ in range(3):
+            dispatcher.dispatch(slow, ProviderEventDetails())
+        assert time.monotonic() - start < 1
+        release.set()
+        dispatcher.stop()
+        assert len(delivered) == 3
+        assert dispatcher.stats()["max_lag_ms"] > 0
+
+    def test_handler_error_isolated(self):
+        dispatcher = EventDispatcher()
+        delivered = []
+        dispatcher.dispatch(MagicMock(side_effect=ValueError("handler")), ProviderEventDetails())
+        dispatcher.dispatch(delivered.append, ProviderEventDetails())
+        dispatcher.stop()
+        assert len(delivered) == 1
+
+    def test_restart_after_stop(self):
+        dispatcher = EventDispatcher()
+        delivered = []
+        dispatcher.stop()
+        dispatcher.dispatch(delivered.append, ProviderEventDetails(message="dropped"))
+        dispatcher.restart()
+        dispatcher.dispatch(delivered.append, ProviderEventDetails(message="delivered"))
+        dispatcher.stop()
+        assert [details.message for details in delivered] == ["delivered"]
+
+
+class TestProviderEventDispatch(unittest.TestCase):
+    def test_configuration_changed_coalesced(self):
+        client = MagicMock()
+        provider = SplitProvider({"SplitClient": client, "EventCoalesceWindow": 0.2, "ResultCacheSize": 10})
+        events = []
+        provider.attach(lambda _, event, details: events.append((event, details)))
+        client.get_treatment_with_config.return_value = ("on", None)
+        provider.resolve_boolean_details("flag_a", False, MagicMock(targeting_key="key", attributes={}))
+
+        provider._handle_flags_update("SDK_UPDATE", {"names": ["flag_a"]})
+        provider._handle_flags_update("SDK_UPDATE", {"names": ["flag_b"]})
+        # caches are invalidated right away, before the merged event is emitted
+        assert provider.get_result_cache_stats()["entries"] == 0
+        provider.shutdown()
+
+        assert len(events) == 1
+        assert events[0][0] == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED
+        assert events[0][1].flags_changed == ["flag_a", "flag_b"]
+        assert provider.get_event_dispatch_stats()["coalesced"] == 1
+
+    def test_inline_without_window(self):
+        provider = SplitProvider({"SplitClient": MagicMock()})
+        events = []
+        provider.attach(lambda _, event, details: events.append(details))
+        provider._handle_flags_update("SDK_UPDATE", {"names": ["flag_a"]})
+        assert len(events) == 1
+        assert provider.get_event_dispatch_stats() == {}
+
+    def test_events_delivered_after_reinitialize(self):
+        client = MagicMock()
+        provider = SplitProvider({"SplitClient": client, "EventCoalesceWindow": 0})
+        events = []
+        provider.attach(lambda _, event, details: events.append(details.flags_changed))
+        provider.shutdown()
+        # set again after a shutdown, as api.set_provider does
+        provider.initialize(MagicMock())
+        provider._handle_flags_update("SDK_UPDATE", {"names": ["flag_a"]})
+        provider.shutdown()
+        assert events == [["flag_a"]]
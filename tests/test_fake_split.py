@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent
+from openfeature.exception import ErrorCode
+from openfeature.flag_evaluation import Reason
+
+from split_openfeature_provider import SplitProvider, SplitProviderAsync
+from split_openfeature_provider.fake_split import FakeSplitFactory, FakeFlag, FakeRule, CONTROL
+
+FLAGS = [
+    FakeFlag("my_feature", default_treatment="off", keys={"vip": "on"},
+             rules=[FakeRule("on", attributes={"plan": ["gold", "platinum"]}),
+                    FakeRule("beta", segment="testers")],
+             configs={"on": {"color": "red"}}),
+    FakeFlag("rollout_feature", rollout={"on": 50}),
+    FakeFlag("int_feature", default_treatment="32"),
+]
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not predicate():
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestFakeSplitClient:
+    def test_evaluation_order(self):
+        client = FakeSplitFactory(FLAGS, segments={"testers": ["tester"]}).client()
+        assert client.get_treatment_with_config("vip", "my_feature") == ("on", json.dumps({"color": "red"}))
+        assert client.get_treatment("key", "my_feature", {"plan": "gold"}) == "on"
+        assert client.get_treatment("tester", "my_feature") == "beta"
+        assert client.get_treatment_with_config("key", "my_feature", {"plan": "free"}) == ("off", None)
+        assert client.get_treatment("key", "missing") == CONTROL
+
+    def test_rollout_deterministic(self):
+        client = FakeSplitFactory(FLAGS).client()
+        treatments = [client.get_treatment("user-%d" % i, "rollout_feature") for i in range(1000)]
+        assert treatments == [client.get_treatment("user-%d" % i, "rollout_feature") for i in range(1000)]
+        assert 400 < treatments.count("on") < 600
+        assert set(treatments) == {"on", "off"}
+
+    def test_killed_and_not_ready(self):
+        factory = FakeSplitFactory([FakeFlag("killed", default_treatment="off", rollout={"on": 100}, killed=True)],
+                                   ready=False)
+        assert factory.client().get_treatment("key", "killed") == CONTROL
+        with pytest.raises(Exception):
+            factory.block_until_ready(0.01)
+        factory.set_ready()
+        assert factory.client().get_treatment("key", "killed") == "off"
+
+    def test_flag_set(self):
+        client = FakeSplitFactory(FLAGS + [FakeFlag("set_feature", default_treatment="on", sets=["checkout"])]).client()
+        assert client.get_treatments_with_config_by_flag_set("key", "checkout") == {"set_feature": ("on", None)}
+        assert client.get_treatments_with_config_by_flag_set("key", "search") == {}
+
+    def test_evaluation_cost(self):
+        factory = FakeSplitFactory(FLAGS, evaluation_cost=0.001)
+        start = time.perf_counter()
+        factory.client().get_treatments_with_config("key", ["my_feature", "int_feature"])
+        assert time.perf_counter() - start >= 0.002
+        assert factory.evaluations == 2
+
+
+class TestFakeSplitProvider:
+    def test_provider_evaluates_fake_flags(self):
+        factory = FakeSplitFactory(FLAGS)
+        provider = SplitProvider({"SplitClient": factory.client()})
+        details = provider.resolve_string_details("my_feature", "default", EvaluationContext("vip"))
+        assert details.value == "on"
+        assert details.flag_metadata["config"] == json.dumps({"color": "red"})
+        assert provider.resolve_integer_details("int_feature", 0, EvaluationContext("key")).value == 32
+        details = provider.resolve_string_details("missing", "default", EvaluationContext("key"))
+        assert details.error_code == ErrorCode.FLAG_NOT_FOUND
+
+    def test_ready_and_update_events(self):
+        factory = FakeSplitFactory(FLAGS, ready=False)
+        provider = SplitProvider({"SplitClient": factory.client()})
+        events = []
+        provider.attach(lambda _, event, details: events.append((event, details)))
+        assert provider.resolve_integer_details("int_feature", 0, EvaluationContext("key")).error_code == \
+            ErrorCode.PROVIDER_NOT_READY
+
+        factory.set_ready()
+        assert _wait_for(lambda: any(event == ProviderEvent.PROVIDER_READY for event, _ in events))
+        factory.update_flags(FakeFlag("int_feature", default_treatment="64"))
+        assert _wait_for(lambda: any(event == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED for event, _ in events))
+        changed = [details for event, details in events if event == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED]
+        assert changed[0].flags_changed == ["int_feature"]
+        details = provider.resolve_integer_details("int_feature", 0, EvaluationContext("key"))
+        assert details.value == 64
+        assert details.reason == Reason.TARGETING_MATCH
+        provider.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_async_provider(self):
+        factory = FakeSplitFactory(FLAGS, asyncio_mode=True)
+        provider = SplitProviderAsync({"SplitClient": factory.client()})
+        events = []
+        provider.attach(lambda _, event, details: events.append((event, details)))
+        await provider.create()
+        details = await provider.resolve_string_details_async("my_feature", "default",
+                                                              EvaluationContext("key", {"plan": "gold"}))
+        assert details.value == "on"
+
+        factory.remove_flags("my_feature")
+        for _ in range(10):
+            if any(event == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED for event, _ in events):
+                break
+            await asyncio.sleep(0.01)
+        changed = [details for event, details in events if event == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED]
+        assert changed and changed[0].flags_changed == ["my_feature"]
+        details = await provider.resolve_string_details_async("my_feature", "default", EvaluationContext("key"))
+        assert details.error_code == ErrorCode.FLAG_NOT_FOUND
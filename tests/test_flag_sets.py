@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import ErrorCode
+from splitio.models import splits
+from split_openfeature_provider import SplitProvider, SplitProviderAsync
+
+
+def _flag(name, treatment, sets):
+    return {
+        "name": name, "trafficTypeName": "user", "changeNumber": 1, "seed": 1, "trafficAllocation": 100,
+        "trafficAllocationSeed": 1, "status": "ACTIVE", "killed": False, "defaultTreatment": treatment, "algo": 2,
+        "sets": sets, "conditions": [{
+            "conditionType": "ROLLOUT", "label": "default rule",
+            "matcherGroup": {"combiner": "AND", "matchers": [{"matcherType": "ALL_KEYS", "negate": False}]},
+            "partitions": [{"treatment": treatment, "size": 100}],
+        }],
+    }
+
+
+FLAGS = [_flag("checkout_button", "on", ["checkout"]), _flag("checkout_limit", "25", ["checkout"]),
+         _flag("search_ranking", "v2", ["search"])]
+
+
+class TestFlagSets(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "split.json")
+        with open(self.path, "w") as output:
+            json.dump({"ff": {"d": FLAGS, "s": -1, "t": 1}, "rbs": {"d": [], "s": -1, "t": -1}}, output)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _provider(self, flag_sets):
+        provider = SplitProvider({"LocalFile": self.path, "FlagSets": flag_sets, "ReadyBlockTime": 5})
+        provider.initialize(EvaluationContext())
+        return provider
+
+    def test_invalid_context(self):
+        for flag_sets in ([], "checkout", [""], [1]):
+            with self.assertRaises(AttributeError):
+                SplitProvider({"SdkKey": "key", "FlagSets": flag_sets})
+
+    def test_flags_outside_sets_fail_fast(self):
+        provider = self._provider(["Checkout"])
+        assert provider._split_client_wrapper._config["flagSetsFilter"] == ["checkout"]
+        assert provider.resolve_boolean_details("checkout_button", False, EvaluationContext("key")).value is True
+
+        client = provider._split_client_wrapper.split_client
+        provider._split_client_wrapper.split_client = MagicMock(wraps=client)
+        details = provider.resolve_string_details("search_ranking", "v1", EvaluationContext("key"))
+        assert details.value == "v1"
+        assert details.error_code == ErrorCode.FLAG_NOT_FOUND
+        provider._split_client_wrapper.split_client.get_treatment_with_config.assert_not_called()
+
+        results = provider.resolve_bulk_details({"checkout_limit": 0, "search_ranking": "v1"}, EvaluationContext("key"))
+        assert results["checkout_limit"].value == 25
+        assert results["search_ranking"].error_code == ErrorCode.FLAG_NOT_FOUND
+        provider._split_client_wrapper.split_client.get_treatments_with_config.assert_called_once_with(
+            "key", ["checkout_limit"], {})
+        provider._split_client_wrapper.destroy()
+
+    def test_resolve_flag_set(self):
+        provider = self._provider(["checkout"])
+        results = provider.resolve_flag_set_details("checkout", EvaluationContext("key"), {"checkout_limit": 0})
+        assert results["checkout_button"].value == "on"
+        assert results["checkout_limit"].value == 25
+        assert set(results) == {"checkout_button", "checkout_limit"}
+        assert provider.resolve_flag_set_details("search", EvaluationContext("key")) == {}
+        provider._split_client_wrapper.destroy()
+
+    def test_sets_follow_updates(self):
+        provider = self._provider(["checkout"])
+        wrapper = provider._split_client_wrapper
+        assert not wrapper.in_flag_sets("checkout_banner")
+        wrapper._factory._storages["splits"].update([splits.from_raw(_flag("checkout_banner", "on", ["checkout"]))],
+                                                    [], 2)
+        wrapper._on_sdk_update(None)
+        assert wrapper.in_flag_sets("checkout_banner")
+        wrapper.destroy()
+
+
+class TestFlagSetsMockClient:
+    def _client(self):
+        client = MagicMock()
+        client._factory._storages = {"splits": MagicMock()}
+        client._factory._storages["splits"].get_feature_flags_by_sets.return_value = ["checkout_button"]
+        client.get_treatments_with_config_by_flag_set.return_value = {"checkout_button": ("on", None)}
+        return client
+
+    def test_split_client_sets(self):
+        client = self._client()
+        provider = SplitProvider({"SplitClient": client, "FlagSets": ["checkout"]})
+        client._factory._storages["splits"].get_feature_flags_by_sets.assert_called_once_with(["checkout"])
+        details = provider.resolve_boolean_details("other_flag", False, EvaluationContext("key"))
+        assert details.error_code == ErrorCode.FLAG_NOT_FOUND
+        client.get_treatment_with_config.assert_not_called()
+
+        results = provider.resolve_flag_set_details("checkout", EvaluationContext("key"), {"checkout_button": False})
+        assert results["checkout_button"].value is True
+        client.get_treatments_with_config_by_flag_set.assert_called_once_with("key", "checkout", {})
+
+    def test_without_flag_sets(self):
+        client = self._client()
+        provider = SplitProvider({"SplitClient": client})
+        client.get_treatment_with_config.return_value = ("on", None)
+        assert provider.resolve_boolean_details("other_flag", False, EvaluationContext("key")).value is True
+        provider.resolve_flag_set_details("any", EvaluationContext("key"))
+        client.get_treatments_with_config_by_flag_set.assert_called_once_with("key", "any", {})
+
+    @pytest.mark.asyncio
+    async def test_async_provider(self):
+        client = MagicMock()
+        client._factory._storages = {"splits": MagicMock()}
+        client._factory._storages["splits"].get_feature_flags_by_sets = AsyncMock(return_value=["checkout_button"])
+        client.get_treatments_with_config_by_flag_set = AsyncMock(return_value={"checkout_button": ("on", None)})
+        client.get_treatment_with_config = AsyncMock(return_value=("on", None))
+        provider = SplitProviderAsync({"SplitClient": client, "FlagSets": ["checkout"]})
+        await provider.create()
+
+        details = await provider.resolve_boolean_details_async("other_flag", False, EvaluationContext("key"))
+        assert details.error_code == ErrorCode.FLAG_NOT_FOUND
+        client.get_treatment_with_config.assert_not_called()
+        results = await provider.resolve_flag_set_details_async("checkout", EvaluationContext("key"))
+        assert results["checkout_button"].value == "on"
@@ -0,0 +1,258 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import Reason
+from splitio import get_factory
+from split_openfeature_provider import SplitProvider
+from split_openfeature_provider import worker_recorder
+from split_openfeature_provider.flag_snapshot import collect_snapshot, write_snapshot, snapshot_config, has_snapshot, \
+    SnapshotWriter, SNAPSHOT_FLAGS_FILE, SNAPSHOT_SEGMENTS_DIR
+from split_openfeature_provider.split_client_wrapper import sdk_version
+
+BETA_FLAG = {
+    "name": "beta_feature", "trafficTypeName": "user", "changeNumber": 10, "seed": 1, "trafficAllocation": 100,
+    "trafficAllocationSeed": 1, "status": "ACTIVE", "killed": False, "defaultTreatment": "off", "algo": 2,
+    "conditions": [{
+        "conditionType": "ROLLOUT", "label": "in segment beta",
+        "matcherGroup": {"combiner": "AND", "matchers": [
+            {"matcherType": "IN_SEGMENT", "negate": False, "userDefinedSegmentMatcherData": {"segmentName": "beta"}}]},
+        "partitions": [{"treatment": "on", "size": 100}],
+    }],
+}
+BETA_SEGMENT = {"name": "beta", "added": ["tester"], "removed": [], "since": 5, "till": 5}
+
+
+class TestFlagSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _wait_for_snapshot(self):
+        # the snapshot is published by the SDK_READY handler, off the initializing thread
+        deadline = time.time() + 5
+        while not has_snapshot(self.directory) and time.time() < deadline:
+            time.sleep(0.01)
+        return has_snapshot(self.directory)
+
+    def _factory(self, config):
+        factory = get_factory("localhost", config=config)
+        factory.block_until_ready(5)
+        return factory
+
+    def test_round_trip(self):
+        source = self._factory({"splitFile": "split.yaml"})
+        changes, segments = collect_snapshot(source._storages)
+        write_snapshot(self.directory, changes, segments)
+        assert has_snapshot(self.directory)
+
+        restored = self._factory(snapshot_config(self.directory))
+        for flag in ("my_feature", "int_feature", "obj_feature"):
+            for key in ("key", "other"):
+                assert restored.client().get_treatment_with_config(key, flag) == \
+                    source.client().get_treatment_with_config(key, flag)
+        source.destroy()
+        restored.destroy()
+
+    def test_round_trip_segments(self):
+        os.makedirs(os.path.join(self.directory, SNAPSHOT_SEGMENTS_DIR))
+        with open(os.path.join(self.directory, SNAPSHOT_FLAGS_FILE), "w") as output:
+            json.dump({"ff": {"d": [BETA_FLAG], "s": 10, "t": 10}, "rbs": {"d": [], "s": -1, "t": -1}}, output)
+        with open(os.path.join(self.directory, SNAPSHOT_SEGMENTS_DIR, "beta.json"), "w") as output:
+            json.dump(BETA_SEGMENT, output)
+
+        factory = self._factory(snapshot_config(self.directory))
+        changes, segments = collect_snapshot(factory._storages)
+        factory.destroy()
+        assert segments == {"beta": BETA_SEGMENT}
+        assert changes["ff"]["t"] == 10
+        assert [flag["name"] for flag in changes["ff"]["d"]] == ["beta_feature"]
+
+    def test_writer_replaces_changed_segments_only(self):
+        changes = {"ff": {"d": [BETA_FLAG], "s": 10, "t": 10}, "rbs": {"d": [], "s": -1, "t": -1}}
+        gamma = dict(BETA_SEGMENT, name="gamma")
+        writer = SnapshotWriter(self.directory)
+        assert writer.write(changes, {"beta": BETA_SEGMENT, "gamma": gamma})
+
+        def identity(name):
+            stat = os.stat(os.path.join(self.directory, SNAPSHOT_SEGMENTS_DIR, "%s.json" % name))
+            return stat.st_ino, stat.st_mtime_ns
+
+        beta = identity("beta")
+        assert not writer.write(changes, {"beta": BETA_SEGMENT, "gamma": gamma})
+        # gamma changed, beta did not; a segment dropped from the snapshot loses its file
+        assert writer.write(changes, {"beta": BETA_SEGMENT,
+                                      "delta": dict(gamma, name="delta", added=["a", "b"], till=6)})
+        assert identity("beta") == beta
+        assert sorted(os.listdir(os.path.join(self.directory, SNAPSHOT_SEGMENTS_DIR))) == ["beta.json", "delta.json"]
+
+    def test_concurrent_writers_do_not_collide(self):
+        changes = {"ff": {"d": [BETA_FLAG], "s": 10, "t": 10}, "rbs": {"d": [], "s": -1, "t": -1}}
+        errors = []
+
+        def write():
+            try:
+                for _ in range(20):
+                    SnapshotWriter(self.directory).write(changes, {"beta": BETA_SEGMENT})
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert sorted(os.listdir(self.directory)) == [SNAPSHOT_FLAGS_FILE, SNAPSHOT_SEGMENTS_DIR]
+        with open(os.path.join(self.directory, SNAPSHOT_FLAGS_FILE)) as snapshot:
+            assert json.load(snapshot) == changes
+
+    def test_scheduled_writes_run_off_the_caller_thread(self):
+        threads = []
+        changes = {"ff": {"d": [BETA_FLAG], "s": 10, "t": 10}, "rbs": {"d": [], "s": -1, "t": -1}}
+
+        def collect():
+            threads.append(threading.current_thread())
+            return changes, {"beta": BETA_SEGMENT}
+
+        writer = SnapshotWriter(self.directory)
+        writer.schedule(collect)
+        writer.stop()
+        assert has_snapshot(self.directory)
+        assert threads and threads[0] is not threading.current_thread()
+        writer.schedule(collect)
+        assert len(threads) == 1
+
+    def test_warm_start_from_snapshot(self):
+        source = self._factory({"splitFile": "split.yaml"})
+        write_snapshot(self.directory, *collect_snapshot(source._storages))
+        source.destroy()
+
+        # the live factory never becomes ready, evaluations are served from the snapshot
+        provider = SplitProvider({"SdkKey": "api", "ReadyBlockTime": 0.1, "SnapshotDirectory": self.directory})
+        provider.initialize(EvaluationContext())
+        details = provider.resolve_boolean_details("my_feature", False, EvaluationContext("key"))
+        assert details.value
+        assert details.reason == Reason.CACHED
+        assert details.flag_metadata["source"] == "snapshot"
+        results = provider.resolve_bulk_details({"int_feature": 0}, EvaluationContext("key"))
+        assert results["int_feature"].value == 32
+        assert results["int_feature"].flag_metadata["source"] == "snapshot"
+        provider._split_client_wrapper.destroy()
+        assert provider._split_client_wrapper.snapshot_client is None
+
+    def test_snapshot_written_when_ready(self):
+        provider = SplitProvider({"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"},
+                                  "ReadyBlockTime": 5, "SnapshotDirectory": self.directory})
+        provider.initialize(EvaluationContext())
+        details = provider.resolve_boolean_details("my_feature", False, EvaluationContext("key"))
+        assert details.reason == Reason.TARGETING_MATCH
+        assert "source" not in details.flag_metadata
+        provider._split_client_wrapper.destroy()
+
+        with open(os.path.join(self.directory, SNAPSHOT_FLAGS_FILE)) as snapshot:
+            flags = {flag["name"] for flag in json.load(snapshot)["ff"]["d"]}
+        assert "my_feature" in flags
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    @unittest.skipUnless(sdk_version() in worker_recorder.TESTED_SDK_VERSIONS, "untested Split SDK version")
+    def test_prefork_worker_records_impressions_and_events(self):
+        provider = SplitProvider({"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"},
+                                  "ReadyBlockTime": 5, "SnapshotDirectory": self.directory, "PreforkMode": True,
+                                  "TrackFlushInterval": 60})
+        provider.initialize(EvaluationContext())
+        assert self._wait_for_snapshot()
+        wrapper = provider._split_client_wrapper
+        # the worker of a provider configured with a real SDK key
+        wrapper._api_key = "worker-recorder-test-sdk-key"
+        wrapper._config = {"impressionsMode": "debug", "impressionsRefreshRate": 3600, "eventsPushRate": 3600}
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            report = {}
+            try:
+                details = provider.resolve_integer_details("int_feature", 0, EvaluationContext("key"))
+                report["source"] = details.flag_metadata.get("source")
+                report["tracked"] = provider.track("checkout", EvaluationContext("key"))
+                provider._track_queue.flush()
+                report["sent"] = provider.get_track_stats()["sent"]
+                worker_recorder = wrapper._worker_recorder
+                report["impressions"] = [[impression.matching_key, impression.feature_name]
+                                         for impression in worker_recorder._impression_storage.pop_many(10)]
+                report["events"] = [[event.key, event.event_type_id]
+                                    for event in worker_recorder._event_storage.pop_many(10)]
+            finally:
+                os.write(write_fd, json.dumps(report).encode())
+                os._exit(0)
+
+        os.waitpid(pid, 0)
+        report = json.loads(os.read(read_fd, 65536))
+        wrapper.destroy()
+
+        assert report == {"source": "snapshot", "tracked": True, "sent": 1,
+                          "impressions": [["key", "int_feature"]], "events": [["key", "checkout"]]}
+
+    def test_worker_recorder_refuses_untested_sdk(self):
+        with patch.object(worker_recorder, "TESTED_SDK_VERSIONS", ()):
+            with self.assertRaises(RuntimeError):
+                worker_recorder.WorkerRecorder("worker-recorder-test-sdk-key")
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_prefork_workers_follow_published_snapshot(self):
+        provider = SplitProvider({"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"},
+                                  "ReadyBlockTime": 5, "SnapshotDirectory": self.directory, "PreforkMode": True,
+                                  "SnapshotPollInterval": 0.02})
+        provider.initialize(EvaluationContext())
+        assert self._wait_for_snapshot()
+
+        read_fd, write_fd = os.pipe()
+        go_read, go_write = os.pipe()
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            report = {}
+            try:
+                events = []
+                receiver = type("Receiver", (), {"_on_split_event": lambda _, event, meta: events.append(meta)})()
+                provider._split_client_wrapper.set_event_receiver(receiver)
+                details = provider.resolve_integer_details("int_feature", 0, EvaluationContext("key"))
+                report["before"] = [details.value, details.flag_metadata.get("source")]
+                os.write(ready_write, b"x")
+                os.read(go_read, 1)
+                deadline = time.time() + 5
+                while time.time() < deadline:
+                    details = provider.resolve_integer_details("int_feature", 0, EvaluationContext("key"))
+                    if details.value != report["before"][0]:
+                        break
+                    time.sleep(0.01)
+                report["after"] = details.value
+                report["events"] = events
+            finally:
+                os.write(write_fd, json.dumps(report).encode())
+                os._exit(0)
+
+        # the parent publishes an update after the fork
+        os.read(ready_read, 1)
+        changes, segments = collect_snapshot(provider._split_client_wrapper._factory._storages)
+        for flag in changes["ff"]["d"]:
+            if flag["name"] == "int_feature":
+                flag["changeNumber"] += 1
+                flag["conditions"][-1]["partitions"] = [{"treatment": "64", "size": 100}]
+        write_snapshot(self.directory, changes, segments)
+        os.write(go_write, b"x")
+        os.waitpid(pid, 0)
+        report = json.loads(os.read(read_fd, 65536))
+        provider._split_client_wrapper.destroy()
+
+        assert report["before"] == [32, "snapshot"]
+        assert report["after"] == 64
+        assert report["events"] == [{"names": ["int_feature"]}]
@@ -0,0 +1,67 @@
+import copy
+import pickle
+import pytest
+import unittest
+from unittest.mock import MagicMock
+
+from split_openfeature_provider.json_cache import ParsedJsonCache, ImmutableList, freeze
+
+
+class TestParsedJsonCache(unittest.TestCase):
+    def test_parse_once(self):
+        decoder = MagicMock(side_effect=lambda text: {"list": [1, 2], "struct": {"foo": "bar"}})
+        cache = ParsedJsonCache(decoder)
+        first = cache.get("flag", '{"a": 1}')
+        second = cache.get("flag", '{"a": 1}')
+        assert first is second
+        assert decoder.call_count == 1
+        assert first == {"list": [1, 2], "struct": {"foo": "bar"}}
+
+    def test_frozen_values(self):
+        value = freeze({"list": [1, {"x": 1}], "struct": {"foo": "bar"}})
+        with self.assertRaises(TypeError):
+            value["new"] = 1
+        with self.assertRaises(TypeError):
+            value["list"].append(3)
+        with self.assertRaises(TypeError):
+            value["list"][1]["x"] = 2
+        with self.assertRaises(TypeError):
+            value["struct"].update({"foo": "baz"})
+        assert isinstance(value["list"], ImmutableList)
+        assert value["list"] == [1, {"x": 1}]
+
+    def test_copies_are_plain_and_mutable(self):
+        value = freeze({"list": [1, {"x": 1}], "struct": {"foo": "bar"}})
+        for duplicate in (copy.deepcopy(value), pickle.loads(pickle.dumps(value))):
+            assert duplicate == value
+            assert type(duplicate) is dict
+            assert type(duplicate["list"]) is list
+            assert type(duplicate["list"][1]) is dict
+            duplicate["list"][1]["x"] = 2
+            duplicate["new"] = 1
+        shallow = copy.copy(value)
+        shallow["new"] = 1
+        assert type(shallow) is dict
+        assert type(copy.copy(value["list"])) is list
+        assert value == {"list": [1, {"x": 1}], "struct": {"foo": "bar"}}
+
+    def test_invalidate_flags(self):
+        cache = ParsedJsonCache()
+        cache.get("flag_a", '{"a": 1}')
+        cache.get("flag_b", '{"b": 1}')
+        cache.invalidate(["flag_a"])
+        assert len(cache) == 1
+        cache.invalidate(None)
+        assert len(cache) == 0
+
+    def test_decode_error_not_cached(self):
+        cache = ParsedJsonCache()
+        with self.assertRaises(ValueError):
+            cache.get("flag", "not json")
+        assert len(cache) == 0
+
+    def test_bounded_per_flag(self):
+        cache = ParsedJsonCache(max_entries_per_flag=2)
+        for i in range(5):
+            cache.get("flag", str(i))
+        assert len(cache) <= 2
@@ -0,0 +1,62 @@
+import logging
+import unittest
+
+from split_openfeature_provider.latency_recorder import LatencyRecorder, STAGE_SDK, STAGE_READY, STAGE_TOTAL
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def test_histograms(self):
+        recorder = LatencyRecorder()
+        recorder.record("flag", [(STAGE_READY, 500), (STAGE_SDK, 3000000)])
+        recorder.record("flag", [(STAGE_READY, 1500), (STAGE_SDK, 1000000)])
+        snapshot = recorder.snapshot()
+        assert snapshot["flag"][STAGE_READY]["count"] == 2
+        assert snapshot["flag"][STAGE_READY]["buckets_us"]["1"] == 1
+        assert snapshot["flag"][STAGE_READY]["buckets_us"]["2"] == 1
+        assert snapshot["flag"][STAGE_SDK]["sum_ms"] == 4.0
+        assert snapshot["flag"][STAGE_SDK]["max_ms"] == 3.0
+        assert snapshot["flag"][STAGE_TOTAL]["count"] == 2
+
+        recorder.reset()
+        assert recorder.snapshot() == {}
+
+    def test_overflow_bucket(self):
+        recorder = LatencyRecorder()
+        recorder.record("flag", [(STAGE_SDK, 10 ** 10)])
+        assert recorder.snapshot()["flag"][STAGE_SDK]["buckets_us"]["+Inf"] == 1
+
+    def test_slow_evaluation_logged(self):
+        recorder = LatencyRecorder(slow_threshold_ms=1)
+        with self.assertLogs("split_openfeature_provider.latency_recorder", level=logging.WARNING) as logs:
+            recorder.record("fast_flag", [(STAGE_SDK, 1000)])
+            recorder.record("slow_flag", [(STAGE_READY, 1000), (STAGE_SDK, 5000000)])
+        assert len(logs.output) == 1
+        assert "slow_flag" in logs.output[0]
+        assert STAGE_SDK in logs.output[0]
+
+    def test_timer(self):
+        recorder = LatencyRecorder()
+        timer = recorder.start("flag")
+        timer.mark(STAGE_READY)
+        timer.mark(STAGE_SDK)
+        timer.stop()
+        snapshot = recorder.snapshot()["flag"]
+        assert set(snapshot) == {STAGE_READY, STAGE_SDK, STAGE_TOTAL}
+
+    def test_timer_total_covers_early_exit(self):
+        recorder = LatencyRecorder(slow_threshold_ms=0)
+        timer = recorder.start("flag")
+        timer.mark(STAGE_READY)
+        with self.assertLogs("split_openfeature_provider.latency_recorder", level=logging.WARNING):
+            timer.stop()
+            recorder.start("flag").stop()
+        snapshot = recorder.snapshot()["flag"]
+        assert snapshot[STAGE_READY]["count"] == 1
+        assert snapshot[STAGE_TOTAL]["count"] == 2
+
+    def test_total_recorded_as_given(self):
+        recorder = LatencyRecorder()
+        recorder.record("flag", [(STAGE_READY, 1000)], 3000000)
+        snapshot = recorder.snapshot()["flag"]
+        assert snapshot[STAGE_READY]["sum_ms"] == 0.001
+        assert snapshot[STAGE_TOTAL]["sum_ms"] == 3.0
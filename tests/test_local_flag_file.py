@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent
+from split_openfeature_provider import SplitProvider
+from split_openfeature_provider import local_flag_file
+from split_openfeature_provider.local_flag_file import LocalFlagFile, check_sdk_internals
+
+YAML_FLAGS = """# local flags
+- my_feature:
+    treatment: "on"
+    keys: "key"
+- my_feature:
+    treatment: "off"
+- int_feature:
+    treatment: "32"
+- other_feature:
+    treatment: "off"
+"""
+
+
+def _json_flag(name, treatment, change_number=1):
+    return {
+        "name": name, "trafficTypeName": "user", "changeNumber": change_number, "seed": 1, "trafficAllocation": 100,
+        "trafficAllocationSeed": 1, "status": "ACTIVE", "killed": False, "defaultTreatment": treatment, "algo": 2,
+        "conditions": [{
+            "conditionType": "ROLLOUT", "label": "default rule",
+            "matcherGroup": {"combiner": "AND", "matchers": [{"matcherType": "ALL_KEYS", "negate": False}]},
+            "partitions": [{"treatment": treatment, "size": 100}],
+        }],
+    }
+
+
+class TestLocalFlagFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as output:
+            output.write(content)
+        # make sure the stat version changes even on coarse mtime resolution
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1000))
+        return path
+
+    def _write_json(self, flags, rule_based=None):
+        return self._write("split.json", json.dumps({"ff": {"d": flags, "s": -1, "t": 1},
+                                                     "rbs": rule_based or {"d": [], "s": -1, "t": -1}}))
+
+    def test_yaml_unchanged(self):
+        flag_file = LocalFlagFile(self._write("split.yaml", YAML_FLAGS))
+        flag_file.prime()
+        assert flag_file.reload() is None
+        self._write("split.yaml", YAML_FLAGS)
+        assert flag_file.reload() is None
+
+    def test_yaml_only_changed_flags(self):
+        flag_file = LocalFlagFile(self._write("split.yaml", YAML_FLAGS))
+        flag_file.prime()
+        self._write("split.yaml", YAML_FLAGS.replace('treatment: "32"', 'treatment: "64"'))
+        changes = flag_file.reload()
+        assert changes.names == ["int_feature"]
+        assert changes.to_add[0].conditions[-1].partitions[0].treatment == "64"
+
+    def test_yaml_whitelist_item_reloads_whole_flag(self):
+        flag_file = LocalFlagFile(self._write("split.yaml", YAML_FLAGS))
+        flag_file.prime()
+        self._write("split.yaml", YAML_FLAGS.replace('keys: "key"', 'keys: ["key", "other"]'))
+        changes = flag_file.reload()
+        assert changes.names == ["my_feature"]
+        assert [condition.partitions[0].treatment for condition in changes.to_add[0].conditions] == ["on", "off"]
+
+    def test_yaml_removed_flag(self):
+        flag_file = LocalFlagFile(self._write("split.yaml", YAML_FLAGS))
+        flag_file.prime()
+        self._write("split.yaml", YAML_FLAGS.replace('- other_feature:\n    treatment: "off"\n', ""))
+        changes = flag_file.reload()
+        assert changes.to_add == []
+        assert changes.to_delete == ["other_feature"]
+
+    def test_yaml_not_a_plain_list(self):
+        flag_file = LocalFlagFile(self._write("split.yaml", "[{a_feature: {treatment: 'on'}}]\n"))
+        flag_file.prime()
+        self._write("split.yaml", "[{a_feature: {treatment: 'off'}}]\n")
+        changes = flag_file.reload()
+        assert changes.names == ["a_feature"]
+
+    def test_json_only_changed_flags(self):
+        path = self._write_json([_json_flag("flag_a", "on"), _json_flag("flag_b", "on")])
+        flag_file = LocalFlagFile(path)
+        flag_file.prime()
+        self._write_json([_json_flag("flag_a", "on"), _json_flag("flag_b", "off", 2)])
+        changes = flag_file.reload()
+        assert changes.names == ["flag_b"]
+        assert changes.to_add[0].default_treatment == "off"
+        assert changes.rule_based_segments is None
+
+        self._write_json([_json_flag("flag_b", "off", 2)])
+        changes = flag_file.reload()
+        assert changes.to_delete == ["flag_a"]
+
+    def test_missing_file(self):
+        flag_file = LocalFlagFile(os.path.join(self.directory, "missing.yaml"))
+        assert flag_file.reload() is None
+
+
+class TestLocalFileProvider(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "split.yaml")
+        with open(self.path, "w") as output:
+            output.write(YAML_FLAGS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_invalid_context(self):
+        for context in ({"LocalFile": "split.txt"}, {"LocalFile": 1},
+                        {"LocalFile": self.path, "ThreadingMode": "asyncio"},
+                        {"LocalFile": self.path, "SdkKey": "localhost"},
+                        {"LocalFile": self.path, "LocalFilePollInterval": 0}):
+            with self.assertRaises(AttributeError):
+                SplitProvider(context)
+
+    def test_changed_flag_reloaded(self):
+        provider = SplitProvider({"LocalFile": self.path, "LocalFilePollInterval": 0.02, "ReadyBlockTime": 5})
+        events = []
+        provider.attach(lambda _, event, details: events.append((event, details)))
+        provider.initialize(EvaluationContext())
+        assert provider.resolve_integer_details("int_feature", 0, EvaluationContext("key")).value == 32
+
+        with open(self.path, "w") as output:
+            output.write(YAML_FLAGS.replace('treatment: "32"', 'treatment: "64"'))
+        os.utime(self.path, ns=(time.time_ns(), time.time_ns() + 1000))
+        deadline = time.time() + 5
+        changed = []
+        while time.time() < deadline and not changed:
+            time.sleep(0.02)
+            changed = [details for event, details in events if event == ProviderEvent.PROVIDER_CONFIGURATION_CHANGED]
+        assert changed and changed[0].flags_changed == ["int_feature"]
+        assert provider.resolve_integer_details("int_feature", 0, EvaluationContext("key")).value == 64
+        assert provider.resolve_string_details("my_feature", "", EvaluationContext("key")).value == "on"
+        provider.shutdown()
+
+    def test_sdk_internals_available(self):
+        check_sdk_internals()
+
+    def test_untested_sdk_reloads_whole_file(self):
+        with patch.object(local_flag_file, "TESTED_SDK_VERSIONS", ()):
+            with self.assertRaises(RuntimeError):
+                check_sdk_internals()
+            provider = SplitProvider({"LocalFile": self.path, "ReadyBlockTime": 5})
+            provider.initialize(EvaluationContext())
+        wrapper = provider._split_client_wrapper
+        assert wrapper._flag_file is None
+        assert wrapper._config["localhostRefreshEnabled"]
+        assert provider.resolve_integer_details("int_feature", 0, EvaluationContext("key")).value == 32
+        provider.shutdown()
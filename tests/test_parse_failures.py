@@ -0,0 +1,82 @@
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+from openfeature.exception import ErrorCode, ParseError
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import Reason
+from split_openfeature_provider import SplitProvider
+from split_openfeature_provider.parse_failures import ParseFailureBreaker
+
+
+class TestParseFailureBreaker(unittest.TestCase):
+    def test_record_and_reset(self):
+        breaker = ParseFailureBreaker()
+        assert not breaker.is_open("flag", "on", int)
+        breaker.record("flag", "on", int)
+        breaker.record("other", "on", int)
+        assert breaker.is_open("flag", "on", int)
+        assert not breaker.is_open("flag", "on", float)
+        assert not breaker.is_open("flag", "off", int)
+        breaker.reset(["flag"])
+        assert not breaker.is_open("flag", "on", int)
+        # segment updates name no flags and leave conversions alone
+        breaker.reset([])
+        assert breaker.is_open("other", "on", int)
+        breaker.reset(None)
+        assert breaker.stats() == {"open": 0, "short_circuited": 0}
+
+    def test_bounded(self):
+        breaker = ParseFailureBreaker(max_entries=2)
+        for treatment in ("a", "b", "c"):
+            breaker.record("flag", treatment, int)
+        assert breaker.stats()["open"] == 2
+        assert not breaker.is_open("flag", "a", int)
+
+    def test_reports_rate_limited(self):
+        breaker = ParseFailureBreaker(log_interval=60)
+        with patch("split_openfeature_provider.parse_failures.time.monotonic", return_value=100):
+            breaker.record("flag", "on", int)
+        with self.assertLogs("split_openfeature_provider.parse_failures", logging.WARNING) as logs:
+            with patch("split_openfeature_provider.parse_failures.time.monotonic", return_value=110):
+                for _ in range(1000):
+                    breaker.is_open("flag", "on", int)
+            with patch("split_openfeature_provider.parse_failures.time.monotonic", return_value=161):
+                breaker.is_open("flag", "on", int)
+        assert len(logs.records) == 1
+        assert "1001 evaluations" in logs.output[0]
+        assert breaker.stats()["short_circuited"] == 1001
+
+
+class TestProviderParseFailures(unittest.TestCase):
+    context = EvaluationContext("key")
+
+    def test_short_circuit_until_flag_changes(self):
+        client = MagicMock()
+        client.get_treatment_with_config.return_value = ("on", None)
+        provider = SplitProvider({"SplitClient": client})
+        with self.assertRaises(ParseError):
+            provider.resolve_integer_details("flag", 1, self.context)
+
+        with patch.object(SplitProvider, "construct_flag_resolution", wraps=SplitProvider.construct_flag_resolution) \
+                as construct:
+            details = provider.resolve_integer_details("flag", 1, self.context)
+        assert details.value == 1
+        assert details.reason == Reason.ERROR
+        assert details.error_code == ErrorCode.PARSE_ERROR
+        construct.assert_called_once()
+        assert provider.get_parse_failure_stats() == {"open": 1, "short_circuited": 1}
+
+        # the flag is fixed in Split
+        client.get_treatment_with_config.return_value = ("5", None)
+        provider._handle_flags_update("SDK_UPDATE", {"names": ["flag"]})
+        assert provider.resolve_integer_details("flag", 1, self.context).value == 5
+
+    def test_bulk(self):
+        client = MagicMock()
+        client.get_treatments_with_config.return_value = {"flag": ("on", None)}
+        provider = SplitProvider({"SplitClient": client})
+        for _ in range(2):
+            results = provider.resolve_bulk_details({"flag": 1}, self.context)
+            assert results["flag"].error_code == ErrorCode.PARSE_ERROR
+        assert provider.get_parse_failure_stats()["short_circuited"] == 1
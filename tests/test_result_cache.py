@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import FlagResolutionDetails
+from split_openfeature_provider.result_cache import EvaluationResultCache
+
+
+class TestEvaluationResultCache(unittest.TestCase):
+    context = EvaluationContext("key", {"plan": "pro", "tags": ["a", "b"]})
+
+    def resolution(self, value):
+        return FlagResolutionDetails(value=value, variant=str(value), flag_metadata={"config": None})
+
+    def test_key_separates_targeting_attributes_and_type(self):
+        cache = EvaluationResultCache()
+        key = cache.key("flag", self.context, False)
+        assert key == cache.key("flag", EvaluationContext("key", {"plan": "pro", "tags": ["a", "b"]}), True)
+        assert key != cache.key("flag", EvaluationContext("other", {"plan": "pro", "tags": ["a", "b"]}), False)
+        assert key != cache.key("flag", EvaluationContext("key", {"plan": "free"}), False)
+        assert key != cache.key("flag", self.context, "off")
+        assert cache.key("flag", EvaluationContext("key", {"raw": bytearray(b"x")}), False) is None
+
+    def test_hit_returns_copy(self):
+        cache = EvaluationResultCache()
+        key = cache.key("flag", self.context, False)
+        assert cache.get(key) is None
+        cache.put(key, self.resolution(True))
+        first = cache.get(key)
+        first.flag_metadata["source"] = "changed"
+        second = cache.get(key)
+        assert second.value is True
+        assert "source" not in second.flag_metadata
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = EvaluationResultCache(max_entries=2)
+        keys = [cache.key("flag", EvaluationContext(str(i)), False) for i in range(3)]
+        cache.put(keys[0], self.resolution(0))
+        cache.put(keys[1], self.resolution(1))
+        cache.get(keys[0])
+        cache.put(keys[2], self.resolution(2))
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]).value == 0
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl(self):
+        cache = EvaluationResultCache(ttl_seconds=10)
+        key = cache.key("flag", self.context, False)
+        with patch("split_openfeature_provider.result_cache.time.monotonic", return_value=100):
+            cache.put(key, self.resolution(True))
+        with patch("split_openfeature_provider.result_cache.time.monotonic", return_value=105):
+            assert cache.get(key) is not None
+        with patch("split_openfeature_provider.result_cache.time.monotonic", return_value=111):
+            assert cache.get(key) is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache = EvaluationResultCache()
+        for flag in ("flag_a", "flag_b"):
+            for targeting_key in ("k1", "k2"):
+                cache.put(cache.key(flag, EvaluationContext(targeting_key), False), self.resolution(True))
+        cache.invalidate(["flag_a", "unknown"])
+        assert len(cache) == 2
+        assert cache.get(cache.key("flag_b", EvaluationContext("k1"), False)) is not None
+        # updates without names (segment changes) flush everything
+        cache.invalidate([])
+        assert len(cache) == 0
+        assert cache.stats()["invalidations"] == 4
+
+    def test_put_skipped_after_invalidation(self):
+        cache = EvaluationResultCache()
+        key = cache.key("flag_a", self.context, False)
+        generation = cache.generation("flag_a")
+        cache.invalidate(["flag_a"])
+        cache.put(key, self.resolution(True), generation)
+        assert cache.get(key) is None
+
+        other = cache.key("flag_b", self.context, False)
+        cache.put(other, self.resolution(True), cache.generation("flag_b"))
+        assert cache.get(other) is not None
+
+        # an update without names invalidates every flag
+        generation = cache.generation("flag_b")
+        cache.invalidate([])
+        cache.put(other, self.resolution(True), generation)
+        assert len(cache) == 0
+        assert cache.stats()["stale"] == 2
+
+    def test_excluded_flags(self):
+        cache = EvaluationResultCache(excluded_flags=["audited"])
+        assert cache.key("audited", self.context, False) is None
+        assert cache.key("flag", self.context, False) is not None
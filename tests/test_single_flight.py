@@ -0,0 +1,151 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+
+from split_openfeature_provider import SplitProviderAsync
+from split_openfeature_provider.single_flight import SingleFlight
+
+
+class SlowCall():
+    """Awaitable factory counting its calls; each call waits until `release` is set."""
+
+    def __init__(self, result="on"):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+        self.result = result
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_identical_calls_collapsed(self):
+        flight = SingleFlight()
+        call = SlowCall()
+        waiters = [asyncio.ensure_future(flight.call("key", call)) for _ in range(5)]
+        other = asyncio.ensure_future(flight.call("other", call))
+        await asyncio.sleep(0)
+        call.release.set()
+        assert await asyncio.gather(*waiters, other) == ["on"] * 6
+        assert call.calls == 2
+        stats = flight.stats()
+        assert stats["calls"] == 2
+        assert stats["collapsed"] == 4
+        assert stats["max_waiters"] == 5
+        assert stats["in_flight"] == 0
+
+        # a call after the previous one landed reaches the function again
+        assert await flight.call("key", call) == "on"
+        assert call.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        flight = SingleFlight()
+        call = SlowCall(ValueError("sdk"))
+        waiters = [asyncio.ensure_future(flight.call("key", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        call.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert call.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+        call = SlowCall()
+        first = asyncio.ensure_future(flight.call("key", call))
+        second = asyncio.ensure_future(flight.call("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        call.release.set()
+        assert await second == "on"
+        assert first.cancelled()
+        assert call.cancelled == 0
+        assert flight.stats()["cancelled"] == 1
+        assert flight.stats()["abandoned"] == 0
+
+    @pytest.mark.asyncio
+    async def test_all_callers_cancelled_abandons_call(self):
+        flight = SingleFlight()
+        call = SlowCall()
+        waiters = [asyncio.ensure_future(flight.call("key", call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert call.cancelled == 1
+        stats = flight.stats()
+        assert stats["abandoned"] == 1
+        assert stats["in_flight"] == 0
+
+        # the next caller starts a fresh call
+        call.release.set()
+        assert await flight.call("key", call) == "on"
+        assert call.calls == 2
+
+
+class TestProviderSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_evaluations_share_sdk_call(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def get_treatment_with_config(key, flag_key, attributes=None):
+            calls.append((key, flag_key))
+            await release.wait()
+            return "on", None
+
+        client = MagicMock()
+        client.get_treatment_with_config = get_treatment_with_config
+        provider = SplitProviderAsync({"SplitClient": client, "SingleFlight": True})
+        await provider.create()
+
+        context = EvaluationContext("key", {"plan": "gold"})
+        evaluations = [asyncio.ensure_future(provider.resolve_boolean_details_async("flag", False, context))
+                       for _ in range(10)]
+        evaluations.append(asyncio.ensure_future(
+            provider.resolve_string_details_async("flag", "off", EvaluationContext("key", {"plan": "free"}))))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*evaluations)
+
+        assert [result.value for result in results] == [True] * 10 + ["on"]
+        assert len(calls) == 2
+        assert provider.get_single_flight_stats()["collapsed"] == 9
+
+    @pytest.mark.asyncio
+    async def test_unhashable_attributes_evaluated_alone(self):
+        async def get_treatment_with_config(key, flag_key, attributes=None):
+            return "on", None
+
+        client = MagicMock()
+        client.get_treatment_with_config = get_treatment_with_config
+        provider = SplitProviderAsync({"SplitClient": client, "SingleFlight": True, "ResultCacheSize": 10})
+        await provider.create()
+        context = EvaluationContext("key", {"raw": bytearray(b"x")})
+        results = await asyncio.gather(*[provider.resolve_boolean_details_async("flag", False, context)
+                                         for _ in range(2)])
+        assert [result.value for result in results] == [True, True]
+        assert provider.get_single_flight_stats()["calls"] == 0
+
+    def test_disabled_by_default(self):
+        provider = SplitProviderAsync({"SplitClient": MagicMock()})
+        assert provider.get_single_flight_stats() == {}
+
+    def test_invalid_context(self):
+        with pytest.raises(AttributeError):
+            SplitProviderAsync({"SplitClient": MagicMock(), "SingleFlight": "yes"})
@@ -0,0 +1,77 @@
+import csv
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from openfeature.exception import ErrorCode
+from split_openfeature_provider import SplitBatchEvaluator, SplitProvider
+
+LOCALHOST_CONTEXT = {"SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"}, "ReadyBlockTime": 5}
+FLAG_DEFAULTS = {"my_feature": False, "int_feature": 0, "non-existent-feature": "blah"}
+
+
+class TestSplitBatchEvaluator(unittest.TestCase):
+    def _rows(self, count):
+        return (("key" if i % 2 == 0 else "user-%d" % i, None) for i in range(count))
+
+    def _assert_results(self, results, count):
+        assert [targeting_key for targeting_key, _ in results] == [targeting_key for targeting_key, _ in self._rows(count)]
+        for targeting_key, resolutions in results:
+            # 'on' only for the key "key" as defined in split.yaml
+            assert resolutions["my_feature"].value == (targeting_key == "key")
+            assert resolutions["int_feature"].value == 32
+            assert resolutions["non-existent-feature"].error_code == ErrorCode.FLAG_NOT_FOUND
+
+    def test_evaluate_in_process(self):
+        evaluator = SplitBatchEvaluator(LOCALHOST_CONTEXT, FLAG_DEFAULTS, processes=0, chunk_size=3)
+        self._assert_results(list(evaluator.evaluate(self._rows(10))), 10)
+
+    def test_evaluate_process_pool(self):
+        evaluator = SplitBatchEvaluator(LOCALHOST_CONTEXT, FLAG_DEFAULTS, processes=2, chunk_size=4,
+                                        max_pending_chunks=2)
+        self._assert_results(list(evaluator.evaluate(self._rows(25))), 25)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_workers_shut_down_their_provider(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shutdown = SplitProvider.shutdown
+
+        def record_shutdown(provider):
+            shutdown(provider)
+            open(os.path.join(directory, str(os.getpid())), "w").close()
+
+        # forked workers inherit the patched method
+        with patch.object(SplitProvider, "shutdown", record_shutdown):
+            evaluator = SplitBatchEvaluator(LOCALHOST_CONTEXT, FLAG_DEFAULTS, processes=2, chunk_size=4,
+                                            mp_context=multiprocessing.get_context("fork"))
+            self._assert_results(list(evaluator.evaluate(self._rows(25))), 25)
+        assert len(os.listdir(directory)) == 2
+
+    def test_missing_targeting_key(self):
+        evaluator = SplitBatchEvaluator(LOCALHOST_CONTEXT, FLAG_DEFAULTS, processes=0)
+        [(_, resolutions)] = list(evaluator.evaluate([("", None)]))
+        assert resolutions["my_feature"].error_code == ErrorCode.TARGETING_KEY_MISSING
+        assert resolutions["my_feature"].value == False
+
+    def test_export_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            evaluator = SplitBatchEvaluator(LOCALHOST_CONTEXT, FLAG_DEFAULTS, processes=0)
+            paths = evaluator.export_csv(self._rows(5), os.path.join(directory, "assignments"), rows_per_file=4)
+            # 5 keys x 3 flags, 4 lines per file
+            assert len(paths) == 4
+            lines = []
+            for path in paths:
+                with open(path, newline="") as f:
+                    file_lines = list(csv.reader(f))
+                assert file_lines[0][0] == "targeting_key"
+                lines.extend(file_lines[1:])
+            assert len(lines) == 15
+            assert lines[0] == ["key", "my_feature", "on", "True", "TARGETING_MATCH", ""]
+
+    def test_invalid_context(self):
+        with self.assertRaises(AttributeError):
+            SplitBatchEvaluator({"SplitClient": object()}, FLAG_DEFAULTS)
@@ -1,11 +1,30 @@
+import asyncio
 import pytest
+import subprocess
+import sys
+import time
 import unittest
 from threading import Event
+import unittest.mock
+from unittest.mock import MagicMock
 
 from splitio import get_factory, get_factory_async
 from split_openfeature_provider import SplitClientWrapper
+from split_openfeature_provider import split_client_wrapper
 
 class TestSplitClientWrapper(unittest.TestCase):
+    def test_split_sdk_loaded_lazily(self):
+        # importing the provider must not pull in the Split SDK, asyncio or aiohttp
+        code = "import sys, split_openfeature_provider; print(any(m.split('.')[0] in ('splitio', 'asyncio', 'aiohttp') for m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == "False"
+
+    def test_lazy_sdk_symbols(self):
+        assert split_client_wrapper.get_factory is get_factory
+        assert split_client_wrapper.split_sdk_symbol("get_factory_async") is get_factory_async
+        with self.assertRaises(AttributeError):
+            split_client_wrapper.not_a_symbol
+
     def test_using_external_splitclient(self):
         split_factory = get_factory("localhost", config={"splitFile": "split.yaml"})
         split_factory.block_until_ready(5)
@@ -21,6 +40,7 @@ class TestSplitClientWrapper(unittest.TestCase):
 
     def test_using_internal_splitclient(self):
         wrapper = SplitClientWrapper({"ReadyBlockTime": 1, "SdkKey": "localhost", "ConfigOptions": {"splitFile": "split.yaml"}})
+        assert wrapper.initialize()
         assert wrapper.split_client != None
         assert wrapper.is_sdk_ready()
         assert wrapper.sdk_ready == 1
@@ -31,7 +51,61 @@ class TestSplitClientWrapper(unittest.TestCase):
 
     def test_sdk_not_ready(self):
         wrapper = SplitClientWrapper({"ReadyBlockTime": 0.1, "SdkKey": "api", "ConfigOptions": {}})
+        assert not wrapper.initialize()
+        assert not wrapper.is_sdk_ready()
+        wrapper.destroy()
+
+    def test_construction_does_not_block(self):
+        release = Event()
+        factory = MagicMock()
+        factory.block_until_ready.side_effect = lambda timeout: release.wait()
+        with unittest.mock.patch.object(split_client_wrapper, "get_factory", return_value=factory, create=True):
+            wrappers = [SplitClientWrapper({"ReadyBlockTime": 5, "SdkKey": "key%d" % i}) for i in range(3)]
+            for wrapper in wrappers:
+                wrapper.start()
+            assert not any(wrapper.is_sdk_ready() for wrapper in wrappers)
+
+            # all three factories wait in parallel and become ready together
+            release.set()
+            assert all(wrapper.initialize() for wrapper in wrappers)
+        assert factory.block_until_ready.call_count == 3
+
+    def test_initialize_raises_factory_error(self):
+        with unittest.mock.patch.object(split_client_wrapper, "get_factory", side_effect=ValueError("bad key"),
+                                        create=True):
+            wrapper = SplitClientWrapper({"SdkKey": "key"})
+            with self.assertRaises(ValueError):
+                wrapper.initialize()
+        destroy_event = Event()
+        wrapper.destroy(destroy_event)
+        assert destroy_event.is_set()
+
+    def test_not_ready_check_does_not_block(self):
+        split_client = MagicMock()
+        split_client._factory.ready = False
+        split_client._factory.destroyed = False
+        wrapper = SplitClientWrapper({"SplitClient": split_client})
         assert not wrapper.is_sdk_ready()
+        split_client._factory.block_until_ready.assert_not_called()
+
+        # background re-check picks up readiness without any evaluation blocking on it
+        split_client._factory.ready = True
+        deadline = time.time() + 2
+        while not wrapper.is_sdk_ready() and time.time() < deadline:
+            time.sleep(0.01)
+        assert wrapper.is_sdk_ready()
+        wrapper.destroy()
+
+    def test_sdk_ready_event_sets_flag(self):
+        split_client = MagicMock()
+        split_client._factory.ready = False
+        split_client._factory.destroyed = False
+        wrapper = SplitClientWrapper({"SplitClient": split_client})
+        receiver = MagicMock()
+        wrapper.set_event_receiver(receiver)
+        wrapper._on_sdk_ready({"ready": True})
+        assert wrapper.is_sdk_ready()
+        receiver._on_split_event.assert_called_once()
         wrapper.destroy()
 
     def test_invalid_apikey(self):
@@ -42,6 +116,22 @@ class TestSplitClientWrapper(unittest.TestCase):
         with self.assertRaises(AttributeError) as context:
             wrapper = SplitClientWrapper({"SdkKey": "123", "ConfigOptions": "234"})
 
+    def test_invalid_json_decoder(self):
+        with self.assertRaises(AttributeError) as context:
+            wrapper = SplitClientWrapper({"SdkKey": "123", "JsonDecoder": "orjson"})
+
+    def test_invalid_slow_threshold(self):
+        with self.assertRaises(AttributeError) as context:
+            wrapper = SplitClientWrapper({"SdkKey": "123", "SlowEvaluationThresholdMs": "50"})
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(AttributeError) as context:
+            wrapper = SplitClientWrapper({"SdkKey": "123", "AsyncPoolSize": 0})
+
+    def test_prefork_requires_snapshot_directory(self):
+        with self.assertRaises(AttributeError) as context:
+            wrapper = SplitClientWrapper({"SdkKey": "123", "PreforkMode": True})
+
     def test_no_params(self):
         with self.assertRaises(AttributeError) as context:
             wrapper = SplitClientWrapper({})
@@ -73,6 +163,23 @@ class TestSplitClientWrapperAsync(object):
         await wrapper.destroy_async()
         assert wrapper._factory.destroyed
 
+    @pytest.mark.asyncio
+    async def test_not_ready_check_does_not_block_async(self):
+        split_client = MagicMock()
+        split_client._factory.ready = False
+        split_client._factory.destroyed = False
+        wrapper = SplitClientWrapper({"SplitClient": split_client, "ThreadingMode": "asyncio"})
+        await wrapper.create()
+        assert not await wrapper.is_sdk_ready_async()
+        split_client._factory.block_until_ready.assert_not_called()
+
+        split_client._factory.ready = True
+        for _ in range(100):
+            if wrapper.is_sdk_ready():
+                break
+            await asyncio.sleep(0.01)
+        assert await wrapper.is_sdk_ready_async()
+
     @pytest.mark.asyncio
     async def test_sdk_not_ready_async(self):
         wrapper = SplitClientWrapper({"ReadyBlockTime": 0.1, "SdkKey": "api", "ConfigOptions": {}, "ThreadingMode": "asyncio"})
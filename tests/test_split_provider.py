@@ -1,9 +1,17 @@
+import asyncio
+import threading
 from pytest import fail
 import pytest
-from mock import MagicMock
-from openfeature.exception import ErrorCode, OpenFeatureError
+from mock import MagicMock, patch
+from openfeature.exception import ErrorCode, GeneralError, OpenFeatureError, ProviderNotReadyError
 from openfeature.evaluation_context import EvaluationContext
 from split_openfeature_provider import SplitProvider, SplitProviderAsync
+from split_openfeature_provider import split_client_wrapper
+
+try:
+    from splitio.models.events import SdkEvent
+except ImportError:
+    SdkEvent = None
 
 class TestProvider(object):
     eval_context = EvaluationContext("someKey")
@@ -256,6 +264,47 @@ class TestProvider(object):
         result = self.provider.resolve_object_details(self.flag_name, {"blah": "blaah"}, self.eval_context)
         assert result.value == {"string": "blah", "int": 10, "bool": True, "struct": {"foo": "bar"}, "list": [1, 2]}
 
+    def test_obj_cached(self):
+        # object treatments are decoded once per flag and handed out as shared immutable views
+        self.reset_client()
+        self.mock_client_return('{"foo": "bar", "list": [1]}')
+        first = self.provider.resolve_object_details(self.flag_name, {}, self.eval_context)
+        second = self.provider.resolve_object_details(self.flag_name, {}, self.eval_context)
+        assert first.value is second.value
+        with pytest.raises(TypeError):
+            first.value["foo"] = "baz"
+        with pytest.raises(TypeError):
+            first.value["list"].append(2)
+
+    def test_obj_cache_invalidated_on_update(self):
+        if SdkEvent is None:
+            pytest.skip("SdkEvent not available")
+        self.reset_client()
+        self.mock_client_return('{"foo": "bar"}')
+        first = self.provider.resolve_object_details(self.flag_name, {}, self.eval_context)
+        self.provider._on_split_event(SdkEvent.SDK_UPDATE, {"names": ["other_flag"]})
+        assert self.provider.resolve_object_details(self.flag_name, {}, self.eval_context).value is first.value
+        self.provider._on_split_event(SdkEvent.SDK_UPDATE, {"names": [self.flag_name]})
+        assert self.provider.resolve_object_details(self.flag_name, {}, self.eval_context).value is not first.value
+
+    def test_custom_json_decoder(self):
+        decoder = MagicMock(return_value={"decoded": True})
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "JsonDecoder": decoder})
+        self.mock_client_return('{"foo": "bar"}')
+        result = self.provider.resolve_object_details(self.flag_name, {}, self.eval_context)
+        assert result.value == {"decoded": True}
+        decoder.assert_called_once_with('{"foo": "bar"}')
+
+    def test_parsed_config(self):
+        self.reset_client()
+        self.client.get_treatment_with_config.return_value = ("on", '{"color": "blue"}')
+        details = self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        config = self.provider.parsed_config(self.flag_name, details.flag_metadata["config"])
+        assert config == {"color": "blue"}
+        assert self.provider.parsed_config(self.flag_name, details.flag_metadata["config"]) is config
+        assert self.provider.parsed_config(self.flag_name, None) is None
+
     def test_obj_error(self):
         # a treatment that can not be converted to an object should throw an error
         self.reset_client()
@@ -268,11 +317,203 @@ class TestProvider(object):
         except Exception:
             fail("Unexpected exception occurred")
 
+    def test_attributes_normalized(self):
+        # context attributes are converted to Split types before reaching the SDK
+        self.reset_client()
+        self.mock_client_return("on")
+        context = EvaluationContext("someKey", {"user": {"plan": "pro"}, "roles": {"admin"}})
+        self.provider.resolve_boolean_details(self.flag_name, False, context)
+        self.client.get_treatment_with_config.assert_called_with("someKey", self.flag_name,
+                                                                 {"user.plan": "pro", "roles": ["admin"]})
+
+    def test_latency_tracking(self):
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "LatencyTracking": True})
+        assert self.provider.get_latency_snapshot() == {}
+        self.mock_client_return("on")
+        self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        self.mock_client_return("notAnInt")
+        with pytest.raises(OpenFeatureError):
+            self.provider.resolve_integer_details(self.flag_name, 1, self.eval_context)
+        stages = self.provider.get_latency_snapshot()[self.flag_name]
+        assert stages["total"]["count"] == 2
+        assert stages["sdk"]["count"] == 2
+        # the failed coercion never completed the process stage
+        assert stages["process"]["count"] == 1
+
+        # an evaluation returning before any stage still counts in the total
+        self.provider._split_client_wrapper.sdk_ready = False
+        self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        stages = self.provider.get_latency_snapshot()[self.flag_name]
+        assert stages["total"]["count"] == 3
+        assert stages["ready"]["count"] == 2
+
+    def test_latency_tracking_disabled(self):
+        self.reset_client()
+        self.mock_client_return("on")
+        self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        assert self.provider._latency_recorder is None
+        assert self.provider.get_latency_snapshot() == {}
+
+    # *** Bulk eval tests ***
+    def test_bulk_details(self):
+        # every flag is coerced using the type of its own default, from a single SDK call
+        self.reset_client()
+        self.client.get_treatments_with_config.return_value = {
+            "bool_flag": ("on", None),
+            "int_flag": ("50", "{'prop':'val'}"),
+            "obj_flag": ('{"foo": "bar"}', None),
+            "missing_flag": ("control", None),
+        }
+        results = self.provider.resolve_bulk_details(
+            {"bool_flag": False, "int_flag": 1, "obj_flag": {}, "missing_flag": "default"}, self.eval_context)
+        self.client.get_treatments_with_config.assert_called_once()
+        self.client.get_treatment_with_config.assert_not_called()
+        assert results["bool_flag"].value is True
+        assert results["int_flag"].value == 50
+        assert results["int_flag"].flag_metadata["config"] == "{'prop':'val'}"
+        assert results["obj_flag"].value == {"foo": "bar"}
+        assert results["missing_flag"].value == "default"
+        assert results["missing_flag"].error_code == ErrorCode.FLAG_NOT_FOUND
+
+    def test_bulk_details_parse_error(self):
+        # a flag that can not be coerced fails on its own without failing the rest of the batch
+        self.reset_client()
+        self.client.get_treatments_with_config.return_value = {"int_flag": ("notAnInt", None), "str_flag": ("on", None)}
+        results = self.provider.resolve_bulk_details({"int_flag": 1, "str_flag": "off"}, self.eval_context)
+        assert results["int_flag"].value == 1
+        assert results["int_flag"].error_code == ErrorCode.PARSE_ERROR
+        assert results["str_flag"].value == "on"
+
     def test_sdk_not_ready(self):
         provider = SplitProvider({"ReadyBlockTime": 0.1,"SdkKey": "api"})
         details = provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
         assert details.error_code == ErrorCode.PROVIDER_NOT_READY
         assert details.value == False
+        results = provider.resolve_bulk_details({self.flag_name: False}, self.eval_context)
+        assert results[self.flag_name].error_code == ErrorCode.PROVIDER_NOT_READY
+        provider._split_client_wrapper.destroy()
+
+    def test_initialize_not_ready(self):
+        # construction returns immediately; initialize waits for ReadyBlockTime and reports the timeout
+        provider = SplitProvider({"ReadyBlockTime": 0.1, "SdkKey": "api"})
+        with pytest.raises(ProviderNotReadyError):
+            provider.initialize(self.eval_context)
+        provider._split_client_wrapper.destroy()
+
+    def test_result_cache(self):
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "ResultCacheSize": 100,
+                                       "ResultCacheExcludedFlags": ["audited"]})
+        self.mock_client_return("on")
+        for _ in range(3):
+            assert self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context).value
+        assert self.client.get_treatment_with_config.call_count == 1
+        # another value type is coerced separately
+        assert self.provider.resolve_string_details(self.flag_name, "off", self.eval_context).value == "on"
+        assert self.client.get_treatment_with_config.call_count == 2
+
+        # excluded flags reach the SDK on every call
+        self.provider.resolve_boolean_details("audited", False, self.eval_context)
+        self.provider.resolve_boolean_details("audited", False, self.eval_context)
+        assert self.client.get_treatment_with_config.call_count == 4
+
+        # an update naming the flag drops its entries
+        self.mock_client_return("off")
+        self.provider._handle_flags_update("SDK_UPDATE", {"names": ["other"]})
+        assert self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context).value
+        self.provider._handle_flags_update("SDK_UPDATE", {"names": [self.flag_name]})
+        assert not self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context).value
+        stats = self.provider.get_result_cache_stats()
+        assert stats["hits"] == 3
+        assert stats["invalidations"] == 2
+
+    def test_result_cache_skips_errors(self):
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "ResultCacheSize": 100})
+        self.mock_client_return("control")
+        self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
+        assert self.client.get_treatment_with_config.call_count == 2
+        assert self.provider.get_result_cache_stats()["entries"] == 0
+
+    def test_result_cache_skips_results_invalidated_during_evaluation(self):
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "ResultCacheSize": 100})
+
+        def get_treatment_with_config(*_):
+            # the flag is killed while the SDK evaluates it
+            self.provider._handle_flags_update(None, {"names": [self.flag_name]})
+            return "on", None
+
+        self.client.get_treatment_with_config.side_effect = get_treatment_with_config
+        assert self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context).value is True
+        self.client.get_treatment_with_config.side_effect = None
+        self.mock_client_return("off")
+        assert self.provider.resolve_boolean_details(self.flag_name, True, self.eval_context).value is False
+        assert self.provider.get_result_cache_stats()["stale"] == 1
+
+    def test_result_cache_disabled(self):
+        self.reset_client()
+        assert self.provider.get_result_cache_stats() == {}
+
+    def test_track(self):
+        self.reset_client()
+        self.client.track.return_value = True
+        context = EvaluationContext("someKey", {"trafficType": "account"})
+        assert self.provider.track("checkout", context, {"value": 9.5, "plan": "pro", "cart": {"items": 3}})
+        assert self.provider.track("visit", self.eval_context)
+        with pytest.raises(OpenFeatureError):
+            self.provider.track("visit", EvaluationContext())
+        # nothing reaches the SDK on the caller's thread
+        self.client.track.assert_not_called()
+        self.provider.shutdown()
+
+        assert self.client.track.call_args_list[0][0] == \
+            ("someKey", "account", "checkout", 9.5, {"plan": "pro", "cart.items": 3})
+        assert self.client.track.call_args_list[1][0] == ("someKey", "user", "visit", None, None)
+        stats = self.provider.get_track_stats()
+        assert stats["sent"] == 2
+        assert stats["dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_resolve_in_pool(self):
+        self.client = MagicMock()
+        self.provider = SplitProvider({"SplitClient": self.client, "AsyncPoolSize": 2, "AsyncQueueSize": 5})
+        caller = threading.get_ident()
+        threads = set()
+        def get_treatment_with_config(*_):
+            threads.add(threading.get_ident())
+            return ("on", None)
+        self.client.get_treatment_with_config.side_effect = get_treatment_with_config
+
+        results = await asyncio.gather(*[self.provider.resolve_boolean_details_async(self.flag_name, False, self.eval_context)
+                                         for _ in range(5)])
+        assert all(details.value for details in results)
+        assert caller not in threads
+        self.client.get_treatments_with_config.return_value = {self.flag_name: ("on", None)}
+        bulk = await self.provider.resolve_bulk_details_async({self.flag_name: False}, self.eval_context)
+        assert bulk[self.flag_name].value
+
+        stats = self.provider.get_pool_stats()
+        assert stats["workers"] == 2
+        assert stats["completed"] == 6
+        self.provider.shutdown()
+        assert self.provider.get_pool_stats() == {}
+
+    def test_shutdown_destroys_own_factory(self):
+        factory = MagicMock()
+        with patch.object(split_client_wrapper, "get_factory", return_value=factory, create=True):
+            provider = SplitProvider({"SdkKey": "api", "ReadyBlockTime": 1})
+            provider.initialize(self.eval_context)
+        provider.shutdown()
+        provider.shutdown()
+        factory.destroy.assert_called_once()
+
+    def test_shutdown_leaves_supplied_client(self):
+        self.reset_client()
+        self.provider.shutdown()
+        self.client._factory.destroy.assert_not_called()
 
 class TestProviderAsync(object):
     eval_context = EvaluationContext("someKey")
@@ -569,6 +810,32 @@ class TestProviderAsync(object):
         except Exception:
             fail("Unexpected exception occurred")
 
+    @pytest.mark.asyncio
+    async def test_latency_tracking(self):
+        self.client = MagicMock()
+        self.provider = SplitProviderAsync({"SplitClient": self.client, "SlowEvaluationThresholdMs": 1000})
+        await self.provider.create()
+        self.mock_client_return("on")
+        await self.provider.resolve_boolean_details_async(self.flag_name, False, self.eval_context)
+        stages = self.provider.get_latency_snapshot()[self.flag_name]
+        assert set(stages) == {"ready", "context", "sdk", "process", "total"}
+
+    # *** Bulk eval tests ***
+    @pytest.mark.asyncio
+    async def test_bulk_details(self):
+        await self.reset_client()
+
+        async def get_treatments_with_config(*_):
+            return {"bool_flag": ("off", None), "float_flag": ("50.5", None), "bad_flag": ("on", None)}
+        self.client.get_treatments_with_config = get_treatments_with_config
+
+        results = await self.provider.resolve_bulk_details_async(
+            {"bool_flag": True, "float_flag": 1.5, "bad_flag": 1}, self.eval_context)
+        assert results["bool_flag"].value is False
+        assert results["float_flag"].value == 50.5
+        assert results["bad_flag"].value == 1
+        assert results["bad_flag"].error_code == ErrorCode.PARSE_ERROR
+
     @pytest.mark.asyncio
     async def test_sdk_not_ready(self):
         provider = SplitProviderAsync({"ReadyBlockTime": 0.1,"SdkKey": "api"})
@@ -577,3 +844,76 @@ class TestProviderAsync(object):
         assert details.error_code == ErrorCode.PROVIDER_NOT_READY
         assert details.value == False
         await provider._split_client_wrapper._factory.destroy()
+
+    @pytest.mark.asyncio
+    async def test_result_cache(self):
+        self.client = MagicMock()
+        self.provider = SplitProviderAsync({"SplitClient": self.client, "ResultCacheSize": 100})
+        await self.provider.create()
+        calls = []
+        async def get_treatment_with_config(*args):
+            calls.append(args)
+            return ("on", None)
+        self.client.get_treatment_with_config = get_treatment_with_config
+        for _ in range(3):
+            assert (await self.provider.resolve_boolean_details_async(self.flag_name, False, self.eval_context)).value
+        assert len(calls) == 1
+        # segment updates carry no flag names and flush the cache
+        self.provider._handle_flags_update("SDK_UPDATE", {"names": []})
+        await self.provider.resolve_boolean_details_async(self.flag_name, False, self.eval_context)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_track(self):
+        await self.reset_client()
+        tracked = []
+        async def track(*args):
+            tracked.append(args)
+            return True
+        self.client.track = track
+        self.provider.track("checkout", self.eval_context, {"value": 1})
+        # the batch is sent on this loop from the tracking thread
+        await asyncio.get_running_loop().run_in_executor(None, self.provider._track_queue.flush)
+        assert tracked == [("someKey", "user", "checkout", 1, None)]
+        assert self.provider.get_track_stats()["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_initialize_schedules_create(self):
+        client = MagicMock()
+        client._factory.ready = True
+        provider = SplitProviderAsync({"SplitClient": client})
+        with pytest.raises(ProviderNotReadyError):
+            provider.initialize(self.eval_context)
+        await provider._create_task
+        assert provider._split_client_wrapper.is_sdk_ready()
+        provider.initialize(self.eval_context)
+
+    @pytest.mark.asyncio
+    async def test_initialize_reports_create_failure(self):
+        async def get_factory_async(sdk_key, config=None):
+            raise ValueError("invalid configuration")
+
+        with patch.object(split_client_wrapper, "get_factory_async", side_effect=get_factory_async, create=True):
+            provider = SplitProviderAsync({"SdkKey": "key"})
+            errors = []
+            provider.emit_provider_error = errors.append
+            with pytest.raises(ProviderNotReadyError):
+                provider.initialize(self.eval_context)
+            with pytest.raises(ValueError):
+                await provider._create_task
+        assert len(errors) == 1
+        assert errors[0].error_code == ErrorCode.GENERAL
+        assert "invalid configuration" in errors[0].message
+
+    @pytest.mark.asyncio
+    async def test_sync_resolve_bridged_to_loop(self):
+        await self.reset_client()
+        self.mock_client_return("on")
+        # from a worker thread the evaluation runs on this test's loop, where the factory lives
+        details = await asyncio.get_running_loop().run_in_executor(
+            None, self.provider.resolve_boolean_details, self.flag_name, False, self.eval_context)
+        assert details.value
+
+        # blocking on the factory's own loop would deadlock
+        with pytest.raises(GeneralError):
+            self.provider.resolve_boolean_details(self.flag_name, False, self.eval_context)
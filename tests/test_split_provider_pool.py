@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent, ProviderEventDetails
+from openfeature.exception import GeneralError
+from split_openfeature_provider import SplitProviderPool
+from split_openfeature_provider import split_client_wrapper
+
+
+class TestSplitProviderPool(unittest.TestCase):
+    def setUp(self):
+        self.factories = {}
+
+        def get_factory(sdk_key, config=None):
+            factory = MagicMock()
+            factory.destroyed = False
+            factory.client.return_value.get_treatment_with_config.return_value = (sdk_key, None)
+            self.factories[sdk_key] = factory
+            return factory
+
+        patcher = patch.object(split_client_wrapper, "get_factory", side_effect=get_factory, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _context(self, sdk_key):
+        return EvaluationContext("user", {"splitSdkKey": sdk_key})
+
+    def test_resolves_key_per_evaluation(self):
+        pool = SplitProviderPool({"ReadyBlockTime": 1})
+        assert pool.resolve_string_details("flag", "default", self._context("key-a")).value == "key-a"
+        assert pool.resolve_string_details("flag", "default", self._context("key-b")).value == "key-b"
+        assert pool.resolve_string_details("flag", "default", self._context("key-a")).value == "key-a"
+        # one shared factory per key
+        assert sorted(self.factories) == ["key-a", "key-b"]
+
+        stats = pool.stats()
+        assert stats["*ey-a"]["evaluations"] == 2
+        assert stats["*ey-a"]["ready"]
+        pool.shutdown()
+        assert all(factory.destroy.called for factory in self.factories.values())
+
+    def test_lru_eviction(self):
+        pool = SplitProviderPool({"MaxFactories": 2})
+        for sdk_key in ("key-a", "key-b", "key-a", "key-c"):
+            pool.resolve_string_details("flag", "default", self._context(sdk_key))
+        # key-b was the least recently used when key-c arrived
+        assert self.factories["key-b"].destroy.called
+        assert not self.factories["key-a"].destroy.called
+        assert sorted(pool.stats()) == ["*ey-a", "*ey-c"]
+        assert pool.evictions == 1
+        pool.shutdown()
+
+    def test_eviction_waits_for_running_evaluations(self):
+        pool = SplitProviderPool({"MaxFactories": 1})
+        evicted = []
+
+        def evaluate_while_evicted(*_):
+            # another environment arrives while key-a is still evaluating
+            pool.resolve_string_details("flag", "default", self._context("key-b"))
+            evicted.append(self.factories["key-a"].destroy.called)
+            return ("key-a", None)
+
+        pool.resolve_string_details("flag", "default", self._context("key-a"))
+        self.factories["key-a"].client.return_value.get_treatment_with_config.side_effect = evaluate_while_evicted
+        assert pool.resolve_string_details("flag", "default", self._context("key-a")).value == "key-a"
+        assert evicted == [False]
+        assert self.factories["key-a"].destroy.called
+        assert pool.evictions == 1
+        pool.shutdown()
+
+    def test_failed_provider_does_not_evict(self):
+        pool = SplitProviderPool({"MaxFactories": 1})
+        pool.resolve_string_details("flag", "default", self._context("key-a"))
+        with patch("split_openfeature_provider.split_provider_pool.SplitProvider", side_effect=RuntimeError()):
+            with self.assertRaises(RuntimeError):
+                pool.resolve_string_details("flag", "default", self._context("key-b"))
+        assert not self.factories["key-a"].destroy.called
+        assert list(pool.stats()) == ["*ey-a"]
+        pool.shutdown()
+
+    def test_missing_key(self):
+        pool = SplitProviderPool({})
+        with self.assertRaises(GeneralError):
+            pool.resolve_boolean_details("flag", False, EvaluationContext("user"))
+
+    def test_custom_resolver_and_tenant(self):
+        pool = SplitProviderPool({"SdkKeyResolver": lambda context: "key-%s" % context.attributes["tenant"]})
+        assert pool.resolve_string_details("flag", "", EvaluationContext("user", {"tenant": "x"})).value == "key-x"
+
+        tenant = pool.tenant("key-y")
+        events = []
+        tenant.attach(lambda provider, event, details: events.append((provider, event)))
+        assert tenant.resolve_string_details("flag", "", EvaluationContext("user")).value == "key-y"
+        pool._on_tenant_event("key-x", ProviderEvent.PROVIDER_CONFIGURATION_CHANGED, ProviderEventDetails())
+        pool._on_tenant_event("key-y", ProviderEvent.PROVIDER_CONFIGURATION_CHANGED, ProviderEventDetails())
+        assert events == [(tenant, ProviderEvent.PROVIDER_CONFIGURATION_CHANGED)]
+        assert list(tenant.stats()) == ["*ey-y"]
+        pool.shutdown()
+
+    def test_invalid_context(self):
+        with self.assertRaises(AttributeError):
+            SplitProviderPool({"SdkKey": "key"})
+        with self.assertRaises(AttributeError):
+            SplitProviderPool({"MaxFactories": 0})
+        for option in ({"SnapshotDirectory": "/tmp/split"}, {"PreforkMode": True}, {"LocalFile": "flags.yaml"}):
+            with self.assertRaises(AttributeError):
+                SplitProviderPool(option)
@@ -0,0 +1,91 @@
+import pytest
+from mock import MagicMock
+from openfeature import api
+from openfeature.evaluation_context import EvaluationContext
+
+pytest.importorskip("opentelemetry.sdk")
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from split_openfeature_provider import SplitProvider, OpenTelemetryHook
+
+
+class TestOpenTelemetryHook(object):
+    context = EvaluationContext("key")
+
+    def setup_method(self):
+        self.reader = InMemoryMetricReader()
+        self.exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.options = {"meter_provider": MeterProvider(metric_readers=[self.reader]),
+                        "tracer_provider": tracer_provider}
+        self.split_client = MagicMock()
+        self.split_client.get_treatment_with_config.return_value = ("on", None)
+
+    def teardown_method(self):
+        api.clear_providers()
+
+    def client(self, **options):
+        options.setdefault("latency_sample_rate", 1.0)
+        provider = SplitProvider({"SplitClient": self.split_client, "OpenTelemetry": dict(self.options, **options)})
+        api.set_provider(provider)
+        return api.get_client()
+
+    def points(self, name):
+        points = []
+        for resource_metrics in self.reader.get_metrics_data().resource_metrics:
+            for scope_metrics in resource_metrics.scope_metrics:
+                for metric in scope_metrics.metrics:
+                    if metric.name == name:
+                        points.extend(metric.data.data_points)
+        return {tuple(sorted(point.attributes.items())): point for point in points}
+
+    def test_evaluation_metrics(self):
+        client = self.client()
+        for _ in range(3):
+            assert client.get_boolean_value("flag", False, self.context)
+        assert client.get_integer_value("flag", 7, self.context) == 7
+
+        counts = {dict(attributes).get("error.type"): point.value
+                  for attributes, point in self.points("feature_flag.evaluations").items()}
+        assert counts == {None: 3, "PARSE_ERROR": 1}
+        durations = self.points("feature_flag.evaluation.duration")
+        assert sum(point.count for point in durations.values()) == 4
+        success = next(point for attributes, point in durations.items() if ("error.type", "PARSE_ERROR") not in attributes)
+        assert dict(next(iter(durations))).get("feature_flag.key") == "flag"
+        assert success.count == 3
+        # no spans unless sampled
+        assert self.exporter.get_finished_spans() == ()
+
+    def test_not_ready(self):
+        provider = SplitProvider({"SdkKey": "api", "ReadyBlockTime": 0.1, "OpenTelemetry": self.options})
+        api.set_provider(provider)
+        assert not api.get_client().get_boolean_value("flag", False, self.context)
+        reasons = [dict(attributes).get("error.type") for attributes in self.points("feature_flag.evaluations")]
+        assert reasons == ["PROVIDER_NOT_READY"]
+        provider._split_client_wrapper.destroy()
+
+    def test_spans(self):
+        client = self.client(span_sample_rate=1.0)
+        client.get_boolean_value("flag", False, self.context)
+        spans = self.exporter.get_finished_spans()
+        assert len(spans) == 1
+        assert spans[0].name == "feature_flag.evaluation"
+        assert spans[0].attributes["feature_flag.key"] == "flag"
+        assert spans[0].attributes["feature_flag.result.variant"] == "on"
+
+    def test_head_sampling(self):
+        client = self.client(latency_sample_rate=0.0, span_sample_rate=0.0)
+        for _ in range(5):
+            client.get_boolean_value("flag", False, self.context)
+        assert sum(point.value for point in self.points("feature_flag.evaluations").values()) == 5
+        assert self.points("feature_flag.evaluation.duration") == {} or \
+            sum(point.count for point in self.points("feature_flag.evaluation.duration").values()) == 0
+
+    def test_attributes_reused(self):
+        hook = OpenTelemetryHook(**self.options)
+        assert hook._count("flag", "TARGETING_MATCH", None) is hook._count("flag", "TARGETING_MATCH", None)
@@ -0,0 +1,154 @@
+import asyncio
+import concurrent.futures
+import threading
+import unittest
+
+import pytest
+from openfeature.evaluation_context import EvaluationContext
+
+from split_openfeature_provider import SplitProviderAsync
+from split_openfeature_provider.fake_split import FakeSplitFactory, FakeFlag
+from split_openfeature_provider.track_queue import TrackQueue, OVERFLOW_DROP_OLDEST
+
+
+class TestTrackQueue(unittest.TestCase):
+    def test_flush_on_batch_size(self):
+        sent = threading.Event()
+        batches = []
+        def send(batch):
+            batches.append(batch)
+            sent.set()
+            return len(batch)
+        track_queue = TrackQueue(send, batch_size=3, flush_interval=60)
+        for i in range(3):
+            assert track_queue.put(i)
+        assert sent.wait(5)
+        assert batches == [[0, 1, 2]]
+        track_queue.stop()
+
+    def test_flush_on_interval(self):
+        sent = threading.Event()
+        track_queue = TrackQueue(lambda batch: sent.set() or len(batch), flush_interval=0.05)
+        track_queue.put("event")
+        assert sent.wait(5)
+        track_queue.stop()
+        assert track_queue.stats()["sent"] == 1
+
+    def test_flush_on_stop(self):
+        batches = []
+        track_queue = TrackQueue(lambda batch: batches.append(batch) or len(batch), batch_size=2, flush_interval=60)
+        track_queue.put(1)
+        track_queue.stop()
+        assert batches == [[1]]
+        assert not track_queue.put(2)
+        assert track_queue.stats()["dropped"] == 1
+
+    def test_overflow_drop_newest(self):
+        batches = []
+        track_queue = TrackQueue(lambda batch: batches.append(batch) or len(batch), max_size=2, flush_interval=60)
+        assert track_queue.put(1)
+        assert track_queue.put(2)
+        assert not track_queue.put(3)
+        track_queue.stop()
+        assert batches == [[1, 2]]
+        stats = track_queue.stats()
+        assert stats["dropped"] == 1
+        assert stats["max_depth"] == 2
+
+    def test_overflow_drop_oldest(self):
+        batches = []
+        track_queue = TrackQueue(lambda batch: batches.append(batch) or len(batch), max_size=2, flush_interval=60,
+                                 overflow=OVERFLOW_DROP_OLDEST)
+        for i in range(3):
+            assert track_queue.put(i)
+        track_queue.stop()
+        assert batches == [[1, 2]]
+
+    def test_send_failures_counted(self):
+        def send(batch):
+            raise RuntimeError("sdk")
+        track_queue = TrackQueue(send, flush_interval=60)
+        track_queue.put(1)
+        track_queue.put(2)
+        track_queue.stop()
+        stats = track_queue.stats()
+        assert stats["failed"] == 2
+        assert stats["sent"] == 0
+
+    def test_held_until_client_available(self):
+        available = []
+        batches = []
+        track_queue = TrackQueue(lambda batch: batches.append(batch) or len(batch), lambda: bool(available),
+                                 flush_interval=60)
+        track_queue.put(1)
+        track_queue.flush()
+        assert batches == []
+        available.append(True)
+        track_queue.flush()
+        assert batches == [[1]]
+        track_queue.stop()
+
+    def test_stop_without_flush_keeps_events_for_flush_async(self):
+        track_queue = TrackQueue(lambda batch: len(batch), flush_interval=60, batch_size=2)
+        for event in range(3):
+            track_queue.put(event)
+        track_queue.stop(flush=False)
+        assert track_queue.stats()["depth"] == 3
+
+        batches = []
+
+        async def send(batch):
+            batches.append(batch)
+            return len(batch)
+
+        asyncio.run(track_queue.flush_async(send))
+        assert batches == [[0, 1], [2]]
+        assert track_queue.stats()["sent"] == 3
+
+
+class TestAsyncProviderTrackShutdown:
+    async def _provider(self):
+        factory = FakeSplitFactory([FakeFlag("flag", default_treatment="on")], asyncio_mode=True)
+        provider = SplitProviderAsync({"SplitClient": factory.client(), "TrackFlushInterval": 60})
+        await provider.create()
+        for event in ("a", "b", "c"):
+            assert provider.track(event, EvaluationContext("key"))
+        return factory, provider
+
+    @pytest.mark.asyncio
+    async def test_shutdown_async_sends_queued_events(self):
+        factory, provider = await self._provider()
+        await provider.shutdown_async()
+        assert [event[2] for event in factory.events] == ["a", "b", "c"]
+        stats = provider.get_track_stats()
+        assert stats["sent"] == 3
+        assert stats["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_on_factory_loop_sends_queued_events(self):
+        factory, provider = await self._provider()
+        provider.shutdown()
+        await asyncio.sleep(0.01)
+        assert [event[2] for event in factory.events] == ["a", "b", "c"]
+        assert provider.get_track_stats()["sent"] == 3
+
+    @pytest.mark.asyncio
+    async def test_track_after_shutdown_uses_new_queue(self):
+        factory, provider = await self._provider()
+        await provider.shutdown_async()
+        assert provider._track_queue is None
+        assert provider.track("d", EvaluationContext("key"))
+        assert provider.get_track_stats()["sent"] == 0
+        await provider.shutdown_async()
+        assert [event[2] for event in factory.events] == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_sync_send_is_bounded(self):
+        factory, provider = await self._provider()
+
+        async def stalled():
+            await asyncio.sleep(60)
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            await asyncio.to_thread(provider._run_sync, stalled, timeout=0.05)
+        await provider.shutdown_async()
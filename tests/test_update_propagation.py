@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import update_propagation
+
+
+class TestUpdatePropagationHarness:
+    def test_stand_in_flips_flags(self):
+        stand_in = update_propagation.SplitApiStandIn(3)
+        assert stand_in.apply(["flag_0", "flag_1"]) == {"flag_0": True, "flag_1": True}
+        assert stand_in.apply(["flag_1", "flag_2"]) == {"flag_1": False, "flag_2": True}
+        assert stand_in.killed("flag_0") and not stand_in.killed("flag_1")
+
+    def test_smoke(self):
+        # overlapping windows of 3 out of 10 flags, so later changes revive flags killed by earlier ones
+        event_latencies, evaluation_latencies = update_propagation.measure(10, 3, 4, 0.1, 10)
+        assert len(evaluation_latencies) == 4
+        assert len(event_latencies) == 4
+        # nothing propagates before the SDK polls the stand-in, which is never instantaneous
+        assert min(evaluation_latencies) > 0.001